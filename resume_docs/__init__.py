@@ -1,13 +1,22 @@
 """Resume document generation toolkit."""
 
-from importlib import resources
 from pathlib import Path
 
-from .role_filter import RoleFilter
-
 __all__ = ["package_path", "RoleFilter"]
 
 
+def __getattr__(name: str):
+    # Resolved lazily so that importing a submodule (e.g. resume_docs.cli)
+    # does not drag in the filtering stack up front.
+    if name == "RoleFilter":
+        from .role_filter import RoleFilter
+
+        return RoleFilter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def package_path() -> Path:
     """Return the root path of the resume_docs package."""
+    from importlib import resources
+
     return Path(resources.files(__name__))
@@ -0,0 +1,418 @@
+"""Generate many role × locale × template resumes in a single process."""
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from . import constants, loader, models
+from .role_config import ROLE_FILTERS
+from .role_filter import RoleFilter
+
+
+@dataclass
+class ManifestEntry:
+    """Outcome of one role × locale × template output."""
+
+    role: str
+    locale: str
+    template: str
+    status: str = "pending"
+    path: Optional[str] = None
+    error: Optional[str] = None
+    polish_seconds: float = 0.0
+    render_seconds: float = 0.0
+    polish_failures: List[str] = field(default_factory=list)
+
+
+@dataclass
+class PolishResult:
+    """Filtered (and optionally polished) resume for one role × locale."""
+
+    resume: models.ResumeDocument
+    seconds: float = 0.0
+    failures: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+class BatchRunner:
+    """Share parsed data, LLM clients and a worker pool across many outputs.
+
+    Each locale is parsed once and each model gets one client; filtering and
+    polishing run per role × locale, rendering per role × locale × template.
+    """
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        output_dir: Path | None = None,
+        include_contact: bool = False,
+        max_workers: int = 4,
+        polish_workers: int = 1,
+        cache=None,
+        base_dir: Path | None = None,
+        scheduler=None,
+        telemetry=None,
+        prompt_layout: str = "inline",
+        batch_tokens: int = 0,
+        cache_only: bool = False,
+        hedge=None,
+    ):
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be >= 1, got {max_workers}")
+        self.model = model
+        self.output_dir = Path(output_dir or constants.DEFAULT_OUTPUT_DIR)
+        self.include_contact = include_contact
+        self.max_workers = max_workers
+        self.polish_workers = polish_workers
+        self.cache = cache
+        self.base_dir = base_dir
+        self.scheduler = scheduler
+        self.telemetry = telemetry
+        self.prompt_layout = prompt_layout
+        self.batch_tokens = batch_tokens
+        self.cache_only = cache_only
+        self.hedge = hedge
+        self.role_filter = RoleFilter()
+        self._resumes: Dict[str, models.ResumeDocument] = {}
+        self._filtered: Dict[str, Dict[str, models.ResumeDocument]] = {}
+        self._lock = threading.Lock()
+
+    def resume_for(self, locale: str) -> models.ResumeDocument:
+        """Return the parsed resume for ``locale``, loading it on first use."""
+        with self._lock:
+            if locale not in self._resumes:
+                self._resumes[locale] = loader.load_resume_data(base_dir=self.base_dir, locale=locale)
+            return self._resumes[locale]
+
+    def invalidate(self, locale: str) -> None:
+        """Forget the parsed and filtered data for ``locale`` (e.g. after a file edit)."""
+        with self._lock:
+            self._resumes.pop(locale, None)
+            self._filtered.pop(locale, None)
+
+    def filtered_for(self, locale: str, role: str) -> models.ResumeDocument:
+        """Return ``locale``'s resume filtered for ``role``.
+
+        All roles of a locale are filtered in one rule sweep on first use.
+        """
+        resume = self.resume_for(locale)
+        with self._lock:
+            if locale not in self._filtered:
+                self._filtered[locale] = self.role_filter.filter_resume_all(resume)
+            return self._filtered[locale][role]
+
+    def client_for(self, model: str):
+        """Return the shared LLM client for ``model`` (one per provider, model and endpoint)."""
+        from .langchain_clients import get_llm_client
+
+        return get_llm_client(model, sdk_retries=self.scheduler is None)
+
+    def warm_up(self, model: Optional[str] = None):
+        """Check the backend for ``model`` (default: the runner's) and load it, once per process."""
+        from .langchain_clients import get_client_registry
+
+        return get_client_registry().warm_up(model or self.model, sdk_retries=self.scheduler is None)
+
+    def polish(self, role: str, locale: str, model: Optional[str] = None) -> PolishResult:
+        """Filter the locale's resume for ``role`` and polish it if a model is set.
+
+        ``model`` overrides the runner's model for this call.
+        """
+        from .llm_polisher import LLMPolisher, PolishError
+
+        started = time.perf_counter()
+        model = model or self.model
+        resume = self.filtered_for(locale, role)
+        result = PolishResult(resume=resume)
+        if model:
+            persona = ROLE_FILTERS[role].get("persona")
+            polisher = LLMPolisher(
+                max_workers=self.polish_workers,
+                cache=self.cache,
+                scheduler=self.scheduler,
+                telemetry=self.telemetry,
+                prompt_layout=self.prompt_layout,
+                batch_tokens=self.batch_tokens,
+                cache_only=self.cache_only,
+                hedge=self.hedge,
+            )
+            try:
+                result.resume = replace(resume, projects=polisher.polish_projects(
+                    resume.projects, model, locale, persona, role
+                ))
+            except PolishError as e:
+                result.resume = replace(resume, projects=e.projects)
+                result.failures = [failure.error for failure in e.failures]
+            except ValueError as e:
+                result.error = str(e)
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def render(self, resume: models.ResumeDocument, locale: str, template: str, output_path: Path) -> float:
+        """Render one DOCX and return the elapsed seconds."""
+        from . import docx_renderer
+
+        started = time.perf_counter()
+        docx_renderer.render_docx(resume, output_path, template, locale, self.include_contact)
+        return time.perf_counter() - started
+
+    def output_path(self, role: str, locale: str, template: str, timestamp: str) -> Path:
+        return self.output_dir / locale / template / f"resume-{role}-{timestamp}.docx"
+
+    def run(
+        self,
+        roles: Sequence[str],
+        locales: Sequence[str],
+        templates: Sequence[str],
+        manifest_path: Path | None = None,
+    ) -> Tuple[List[ManifestEntry], Path]:
+        """Generate every combination and write a JSON manifest.
+
+        Returns:
+            The manifest entries (in role, locale, template order) and the
+            manifest path
+        """
+        _validate(roles, locales, templates)
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        entries: Dict[Tuple[str, str, str], ManifestEntry] = {
+            (role, locale, template): ManifestEntry(role=role, locale=locale, template=template)
+            for role in roles
+            for locale in locales
+            for template in templates
+        }
+
+        def render_entry(entry: ManifestEntry, result: PolishResult) -> None:
+            path = self.output_path(entry.role, entry.locale, entry.template, timestamp)
+            try:
+                entry.render_seconds = self.render(result.resume, entry.locale, entry.template, path)
+            except Exception as e:  # keep the rest of the batch going
+                entry.status = "failed"
+                entry.error = str(e)
+                return
+            entry.path = str(path)
+            entry.status = "partial" if result.failures else "ok"
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            polish_futures: Dict[Future, Tuple[str, str]] = {
+                executor.submit(self.polish, role, locale): (role, locale)
+                for role in roles
+                for locale in locales
+            }
+            render_futures: List[Future] = []
+            for future in as_completed(polish_futures):
+                role, locale = polish_futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = None
+                    error = str(e)
+                else:
+                    error = result.error
+                for template in templates:
+                    entry = entries[(role, locale, template)]
+                    if error is not None:
+                        entry.status = "failed"
+                        entry.error = error
+                        continue
+                    entry.polish_seconds = result.seconds
+                    entry.polish_failures = list(result.failures)
+                    render_futures.append(executor.submit(render_entry, entry, result))
+            for future in render_futures:
+                future.result()
+
+        ordered = list(entries.values())
+        manifest_path = Path(manifest_path or self.output_dir / f"manifest-{timestamp}.json")
+        write_manifest(ordered, manifest_path, model=self.model, timestamp=timestamp)
+        return ordered, manifest_path
+
+
+def write_manifest(entries: Sequence[ManifestEntry], path: Path, **metadata) -> Path:
+    """Write batch results as JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {**metadata, "outputs": [asdict(entry) for entry in entries]}
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, ensure_ascii=False, indent=2)
+    return path
+
+
+def _validate(roles: Sequence[str], locales: Sequence[str], templates: Sequence[str]) -> None:
+    # Values may come from a JSON body (service.py): reject non-strings before the lookups
+    for role in roles:
+        if not isinstance(role, str) or role not in ROLE_FILTERS:
+            raise ValueError(f"Unknown role '{role}'. Options: {', '.join(ROLE_FILTERS)}")
+    for locale in locales:
+        if not isinstance(locale, str) or locale not in constants.SUPPORTED_LOCALES:
+            raise ValueError(f"Unsupported locale '{locale}'. Options: {constants.SUPPORTED_LOCALES}")
+    for template in templates:
+        if not isinstance(template, str) or template not in constants.THEMES:
+            raise ValueError(f"Unknown template '{template}'. Options: {sorted(constants.THEMES)}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Generate DOCX resumes for many roles, locales and templates in one process."
+    )
+    parser.add_argument("--roles", nargs="+", default=list(ROLE_FILTERS), help="Target roles (default: all)")
+    parser.add_argument(
+        "--locales", nargs="+", default=list(constants.SUPPORTED_LOCALES), help="Locales (default: all supported)"
+    )
+    parser.add_argument("--templates", nargs="+", default=[constants.DEFAULT_THEME], help="Template keys")
+    parser.add_argument("--model", help="LLM model for polishing; omit to skip polishing")
+    parser.add_argument("--include-contact", action="store_true", help="Include phone/address in DOCX header")
+    parser.add_argument("--output-dir", default=str(constants.DEFAULT_OUTPUT_DIR), help="Root output directory")
+    parser.add_argument("--workers", type=int, default=4, help="Worker pool size for polish/render stages")
+    parser.add_argument("--polish-workers", type=int, default=1, help="Concurrent projects per polish stage")
+    parser.add_argument(
+        "--prompt-layout",
+        choices=["inline", "prefix"],
+        default="inline",
+        help="prefix: send the static instructions first as a system prompt so providers/Ollama can reuse them",
+    )
+    parser.add_argument(
+        "--polish-batch-tokens",
+        type=int,
+        default=0,
+        help="Polish several projects per request within this token budget (prompt + expected output); 0 = one per request",
+    )
+    parser.add_argument(
+        "--hedge",
+        nargs="?",
+        const="",
+        metavar="BACKUP_MODEL",
+        help="Re-send polish calls slower than the model's latency percentile to BACKUP_MODEL "
+        "(default: hedge.backup in runtime_config.yaml); the first reply wins",
+    )
+    parser.add_argument(
+        "--hedge-percentile",
+        type=float,
+        help="Latency percentile (from telemetry) after which a call is hedged (default: hedge.percentile or 95)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the polished-text cache")
+    parser.add_argument(
+        "--cache-only",
+        action="store_true",
+        help="Never call the LLM: use cached polish results (e.g. ingested by resume_docs.polish_jobs) only",
+    )
+    parser.add_argument(
+        "--warm-up",
+        action="store_true",
+        help="Before polishing, check the model's backend and load it (Ollama) so the first project skips the cold start",
+    )
+    parser.add_argument("--manifest", help="Manifest path (default: <output-dir>/manifest-<timestamp>.json)")
+    parser.add_argument(
+        "--telemetry",
+        action="store_true",
+        help="Record every LLM call to artifacts/telemetry/ (JSONL + Prometheus textfile)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Stay running and regenerate only the outputs affected by YAML or prompt config edits",
+    )
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    from .llm_scheduler import LLMScheduler
+    from .runtime_config import load_runtime_config
+
+    runtime_cfg = load_runtime_config()
+    if args.cache_only and (args.no_cache or not args.model):
+        print("Error: --cache-only needs --model (results are cached per model) and the cache")
+        return 1
+
+    cache = None
+    if args.model and not args.no_cache:
+        from .polish_cache import PolishCache
+
+        cache = PolishCache()
+    telemetry = None
+    if args.model and args.telemetry:
+        from .telemetry import Telemetry
+
+        telemetry = Telemetry.from_config(runtime_cfg)
+    hedge = None
+    if args.model and args.hedge is not None and not args.cache_only:
+        from .hedging import HedgePolicy
+
+        try:
+            hedge = HedgePolicy.from_config(runtime_cfg, backup=args.hedge, percentile=args.hedge_percentile)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+    runner = BatchRunner(
+        model=args.model,
+        output_dir=Path(args.output_dir),
+        include_contact=args.include_contact,
+        max_workers=args.workers,
+        polish_workers=args.polish_workers,
+        cache=cache,
+        scheduler=LLMScheduler.from_config(runtime_cfg),
+        telemetry=telemetry,
+        prompt_layout=args.prompt_layout,
+        batch_tokens=args.polish_batch_tokens,
+        cache_only=args.cache_only,
+        hedge=hedge,
+    )
+    if args.warm_up and args.model and not args.cache_only:
+        for model in [args.model] + ([hedge.backup] if hedge is not None else []):
+            try:
+                warm = runner.warm_up(model)
+            except ValueError as e:
+                print(f"Error: warm-up failed: {e}")
+                return 1
+            print(f"Warm-up: {warm.spec}: {warm.detail} in {warm.seconds:.2f}s")
+    if args.watch:
+        from .watch import WatchSession
+
+        try:
+            _validate(args.roles, args.locales, args.templates)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+        try:
+            WatchSession(runner, args.roles, args.locales, args.templates).run()
+        finally:
+            if hedge is not None:
+                hedge.close()
+        return 0
+
+    try:
+        entries, manifest_path = runner.run(
+            args.roles, args.locales, args.templates, Path(args.manifest) if args.manifest else None
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    finally:
+        if hedge is not None:
+            hedge.close()
+
+    for entry in entries:
+        target = entry.path or entry.error
+        print(f"[{entry.status}] {entry.role} {entry.locale} {entry.template}: {target}")
+    print(f"Manifest saved to {manifest_path}")
+    if hedge is not None:
+        from .hedging import print_report
+
+        print_report(hedge)
+    if telemetry is not None:
+        from .telemetry import print_summary
+
+        telemetry.write_prometheus()
+        telemetry.close()
+        print_summary(telemetry)
+    return 0 if all(entry.status == "ok" for entry in entries) else 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -3,20 +3,19 @@ from __future__ import annotations
 
 import argparse
 import sys
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
 from typing import List
 
 from . import config as config_module
 from . import constants
-from . import docx_renderer, loader
-from .llm_polisher import LLMPolisher
-from .runtime_config import load_runtime_config
+from . import loader
 from .role_filter import RoleFilter
 from .role_config import ROLE_FILTERS
 
-# Load runtime config (overrides conflicting environment values)
-load_runtime_config()
+# Provider, cache and renderer modules are imported inside main() so that
+# --dry-run and --skip-polish never pay for LangChain or python-docx.
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -28,8 +27,84 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--model", help="LLM model for polishing (e.g., gpt-4o, glm-4, ollama)")
     parser.add_argument("--output-dir", default=str(constants.DEFAULT_OUTPUT_DIR), help="Root output directory")
     parser.add_argument("--skip-polish", action="store_true", help="Skip LLM polishing (use original content)")
+    parser.add_argument(
+        "--polish-workers",
+        type=int,
+        default=None,
+        help="Number of projects polished concurrently (default: 1, sequential)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream LLM output while polishing and report time to first token per project",
+    )
+    parser.add_argument(
+        "--prompt-layout",
+        choices=["inline", "prefix"],
+        default="inline",
+        help="prefix: send the static instructions first as a system prompt so providers/Ollama can reuse them",
+    )
+    parser.add_argument(
+        "--polish-batch-tokens",
+        type=int,
+        default=0,
+        help="Polish several projects per request within this token budget (prompt + expected output); 0 = one per request",
+    )
+    parser.add_argument(
+        "--warm-up",
+        action="store_true",
+        help="Before polishing, check the model's backend and load it (Ollama) so the first project skips the cold start",
+    )
+    parser.add_argument(
+        "--hedge",
+        nargs="?",
+        const="",
+        metavar="BACKUP_MODEL",
+        help="Re-send polish calls slower than the model's latency percentile to BACKUP_MODEL "
+        "(default: hedge.backup in runtime_config.yaml); the first reply wins",
+    )
+    parser.add_argument(
+        "--hedge-percentile",
+        type=float,
+        help="Latency percentile (from telemetry) after which a call is hedged (default: hedge.percentile or 95)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the polished-text cache for this run")
+    parser.add_argument(
+        "--cache-only",
+        action="store_true",
+        help="Never call the LLM: use cached polish results (e.g. ingested by resume_docs.polish_jobs) only",
+    )
+    parser.add_argument("--clear-cache", action="store_true", help="Delete all cached polished text before running")
+    parser.add_argument(
+        "--cache-max-entries",
+        type=int,
+        default=constants.POLISH_CACHE_MAX_ENTRIES,
+        help=f"Maximum cached polish results kept (LRU eviction, default: {constants.POLISH_CACHE_MAX_ENTRIES})",
+    )
+    parser.add_argument(
+        "--telemetry",
+        action="store_true",
+        help="Record every LLM call to artifacts/telemetry/ (JSONL + Prometheus textfile)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each stage (load/filter/polish/render/save) and write a Chrome trace to artifacts/profiles/",
+    )
+    parser.add_argument(
+        "--profile-mode",
+        choices=["cprofile", "sample"],
+        help="Also capture cProfile stats (cpu.prof) or sampled stacks for flame graphs (stacks.folded)",
+    )
+    parser.add_argument("--profile-memory", action="store_true", help="Also record tracemalloc peaks per stage")
+    parser.add_argument("--profile-dir", help="Profile output directory (default: artifacts/profiles/<timestamp>)")
     parser.add_argument("--config", help="Optional YAML config override", default=None)
     parser.add_argument("--dry-run", action="store_true", help="Parse YAML only without writing files")
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Stay running and regenerate the DOCX when the YAML data or prompt config changes",
+    )
     return parser
 
 
@@ -42,9 +117,38 @@ def main(argv: List[str] | None = None) -> int:
         "include_contact": args.include_contact,
         "output_dir": args.output_dir,
         "dry_run": args.dry_run,
+        "polish_workers": args.polish_workers,
     }, config_file=Path(args.config) if args.config else None)
 
-    resume_data = loader.load_resume_data(locale=args.locale)
+    if args.clear_cache:
+        from .polish_cache import PolishCache
+
+        removed = PolishCache(max_entries=args.cache_max_entries).clear()
+        print(f"Cleared {removed} cached polish result(s)")
+        if not args.role:
+            return 0
+
+    profiler = None
+    if args.profile or args.profile_mode or args.profile_memory:
+        from .profiling import StageProfiler
+
+        profile_dir = args.profile_dir or constants.PROFILE_DIR / datetime.now().strftime("%Y%m%d-%H%M%S")
+        profiler = StageProfiler(Path(profile_dir), mode=args.profile_mode, memory=args.profile_memory)
+    try:
+        return _generate(args, cfg, profiler.stage if profiler else _no_stage)
+    finally:
+        if profiler is not None:
+            profiler.report(profiler.finish())
+
+
+def _no_stage(name: str):
+    return nullcontext()
+
+
+def _generate(args, cfg, stage) -> int:
+    """Load → filter → polish → render → save; ``stage(name)`` wraps each step."""
+    with stage("load"):
+        resume_data = loader.load_resume_data(locale=args.locale)
 
     # Role selection (required even though filtering is disabled)
     if not args.role:
@@ -60,40 +164,230 @@ def main(argv: List[str] | None = None) -> int:
 
     persona = role_profile.get("persona")
 
-    role_filter = RoleFilter()
-    resume_data = role_filter.filter_resume(resume_data, args.role)
+    with stage("filter"):
+        role_filter = RoleFilter()
+        resume_data = role_filter.filter_resume(resume_data, args.role)
 
     if cfg.dry_run:
         print("Dry run complete. Parsed resume data successfully.")
         return 0
 
+    if args.watch:
+        return _watch(args, cfg)
+
     # LLM polishing (optional)
+    exit_code = 0
     if not args.skip_polish and args.model:
-        polisher = LLMPolisher()
-        try:
-            resume_data.projects = polisher.polish_projects(
-                resume_data.projects, args.model, cfg.locale, persona, args.role
+        with stage("polish"):
+            from .llm_polisher import LLMPolisher, PolishError
+            from .llm_scheduler import LLMScheduler
+            from .polish_cache import PolishCache
+            from .runtime_config import load_runtime_config
+
+            # Load runtime config (overrides conflicting environment values)
+            runtime_cfg = load_runtime_config()
+            cache = None if args.no_cache else PolishCache(max_entries=args.cache_max_entries)
+            if args.cache_only and cache is None:
+                print("Error: --cache-only cannot be combined with --no-cache")
+                return 1
+            progress = _stream_progress(cfg.polish_workers) if args.stream else None
+            telemetry = None
+            if args.telemetry:
+                from .telemetry import Telemetry
+
+                telemetry = Telemetry.from_config(runtime_cfg)
+            hedge = None
+            if args.hedge is not None and not args.cache_only:
+                from .hedging import HedgePolicy
+
+                try:
+                    hedge = HedgePolicy.from_config(runtime_cfg, backup=args.hedge, percentile=args.hedge_percentile)
+                except ValueError as e:
+                    print(f"Error: {e}")
+                    return 1
+            if args.warm_up and not args.cache_only:
+                from .langchain_clients import get_client_registry
+
+                for model in [args.model] + ([hedge.backup] if hedge is not None else []):
+                    try:
+                        warm = get_client_registry().warm_up(model, sdk_retries=False)
+                    except ValueError as e:
+                        print(f"Error: warm-up failed: {e}")
+                        return 1
+                    print(f"Warm-up: {warm.spec}: {warm.detail} in {warm.seconds:.2f}s")
+            polisher = LLMPolisher(
+                max_workers=cfg.polish_workers,
+                cache=cache,
+                stream=args.stream,
+                progress=progress,
+                scheduler=LLMScheduler.from_config(runtime_cfg),
+                telemetry=telemetry,
+                prompt_layout=args.prompt_layout,
+                batch_tokens=args.polish_batch_tokens,
+                cache_only=args.cache_only,
+                hedge=hedge,
             )
-            print(f"Projects polished using {args.model}")
-        except ValueError as e:
-            print(f"Error during polishing: {e}")
-            return 1
+            try:
+                resume_data.projects = polisher.polish_projects(
+                    resume_data.projects, args.model, cfg.locale, persona, args.role
+                )
+                print(f"Projects polished using {args.model}")
+            except PolishError as e:
+                # Keep the projects that did polish; failed ones fall back to original content
+                resume_data.projects = e.projects
+                for failure in e.failures:
+                    print(f"Error during polishing: {failure.error}")
+                print(f"{len(e.failures)} project(s) kept their original content")
+                exit_code = 1
+            except ValueError as e:
+                print(f"Error during polishing: {e}")
+                return 1
+            finally:
+                if hedge is not None:
+                    hedge.close()
+        if cache is not None:
+            print(f"Polish cache: {cache.hits} hit(s), {cache.misses} miss(es)")
+        if polisher.batches:
+            batched = sum(len(batch.project_names) for batch in polisher.batches)
+            parsed = sum(batch.parsed for batch in polisher.batches)
+            print(
+                f"Batched polishing: {len(polisher.batches)} request(s) for {batched} project(s), "
+                f"{batched - parsed} retried singly"
+            )
+        if hedge is not None:
+            from .hedging import print_report
+
+            print_report(hedge)
+        if args.stream:
+            for timing in polisher.timings:
+                ttft = f"{timing.time_to_first_token:.2f}s" if timing.time_to_first_token is not None else "-"
+                print(f"  {timing.project_name}: first token {ttft}, total {timing.total_seconds:.2f}s, {timing.chars} chars")
+        if telemetry is not None:
+            from .telemetry import print_summary
+
+            telemetry.write_prometheus()
+            telemetry.close()
+            print_summary(telemetry)
 
     output_root = cfg.output_dir_path / cfg.locale / cfg.template
 
     # DOCX generation
+    from . import docx_renderer
+
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
     docx_filename = f"resume-{timestamp}.docx"
     docx_path = output_root / docx_filename
     try:
-        docx_renderer.render_docx(resume_data, docx_path, cfg.template, cfg.locale, cfg.include_contact)
-        print(f"DOCX saved to {docx_path}")
+        with stage("render"):
+            document = docx_renderer.build_docx(resume_data, cfg.template, cfg.locale, cfg.include_contact)
     except docx_renderer.MissingDependencyError as exc:
         print(f"DOCX generation skipped: {exc}")
         return 1
+    with stage("save"):
+        docx_path.parent.mkdir(parents=True, exist_ok=True)
+        document.save(str(docx_path))
+    print(f"DOCX saved to {docx_path}")
+
+    return exit_code
 
+
+def _watch(args, cfg) -> int:
+    """Run a watch session for the selected role, locale and template."""
+    from .batch import BatchRunner
+    from .llm_scheduler import LLMScheduler
+    from .runtime_config import load_runtime_config
+    from .watch import WatchSession
+
+    runtime_cfg = load_runtime_config()
+    model = None if args.skip_polish else args.model
+    if model and args.cache_only and args.no_cache:
+        print("Error: --cache-only cannot be combined with --no-cache")
+        return 1
+    cache = telemetry = None
+    if model and not args.no_cache:
+        from .polish_cache import PolishCache
+
+        cache = PolishCache(max_entries=args.cache_max_entries)
+    if model and args.telemetry:
+        from .telemetry import Telemetry
+
+        telemetry = Telemetry.from_config(runtime_cfg)
+    hedge = None
+    if model and args.hedge is not None and not args.cache_only:
+        from .hedging import HedgePolicy
+
+        try:
+            hedge = HedgePolicy.from_config(runtime_cfg, backup=args.hedge, percentile=args.hedge_percentile)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+    runner = BatchRunner(
+        model=model,
+        output_dir=cfg.output_dir_path,
+        include_contact=cfg.include_contact,
+        polish_workers=cfg.polish_workers,
+        cache=cache,
+        scheduler=LLMScheduler.from_config(runtime_cfg),
+        telemetry=telemetry,
+        prompt_layout=args.prompt_layout,
+        batch_tokens=args.polish_batch_tokens,
+        cache_only=bool(model) and args.cache_only,
+        hedge=hedge,
+    )
+    if args.warm_up and model and not args.cache_only:
+        for warm_model in [model] + ([hedge.backup] if hedge is not None else []):
+            try:
+                warm = runner.warm_up(warm_model)
+            except ValueError as e:
+                print(f"Error: warm-up failed: {e}")
+                return 1
+            print(f"Warm-up: {warm.spec}: {warm.detail} in {warm.seconds:.2f}s")
+    try:
+        WatchSession(runner, [args.role], [cfg.locale], [cfg.template]).run()
+    finally:
+        if hedge is not None:
+            hedge.close()
     return 0
 
 
+def _stream_progress(workers: int):
+    """Build a streaming progress callback.
+
+    A single worker echoes the text live; with several workers output would
+    interleave, so only the first chunk of each project is announced. When a
+    streamed attempt fails (or loses a hedged pair), ``reset`` marks its text as discarded.
+    """
+    if workers == 1:
+        current = {"name": None}
+
+        def echo(project_name: str, chunk: str) -> None:
+            if current["name"] != project_name:
+                current["name"] = project_name
+                print(f"\n--- {project_name} ---", file=sys.stderr)
+            sys.stderr.write(chunk)
+            sys.stderr.flush()
+
+        def reset_echo(project_name: str) -> None:
+            current["name"] = None
+            print(f"\n--- {project_name}: attempt discarded, text above does not count ---", file=sys.stderr)
+
+        echo.reset = reset_echo
+        return echo
+
+    started = set()
+
+    def announce(project_name: str, chunk: str) -> None:
+        if project_name not in started:
+            started.add(project_name)
+            print(f"[{project_name}] streaming...", file=sys.stderr)
+
+    def reset_announce(project_name: str) -> None:
+        started.discard(project_name)
+        print(f"[{project_name}] streamed attempt discarded", file=sys.stderr)
+
+    announce.reset = reset_announce
+    return announce
+
+
 if __name__ == "__main__":  # pragma: no cover
     raise SystemExit(main())
@@ -5,8 +5,6 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Iterable, List, Optional
 
-import yaml
-
 from . import constants
 
 
@@ -22,6 +20,7 @@ class GenerationConfig:
     skip_docx: bool = False
     skip_prompts: bool = False
     invoke_models: bool = False
+    polish_workers: int = 1
 
     @property
     def output_dir_path(self) -> Path:
@@ -32,6 +31,8 @@ class GenerationConfig:
             raise ValueError(f"Unknown template '{self.template}'. Options: {sorted(constants.THEMES)}")
         if self.locale not in constants.SUPPORTED_LOCALES:
             raise ValueError(f"Unsupported locale '{self.locale}'. Options: {constants.SUPPORTED_LOCALES}")
+        if self.polish_workers < 1:
+            raise ValueError(f"polish_workers must be >= 1, got {self.polish_workers}")
 
 
 def load_config_file(path: Optional[Path]) -> dict:
@@ -40,6 +41,8 @@ def load_config_file(path: Optional[Path]) -> dict:
     config_path = Path(path)
     if not config_path.exists():
         return {}
+    import yaml  # only needed with --config; keeps --dry-run startup lean
+
     with config_path.open("r", encoding="utf-8") as handle:
         data = yaml.safe_load(handle) or {}
     if not isinstance(data, dict):
@@ -52,7 +55,9 @@ def create_config(
     config_file: Optional[Path] = None,
 ) -> GenerationConfig:
     base = load_config_file(config_file)
-    merged = {**base, **(cli_args or {})}
+    # Unset CLI options (None) must not mask values from the config file
+    overrides = {key: value for key, value in (cli_args or {}).items() if value is not None}
+    merged = {**base, **overrides}
     config = GenerationConfig(
         template=merged.get("template", constants.DEFAULT_THEME),
         locale=merged.get("locale", constants.DEFAULT_LOCALE),
@@ -64,6 +69,7 @@ def create_config(
         skip_docx=bool(merged.get("skip_docx", False)),
         skip_prompts=bool(merged.get("skip_prompts", False)),
         invoke_models=bool(merged.get("invoke_models", False)),
+        polish_workers=int(merged.get("polish_workers", 1)),
     )
     config.validate()
     return config
@@ -12,6 +12,12 @@ DOC_TEMPLATE_DIR = REPO_ROOT / "templates" / "docx"
 PROMPT_TEMPLATE_DIR = REPO_ROOT / "templates" / "prompts"
 DEFAULT_OUTPUT_DIR = REPO_ROOT / "docs" / "output"
 ARTIFACTS_DIR = REPO_ROOT / "artifacts"
+POLISH_CACHE_DIR = ARTIFACTS_DIR / "cache" / "polish"
+POLISH_CACHE_MAX_ENTRIES = 2000
+TRANSLATION_MEMORY_PATH = ARTIFACTS_DIR / "cache" / "translation_memory.json"
+RESUME_SNAPSHOT_DIR = ARTIFACTS_DIR / "cache" / "resume"
+TELEMETRY_DIR = ARTIFACTS_DIR / "telemetry"
+PROFILE_DIR = ARTIFACTS_DIR / "profiles"
 
 SUPPORTED_LOCALES = ("zh-CN", "en-US")
 DEFAULT_LOCALE = "zh-CN"
@@ -1,6 +1,8 @@
 """DOCX rendering helpers."""
 from __future__ import annotations
 
+import threading
+from io import BytesIO
 from pathlib import Path
 from typing import Dict, Iterable
 
@@ -26,6 +28,24 @@ SECTION_LABELS = {
 }
 
 
+# Named paragraph/character styles defined once per theme template
+STYLE_NAMES = {
+    "name": "Resume Name",
+    "contact": "Resume Contact",
+    "heading": "Resume Heading",
+    "project_title": "Resume Project Title",
+    "meta": "Resume Meta",
+    "body": "Resume Body",
+    "metric": "Resume Metric",
+    "label": "Resume Label",
+    "bullet": "List Bullet",
+    "strong": "Resume Strong",
+}
+
+_template_cache: Dict[str, bytes] = {}
+_template_lock = threading.Lock()
+
+
 class MissingDependencyError(RuntimeError):
     """Raised when an optional dependency is unavailable."""
 
@@ -49,48 +69,152 @@ def render_docx(
     locale: str,
     include_contact: bool = False,
 ) -> Path:
-    Document, WD_ALIGN_PARAGRAPH, Pt, RGBColor = _ensure_docx_imports()
-    theme = constants.THEMES[theme_name]
+    doc = build_docx(resume, theme_name, locale, include_contact)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    doc.save(str(output_path))
+    return output_path
+
+
+def render_docx_bytes(
+    resume: models.ResumeDocument,
+    theme_name: str,
+    locale: str,
+    include_contact: bool = False,
+) -> bytes:
+    """Render the DOCX in memory and return its bytes (nothing is written to disk)."""
+    doc = build_docx(resume, theme_name, locale, include_contact)
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def build_docx(resume: models.ResumeDocument, theme_name: str, locale: str, include_contact: bool = False):
+    """Build the python-docx ``Document`` without saving it."""
+    Document, _, _, _ = _ensure_docx_imports()
     labels = SECTION_LABELS.get(locale, SECTION_LABELS[constants.DEFAULT_LOCALE])
-    doc = Document()
+    doc = Document(BytesIO(_theme_template_bytes(theme_name)))
+    # Resolve style ids once; python-docx's style setter rescans every style per call
+    styles = {key: doc.styles[name].style_id for key, name in STYLE_NAMES.items()}
 
-    normal_style = doc.styles["Normal"]
-    normal_style.font.name = "Calibri"
-    normal_style.font.size = Pt(11)
+    _render_header(doc, resume.personal_info, include_contact, styles)
+    _render_skills(doc, resume.skills, labels["skills"], styles)
+    _render_projects(doc, resume.projects, labels["projects"], styles)
+    _render_work(doc, resume.work, labels, styles)
+    _render_education_and_certifications(doc, resume.personal_info, labels, styles)
+    return doc
 
-    _render_header(doc, resume.personal_info, include_contact, theme, WD_ALIGN_PARAGRAPH, Pt, RGBColor)
-    _render_skills(doc, resume.skills, labels["skills"], theme, Pt, RGBColor)
-    _render_projects(doc, resume.projects, labels["projects"], theme, Pt, RGBColor)
-    _render_work(doc, resume.work, labels, theme, Pt, RGBColor)
-    _render_education_and_certifications(doc, resume.personal_info, labels, theme, Pt, RGBColor)
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    doc.save(str(output_path))
-    return output_path
+def build_theme_template(theme_name: str, base_path: Path | None = None):
+    """Return a Document carrying every resume style for ``theme_name``.
+
+    Starts from ``base_path`` (a user-edited Word template) when given and
+    only adds the styles it lacks, so customised styles are kept.
+    """
+    Document, _, _, _ = _ensure_docx_imports()
+    doc = Document(str(base_path)) if base_path else Document()
+    _ensure_styles(doc, constants.THEMES[theme_name])
+    return doc
 
 
-def _render_header(doc, info: models.PersonalInfo, include_contact: bool, theme, WD_ALIGN_PARAGRAPH, Pt, RGBColor):
-    name_para = doc.add_paragraph()
-    name_para.alignment = WD_ALIGN_PARAGRAPH.LEFT
-    name_para.paragraph_format.space_after = Pt(0)
-    name_run = name_para.add_run(info.name)
-    name_run.font.size = Pt(28)
-    name_run.font.bold = True
-    name_run.font.color.rgb = RGBColor(0, 0, 0)
-    name_run.font.name = "Calibri"
-
-    # Add bottom border line
-    from docx.oxml.ns import qn
-    from docx.oxml import OxmlElement
-    pPr = name_para._element.get_or_add_pPr()
-    pBdr = OxmlElement('w:pBdr')
-    bottom = OxmlElement('w:bottom')
-    bottom.set(qn('w:val'), 'single')
-    bottom.set(qn('w:sz'), '24')
-    bottom.set(qn('w:space'), '1')
-    bottom.set(qn('w:color'), '000000')
-    pBdr.append(bottom)
-    pPr.append(pBdr)
+def _theme_template_bytes(theme_name: str) -> bytes:
+    """Serialized base document for a theme, built once per process.
+
+    Uses ``DOC_TEMPLATE_DIR/<theme>.docx`` when present, otherwise builds the
+    styles from ``constants.THEMES``.
+    """
+    with _template_lock:
+        cached = _template_cache.get(theme_name)
+        if cached is None:
+            template_path = constants.DOC_TEMPLATE_DIR / f"{theme_name}.docx"
+            doc = build_theme_template(theme_name, template_path if template_path.exists() else None)
+            buffer = BytesIO()
+            doc.save(buffer)
+            cached = _template_cache[theme_name] = buffer.getvalue()
+        return cached
+
+
+def _ensure_styles(doc, theme: constants.ThemeConfig) -> None:
+    from docx.enum.style import WD_STYLE_TYPE  # type: ignore
+    from docx.oxml import OxmlElement  # type: ignore
+    from docx.oxml.ns import qn  # type: ignore
+    from docx.shared import Pt, RGBColor  # type: ignore
+
+    heading_color = RGBColor(*theme.heading_color_rgb)
+    accent_color = RGBColor(*theme.accent_rgb)
+    existing = {style.name for style in doc.styles}
+
+    normal = doc.styles["Normal"]
+    if "Resume Body" not in existing:
+        normal.font.name = theme.font_family
+        normal.font.size = Pt(theme.body_font_size)
+
+    def paragraph_style(key, size=None, bold=None, color=None, space_before=None, space_after=None):
+        name = STYLE_NAMES[key]
+        if name in existing:
+            return None
+        style = doc.styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+        style.base_style = normal
+        style.quick_style = True
+        if size is not None:
+            style.font.size = Pt(size)
+        if bold is not None:
+            style.font.bold = bold
+        if color is not None:
+            style.font.color.rgb = color
+        if space_before is not None:
+            style.paragraph_format.space_before = Pt(space_before)
+        if space_after is not None:
+            style.paragraph_format.space_after = Pt(space_after)
+        return style
+
+    name_style = paragraph_style(
+        "name", size=theme.heading_font_size + 8, bold=True, color=heading_color, space_after=0
+    )
+    if name_style is not None:
+        # Bottom border under the name lives in the style, not in every document
+        pPr = name_style.element.get_or_add_pPr()
+        pBdr = OxmlElement("w:pBdr")
+        bottom = OxmlElement("w:bottom")
+        bottom.set(qn("w:val"), "single")
+        bottom.set(qn("w:sz"), "24")
+        bottom.set(qn("w:space"), "1")
+        bottom.set(qn("w:color"), str(accent_color))
+        pBdr.append(bottom)
+        pPr.append(pBdr)
+    paragraph_style("contact", space_before=3, space_after=3)
+    paragraph_style(
+        "heading", size=theme.subheading_font_size + 2, bold=True, color=accent_color, space_before=12, space_after=6
+    )
+    paragraph_style(
+        "project_title", size=theme.subheading_font_size, bold=True, color=heading_color, space_before=6, space_after=2
+    )
+    paragraph_style("meta", space_after=3)
+    paragraph_style("body", space_after=3)
+    paragraph_style("metric", space_after=2)
+    paragraph_style("label", bold=True, color=heading_color, space_before=3, space_after=2)
+
+    if STYLE_NAMES["strong"] not in existing:
+        strong = doc.styles.add_style(STYLE_NAMES["strong"], WD_STYLE_TYPE.CHARACTER)
+        strong.font.bold = True
+        strong.font.color.rgb = heading_color
+    if STYLE_NAMES["bullet"] not in existing:  # pragma: no cover - present in the default template
+        paragraph_style("bullet")
+
+
+def _add_paragraph(doc, text, style_id: str):
+    paragraph = doc.add_paragraph(text)
+    paragraph._p.style = style_id
+    return paragraph
+
+
+def _add_run(paragraph, text: str, style_id: str):
+    run = paragraph.add_run(text)
+    run._r.style = style_id
+    return run
+
+
+def _render_header(doc, info: models.PersonalInfo, include_contact: bool, styles):
+    _add_paragraph(doc, info.name, styles["name"])
 
     if include_contact:
         contact_parts = [value for value in [info.phone, info.email, info.address] if value]
@@ -98,68 +222,36 @@ def _render_header(doc, info: models.PersonalInfo, include_contact: bool, theme,
         contact_parts = [value for value in [info.email] if value]
     if info.github:
         contact_parts.append(info.github)
-    if contact_parts:
-        for contact_item in contact_parts:
-            contact_para = doc.add_paragraph(contact_item)
-            contact_para.alignment = WD_ALIGN_PARAGRAPH.LEFT
-            contact_para.paragraph_format.space_before = Pt(3)
-            contact_para.paragraph_format.space_after = Pt(3)
-            for run in contact_para.runs:
-                run.font.size = Pt(11)
-                run.font.color.rgb = RGBColor(0, 0, 0)
-                run.font.name = "Calibri"
-
-
-def _render_section_heading(doc, text: str, theme, Pt, RGBColor):
-    heading = doc.add_paragraph()
-    heading.paragraph_format.space_before = Pt(12)
-    heading.paragraph_format.space_after = Pt(6)
-    run = heading.add_run(text)
-    run.font.size = Pt(14)
-    run.font.bold = True
-    run.font.color.rgb = RGBColor(0, 0, 0)
-    run.font.name = "Calibri"
-    return heading
-
-
-def _render_skills(doc, skills: models.SkillsSummary, section_label: str, theme, Pt, RGBColor):
+    for contact_item in contact_parts:
+        _add_paragraph(doc, contact_item, styles["contact"])
+
+
+def _render_section_heading(doc, text: str, styles):
+    return _add_paragraph(doc, text, styles["heading"])
+
+
+def _render_skills(doc, skills: models.SkillsSummary, section_label: str, styles):
     if not skills.categories:
         return
-    _render_section_heading(doc, section_label, theme, Pt, RGBColor)
+    _render_section_heading(doc, section_label, styles)
     for category in skills.categories:
-        para = doc.add_paragraph()
-        para.style = doc.styles["Normal"]
-        para.paragraph_format.space_after = Pt(3)
-        run = para.add_run(f"{category.category}: ")
-        run.bold = True
-        run.font.color.rgb = RGBColor(0, 0, 0)
-        run.font.name = "Calibri"
+        para = _add_paragraph(doc, None, styles["metric"])
+        _add_run(para, f"{category.category}: ", styles["strong"])
         if category.items:
-            items_run = para.add_run(" · ".join(category.items))
-            items_run.font.name = "Calibri"
+            para.add_run(" · ".join(category.items))
 
 
-def _render_projects(doc, projects: Iterable[models.Project], section_label: str, theme, Pt, RGBColor):
+def _render_projects(doc, projects: Iterable[models.Project], section_label: str, styles):
     if not projects:
         return
-    _render_section_heading(doc, section_label, theme, Pt, RGBColor)
+    _render_section_heading(doc, section_label, styles)
     for project in projects:
-        title_para = doc.add_paragraph()
-        title_para.paragraph_format.space_before = Pt(6)
-        title_para.paragraph_format.space_after = Pt(2)
-        title_run = title_para.add_run(project.project_name)
-        title_run.bold = True
-        title_run.font.size = Pt(12)
-        title_run.font.color.rgb = RGBColor(0, 0, 0)
-        title_run.font.name = "Calibri"
+        title = project.project_name
         if project.company_or_context:
-            ctx_run = title_para.add_run(f" | {project.company_or_context}")
-            ctx_run.font.name = "Calibri"
+            title += f" | {project.company_or_context}"
         if project.timeframe and project.timeframe.label:
-            time_run = title_para.add_run(f" ({project.timeframe.label})")
-            time_run.font.name = "Calibri"
-        meta_para = doc.add_paragraph()
-        meta_para.paragraph_format.space_after = Pt(3)
+            title += f" ({project.timeframe.label})"
+        _add_paragraph(doc, title, styles["project_title"])
         meta_items = []
         if project.role_title:
             meta_items.append(project.role_title)
@@ -167,25 +259,14 @@ def _render_projects(doc, projects: Iterable[models.Project], section_label: str
             meta_items.append(project.role_perspective)
         if project.data_domain:
             meta_items.append(project.data_domain)
-        if meta_items:
-            meta_run = meta_para.add_run(" | ".join(meta_items))
-            meta_run.font.name = "Calibri"
+        _add_paragraph(doc, " | ".join(meta_items), styles["meta"])
         if project.project_overview:
-            overview_para = doc.add_paragraph(project.project_overview)
-            overview_para.style = doc.styles["Normal"]
-            overview_para.paragraph_format.space_after = Pt(3)
-            for run in overview_para.runs:
-                run.font.name = "Calibri"
+            _add_paragraph(doc, project.project_overview, styles["body"])
         for metrics_label, values in project.impact_metrics.grouped():
             if values:
-                metric_para = doc.add_paragraph()
-                metric_para.paragraph_format.space_after = Pt(2)
-                run = metric_para.add_run(f"{metrics_label}: ")
-                run.bold = True
-                run.font.color.rgb = RGBColor(0, 0, 0)
-                run.font.name = "Calibri"
-                values_run = metric_para.add_run("; ".join(values))
-                values_run.font.name = "Calibri"
+                metric_para = _add_paragraph(doc, None, styles["metric"])
+                _add_run(metric_para, f"{metrics_label}: ", styles["strong"])
+                metric_para.add_run("; ".join(values))
         bullet_fields = [
             ("Challenges", project.challenges_or_objectives),
             ("Responsibilities", project.responsibilities),
@@ -196,61 +277,35 @@ def _render_projects(doc, projects: Iterable[models.Project], section_label: str
         for label, values in bullet_fields:
             if not values:
                 continue
-            label_para = doc.add_paragraph(f"{label}:")
-            label_para.style = doc.styles["Normal"]
-            label_para.paragraph_format.space_before = Pt(3)
-            label_para.paragraph_format.space_after = Pt(2)
-            for run in label_para.runs:
-                run.bold = True
-                run.font.color.rgb = RGBColor(0, 0, 0)
-                run.font.name = "Calibri"
+            _add_paragraph(doc, f"{label}:", styles["label"])
             for value in values:
-                bullet_para = doc.add_paragraph(value, style="List Bullet")
-                for run in bullet_para.runs:
-                    run.font.name = "Calibri"
+                _add_paragraph(doc, value, styles["bullet"])
 
 
-def _render_work(doc, work: models.WorkSummary, labels: Dict[str, str], theme, Pt, RGBColor):
+def _render_work(doc, work: models.WorkSummary, labels: Dict[str, str], styles):
     if work.experiences:
-        _render_section_heading(doc, labels["work"], theme, Pt, RGBColor)
+        _render_section_heading(doc, labels["work"], styles)
         table = doc.add_table(rows=1, cols=3)
         table.style = "Light Grid Accent 1"
         table.autofit = False
         table.allow_autofit = False
         header_cells = table.rows[0].cells
-        header_cells[0].text = "Company"
-        header_cells[1].text = "Duration"
-        header_cells[2].text = "Title"
-        for cell in header_cells:
-            for para in cell.paragraphs:
-                for run in para.runs:
-                    run.font.bold = True
-                    run.font.color.rgb = RGBColor(0, 0, 0)
-                    run.font.name = "Calibri"
+        for cell, text in zip(header_cells, ("Company", "Duration", "Title")):
+            _add_run(cell.paragraphs[0], text, styles["strong"])
         for exp in work.experiences:
             row_cells = table.add_row().cells
             row_cells[0].text = exp.company or ""
             row_cells[1].text = exp.duration or ""
             row_cells[2].text = exp.title or ""
-            for cell in row_cells:
-                for para in cell.paragraphs:
-                    for run in para.runs:
-                        run.font.name = "Calibri"
 
 
-def _render_education_and_certifications(doc, info: models.PersonalInfo, labels: Dict[str, str], theme, Pt, RGBColor):
+def _render_education_and_certifications(doc, info: models.PersonalInfo, labels: Dict[str, str], styles):
     if info.education:
-        _render_section_heading(doc, labels["education"], theme, Pt, RGBColor)
+        _render_section_heading(doc, labels["education"], styles)
         for entry in info.education:
-            edu_para = doc.add_paragraph(entry.description, style="List Bullet")
-            for run in edu_para.runs:
-                run.font.name = "Calibri"
+            _add_paragraph(doc, entry.description, styles["bullet"])
     if info.certifications:
-        _render_section_heading(doc, labels["certifications"], theme, Pt, RGBColor)
+        _render_section_heading(doc, labels["certifications"], styles)
         for cert in info.certifications:
-            para = doc.add_paragraph(style="List Bullet")
-            name_run = para.add_run(cert.name)
-            name_run.font.name = "Calibri"
-            if cert.url:
-                url_run = para.add_run(f" ({cert.url})")
-                url_run.font.name = "Calibri"
+            text = f"{cert.name} ({cert.url})" if cert.url else cert.name
+            _add_paragraph(doc, text, styles["bullet"])
@@ -0,0 +1,86 @@
+"""字段可见性掩码 - 以只读视图投影共享的 Project，避免按职位复制项目"""
+from __future__ import annotations
+
+from dataclasses import MISSING, fields
+from typing import Dict, FrozenSet, Mapping, Tuple
+
+from resume_docs.models import Project, freeze, register_serializable
+
+_FIELDS = fields(Project)
+_PROJECT_FIELDS: Tuple[str, ...] = tuple(f.name for f in _FIELDS)
+
+
+def _field_default(f):
+    """返回字段的默认值（default_factory 时新建实例）"""
+    if f.default_factory is not MISSING:
+        return f.default_factory()
+    if f.default is not MISSING:
+        return f.default
+    return None
+
+
+# 隐藏字段在视图中返回的只读默认值：列表为空元组，嵌套模型为 Frozen 变体
+_VIEW_DEFAULTS: Dict[str, object] = {f.name: freeze(_field_default(f)) for f in _FIELDS}
+
+
+class FieldMask:
+    """按职位编译一次的字段掩码"""
+
+    __slots__ = ("hidden",)
+
+    def __init__(self, hidden: FrozenSet[str] = frozenset()):
+        self.hidden = hidden
+
+    @classmethod
+    def compile(cls, visibility: Mapping[str, bool]) -> "FieldMask":
+        """从 field_visibility 配置编译；未配置的字段默认可见，未知字段忽略"""
+        return cls(frozenset(name for name in _PROJECT_FIELDS if not visibility.get(name, True)))
+
+    def apply(self, project: Project):
+        """返回投影后的项目：无隐藏字段时直接返回原对象，否则返回只读视图"""
+        if not self.hidden:
+            return project
+        if isinstance(project, ProjectView):
+            return ProjectView(project.source, project.hidden | self.hidden)
+        return ProjectView(project, self.hidden)
+
+
+class ProjectView:
+    """共享 Project 上的只读视图；隐藏字段读取为该字段的空默认值
+
+    渲染器和润色器按属性读取，与 Project 用法一致；需要可变的 Project 时调用
+    :meth:`materialize`。
+    """
+
+    __slots__ = ("source", "hidden")
+
+    def __init__(self, source: Project, hidden: FrozenSet[str]):
+        object.__setattr__(self, "source", source)
+        object.__setattr__(self, "hidden", hidden)
+
+    def __getattr__(self, name: str):
+        # 仅在 slots 之外的属性（即 Project 字段）上触发
+        if name in self.hidden:
+            return _VIEW_DEFAULTS[name]
+        return getattr(self.source, name)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("ProjectView is read-only; call materialize() for a mutable Project")
+
+    def __reduce__(self):
+        return ProjectView, (self.source, self.hidden)
+
+    def __repr__(self) -> str:
+        return f"ProjectView({self.source.project_name!r}, hidden={sorted(self.hidden)})"
+
+    def materialize(self, **changes) -> Project:
+        """生成独立的 Project：隐藏字段取字段默认值，``changes`` 覆盖指定字段"""
+        values = {
+            f.name: _field_default(f) if f.name in self.hidden else getattr(self.source, f.name)
+            for f in _FIELDS
+        }
+        values.update(changes)
+        return Project(**values)
+
+
+register_serializable(ProjectView, _PROJECT_FIELDS)
@@ -0,0 +1,271 @@
+"""Hedged LLM calls: re-send a slow request to a backup model and keep the first reply.
+
+A polish call that has not returned within a percentile of the primary
+model's observed latency is sent again, unchanged, to a backup model
+(``hedge.backup`` in runtime_config.yaml or ``--hedge``). The first
+successful reply wins and the other call is cancelled: a streaming call
+stops reading and closes its connection; a blocking call cannot be
+interrupted, so it finishes in the background and its reply is discarded.
+
+The delay is the ``percentile`` of the primary model's latency, taken from
+successful single-project calls in earlier runs' telemetry JSONL files
+(artifacts/telemetry/) and from every primary call completed in this
+process. Until ``min_samples`` latencies are known, ``initial_delay`` is used.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Mapping, Optional, Tuple, TypeVar
+
+from . import constants
+from .telemetry import SUMMARY_WINDOW, percentile
+
+T = TypeVar("T")
+# (provider, model) of the primary client
+HedgeKey = Tuple[str, str]
+# Telemetry files read when seeding latencies (newest first)
+HISTORY_FILES = 20
+
+
+class HedgeCancelled(Exception):
+    """Raised inside the losing call of a hedged pair when it notices the cancellation."""
+
+
+@dataclass
+class _Sample:
+    """One hedge-eligible call.
+
+    ``primary_seconds`` is how long the primary took; when it was cancelled
+    this is a lower bound (its elapsed time at cancellation), and it stays
+    None while a discarded primary is still running.
+    """
+
+    started: float
+    seconds: float = 0.0
+    fired: bool = False
+    winner: str = "primary"
+    primary_seconds: Optional[float] = None
+
+
+class HedgePolicy:
+    """Decide when to hedge, run hedged pairs and keep statistics.
+
+    One policy is shared by every polisher in a process so latency
+    observations and the hedge report cover the whole run.
+    """
+
+    def __init__(
+        self,
+        backup: str,
+        percentile: float = 95.0,
+        initial_delay: float = 20.0,
+        min_delay: float = 1.0,
+        min_samples: int = 20,
+        max_threads: int = 32,
+    ):
+        if not backup:
+            raise ValueError("Hedging needs a backup model (--hedge MODEL or hedge.backup in runtime_config.yaml)")
+        if not 0 < percentile < 100:
+            raise ValueError(f"Hedge percentile must be between 0 and 100, got {percentile}")
+        if min_delay < 0 or initial_delay < min_delay:
+            raise ValueError(f"Hedge delays must satisfy 0 <= min_delay <= initial_delay, got {min_delay}, {initial_delay}")
+        self.backup = backup
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.min_samples = max(1, min_samples)
+        self.max_threads = max_threads
+        self.samples: List[_Sample] = []
+        self._latencies: Dict[HedgeKey, Deque[float]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Mapping,
+        backup: Optional[str] = None,
+        percentile: Optional[float] = None,
+        history_dir: Optional[Path] = constants.TELEMETRY_DIR,
+    ) -> "HedgePolicy":
+        """Build from runtime_config.yaml's optional ``hedge`` section; arguments override it.
+
+        ``hedge: {backup, percentile, initial_delay, min_delay, min_samples}``.
+        Latencies are seeded from ``history_dir`` (None skips the history).
+        """
+        hedge_cfg = config.get("hedge") or {}
+        policy = cls(
+            backup=backup or hedge_cfg.get("backup") or "",
+            percentile=float(percentile or hedge_cfg.get("percentile", 95.0)),
+            initial_delay=float(hedge_cfg.get("initial_delay", 20.0)),
+            min_delay=float(hedge_cfg.get("min_delay", 1.0)),
+            min_samples=int(hedge_cfg.get("min_samples", 20)),
+        )
+        if history_dir is not None:
+            policy.load_history(Path(history_dir))
+        return policy
+
+    def load_history(self, directory: Path, max_files: int = HISTORY_FILES) -> int:
+        """Seed latencies from telemetry JSONL files; returns how many were loaded.
+
+        Only successful, unhedged or primary single-project calls count:
+        batched requests and backup calls have different latency profiles.
+        """
+        files = sorted(directory.glob("calls-*.jsonl"), key=lambda path: path.stat().st_mtime)[-max_files:]
+        loaded = 0
+        for path in files:
+            try:
+                lines = path.read_text(encoding="utf-8").splitlines()
+            except OSError:
+                continue
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if (
+                    record.get("status") != "ok"
+                    or record.get("hedge") == "backup"
+                    or str(record.get("project") or "").startswith("batch: ")
+                ):
+                    continue
+                self.observe((record.get("provider", ""), record.get("model", "")), float(record["latency_seconds"]))
+                loaded += 1
+        return loaded
+
+    def observe(self, key: HedgeKey, seconds: float) -> None:
+        with self._lock:
+            self._latencies.setdefault(key, deque(maxlen=SUMMARY_WINDOW)).append(seconds)
+
+    def delay(self, key: HedgeKey) -> float:
+        """Seconds to wait for the primary before hedging."""
+        with self._lock:
+            latencies = sorted(self._latencies.get(key, ()))
+        if len(latencies) < self.min_samples:
+            return self.initial_delay
+        return max(self.min_delay, percentile(latencies, self.percentile))
+
+    def run(
+        self,
+        key: HedgeKey,
+        primary: Callable[[threading.Event], T],
+        backup: Callable[[threading.Event], T],
+    ) -> Tuple[T, str]:
+        """Run ``primary``, hedging with ``backup`` after ``delay(key)``.
+
+        Both callables receive an event that is set when they lose; they
+        should stop early (raising ``HedgeCancelled``) where they can.
+
+        Returns:
+            (result, winner) with winner "primary" or "backup"
+
+        Raises:
+            The primary's exception when both calls fail (or it fails before
+            the hedge fires)
+        """
+        started = time.perf_counter()
+        sample = _Sample(started)
+        cancels = {"primary": threading.Event(), "backup": threading.Event()}
+        futures: Dict[str, Future] = {"primary": self._pool().submit(primary, cancels["primary"])}
+        futures["primary"].add_done_callback(lambda future: self._primary_done(key, sample, future, started))
+        try:
+            result = futures["primary"].result(timeout=self.delay(key))
+        except FutureTimeout:
+            pass
+        else:
+            return self._finish(sample, started, result, "primary")
+
+        sample.fired = True
+        futures["backup"] = self._pool().submit(backup, cancels["backup"])
+        pending = set(futures.values())
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for name, future in futures.items():
+                if future in done and future.exception() is None:
+                    for other, event in cancels.items():
+                        if other != name:
+                            event.set()
+                    return self._finish(sample, started, future.result(), name)
+        self._finish(sample, started, None, "none")
+        raise futures["primary"].exception()
+
+    def _finish(self, sample: _Sample, started: float, result, winner: str):
+        sample.seconds = time.perf_counter() - started
+        sample.winner = winner
+        with self._lock:
+            self.samples.append(sample)
+        return result, winner
+
+    def _primary_done(self, key: HedgeKey, sample: _Sample, future: Future, started: float) -> None:
+        seconds = time.perf_counter() - started
+        # A cancelled primary only tells us it would have taken at least this long
+        sample.primary_seconds = seconds
+        if future.exception() is None:
+            self.observe(key, seconds)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix="hedge")
+            return self._executor
+
+    def close(self) -> None:
+        """Release the worker threads without waiting for discarded losers.
+
+        Queued calls are dropped; a losing blocking call already on the wire
+        still ends on its own (its reply is discarded). A later ``run`` starts
+        a new pool.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def report(self) -> Dict[str, object]:
+        """Hedge rate and p99 latency with hedging vs. the primary alone.
+
+        The primary-alone p99 uses each primary's own latency; for primaries
+        cancelled mid-stream or still running it uses their elapsed time so
+        far, so it understates the tail and the reported drop is a lower bound.
+        """
+        now = time.perf_counter()
+        with self._lock:
+            samples = list(self.samples)
+        if not samples:
+            return {"calls": 0}
+        hedged = sorted(sample.seconds for sample in samples)
+        alone = sorted(
+            sample.seconds if sample.winner == "primary"
+            else max(sample.seconds, sample.primary_seconds if sample.primary_seconds is not None else now - sample.started)
+            for sample in samples
+        )
+        p99, p99_alone = percentile(hedged, 99), percentile(alone, 99)
+        fired = sum(1 for sample in samples if sample.fired)
+        return {
+            "calls": len(samples),
+            "hedged": fired,
+            "hedge_rate": round(fired / len(samples), 4),
+            "backup_wins": sum(1 for sample in samples if sample.winner == "backup"),
+            "p99_seconds": round(p99, 3),
+            "p99_primary_only_seconds": round(p99_alone, 3),
+            "p99_reduction": round(1 - p99 / p99_alone, 4) if p99_alone else 0.0,
+        }
+
+
+def print_report(policy: HedgePolicy) -> None:
+    report = policy.report()
+    if not report["calls"]:
+        return
+    print(
+        f"Hedging ({policy.backup}): fired on {report['hedged']}/{report['calls']} call(s) "
+        f"({report['hedge_rate']:.1%}), backup won {report['backup_wins']}; "
+        f"p99 {report['p99_seconds']:.2f}s vs >= {report['p99_primary_only_seconds']:.2f}s primary alone "
+        f"(-{report['p99_reduction']:.1%})"
+    )
@@ -2,52 +2,255 @@
 from __future__ import annotations
 
 import os
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+THINK_OPEN = "<think>"
+THINK_CLOSE = "</think>"
+
+
+class ThinkTagFilter:
+    """Incrementally remove <think>...</think> blocks from streamed text.
+
+    Tags may be split across chunks, so a possible partial tag at the end of a
+    chunk is held back until the next chunk decides it. An unterminated block
+    is emitted verbatim on flush(), matching the non-streaming regex which only
+    removes complete blocks.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._inside = False
+
+    def feed(self, chunk: str) -> str:
+        """Add a chunk and return the text that is safe to emit."""
+        self._buffer += chunk
+        emitted = []
+        while True:
+            if self._inside:
+                end = self._buffer.find(THINK_CLOSE)
+                if end == -1:
+                    break
+                self._buffer = self._buffer[end + len(THINK_CLOSE):]
+                self._inside = False
+            else:
+                start = self._buffer.find(THINK_OPEN)
+                if start == -1:
+                    keep = _partial_tag_length(self._buffer, THINK_OPEN)
+                    cut = len(self._buffer) - keep
+                    emitted.append(self._buffer[:cut])
+                    self._buffer = self._buffer[cut:]
+                    break
+                emitted.append(self._buffer[:start])
+                self._buffer = self._buffer[start + len(THINK_OPEN):]
+                self._inside = True
+        return "".join(emitted)
+
+    def flush(self) -> str:
+        """Return any held-back text once the stream has ended."""
+        text = THINK_OPEN + self._buffer if self._inside else self._buffer
+        self._buffer = ""
+        self._inside = False
+        return text
+
+
+def _partial_tag_length(text: str, tag: str) -> int:
+    """Length of the longest suffix of ``text`` that is a proper prefix of ``tag``."""
+    for length in range(min(len(tag) - 1, len(text)), 0, -1):
+        if text.endswith(tag[:length]):
+            return length
+    return 0
+
+
+@dataclass
+class Usage:
+    """Token usage reported by the provider for one call."""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    # Prompt tokens served from the provider's prefix cache
+    cached_prompt_tokens: int = 0
+    # Time the backend spent evaluating the prompt (Ollama reports it)
+    prompt_eval_seconds: Optional[float] = None
+
+    def add(self, message) -> None:
+        """Accumulate ``usage_metadata`` from a LangChain message or chunk, if present."""
+        metadata = getattr(message, "usage_metadata", None) or {}
+        self.prompt_tokens += metadata.get("input_tokens", 0) or 0
+        self.completion_tokens += metadata.get("output_tokens", 0) or 0
+        details = metadata.get("input_token_details") or {}
+        self.cached_prompt_tokens += details.get("cache_read", 0) or 0
+
+    def add_ollama(self, info: Optional[Dict]) -> None:
+        """Accumulate the counters of Ollama's final ``/api/generate`` response."""
+        if not info:
+            return
+        self.prompt_tokens += info.get("prompt_eval_count", 0) or 0
+        self.completion_tokens += info.get("eval_count", 0) or 0
+        if info.get("prompt_eval_duration") is not None:
+            self.prompt_eval_seconds = (self.prompt_eval_seconds or 0.0) + info["prompt_eval_duration"] / 1e9
+
+    def merge(self, other: "Usage") -> None:
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cached_prompt_tokens += other.cached_prompt_tokens
+        if other.prompt_eval_seconds is not None:
+            self.prompt_eval_seconds = (self.prompt_eval_seconds or 0.0) + other.prompt_eval_seconds
+
+    @property
+    def reported(self) -> bool:
+        return bool(self.prompt_tokens or self.completion_tokens)
 
 
 class LangChainLLMClient(ABC):
     """Base class for LangChain LLM clients."""
 
+    provider: str = ""
+    model_name: str = ""
+    base_url: Optional[str] = None
+    temperature: Optional[float] = None
+    strip_think_tags: bool = False
+    # Whether the underlying SDK retries failed requests itself (see ClientRegistry.get)
+    sdk_retries: bool = False
+
     @abstractmethod
     def invoke(self, prompt: str) -> str:
         """Invoke the LLM with a prompt and return the response."""
         pass
 
+    def warm_up(self) -> str:
+        """Check connectivity (and load the model where that applies) before real calls.
+
+        Returns a short description of what was checked; raises ValueError
+        when the backend is unreachable or rejects the model.
+        """
+        return "no check available"
+
+    def invoke_with_usage(self, prompt: str, system: Optional[str] = None) -> Tuple[str, Usage]:
+        """Like ``invoke`` but also return the provider's token usage.
+
+        ``system`` is a static instruction prefix sent ahead of ``prompt``
+        (as a system message where the backend supports one). Clients whose
+        backend reports no usage return an empty ``Usage``.
+        """
+        return self.invoke(prompt if system is None else f"{system}\n\n{prompt}"), Usage()
+
+    def stream(self, prompt: str, usage: Optional[Usage] = None, system: Optional[str] = None) -> Iterator[str]:
+        """Yield response chunks as they arrive.
+
+        Clients without native streaming yield the full ``invoke`` result once.
+        ``usage``, when given, accumulates token usage reported by the stream.
+        """
+        text, reported = self.invoke_with_usage(prompt, system=system)
+        if usage is not None:
+            usage.merge(reported)
+        yield text
+
+    @staticmethod
+    def _messages(prompt: str, system: Optional[str]) -> Union[str, List[Tuple[str, str]]]:
+        """Chat input: the bare prompt, or a (system, human) message pair."""
+        return prompt if system is None else [("system", system), ("human", prompt)]
+
+    def _message_chunks(self, prompt: str, usage: Optional[Usage], system: Optional[str] = None) -> Iterator[str]:
+        """Text of chat-model stream chunks, collecting usage metadata on the way."""
+        for chunk in self.client.stream(self._messages(prompt, system)):
+            if usage is not None:
+                usage.add(chunk)
+            yield chunk.content
+
+    def _filter_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Drop <think> blocks and leading whitespace from raw chunks."""
+        think_filter = ThinkTagFilter() if self.strip_think_tags else None
+        started = False
+        for chunk in chunks:
+            text = think_filter.feed(chunk) if think_filter else chunk
+            if not started:
+                text = text.lstrip()
+                started = bool(text)
+            if text:
+                yield text
+        if think_filter:
+            tail = think_filter.flush()
+            if not started:
+                tail = tail.lstrip()
+            if tail:
+                yield tail
+
+    def _remove_think_tags(self, text: str) -> str:
+        """Remove <think>...</think> tags from text."""
+        think_filter = ThinkTagFilter()
+        return (think_filter.feed(text) + think_filter.flush()).strip()
+
 
 class OpenAILangChainClient(LangChainLLMClient):
     """OpenAI LLM client using LangChain."""
 
-    def __init__(self, model: str = "gpt-4o"):
+    provider = "openai"
+    temperature = 0.7
+    strip_think_tags = True
+    sdk_retries = True
+
+    def __init__(self, model: str = "gpt-4o", base_url: Optional[str] = None, max_retries: Optional[int] = None):
         from langchain_openai import ChatOpenAI
 
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
 
+        self.model_name = model
+        self.base_url = base_url
         self.client = ChatOpenAI(
             model=model,
             api_key=api_key,
-            temperature=0.7,
+            base_url=base_url,
+            temperature=self.temperature,
+            **({} if max_retries is None else {"max_retries": max_retries}),
         )
 
+    def warm_up(self) -> str:
+        """Retrieve the model (free) to verify the key, base URL and model access."""
+        import httpx
+
+        base_url = (self.base_url or "https://api.openai.com/v1").rstrip("/")
+        try:
+            response = httpx.get(
+                f"{base_url}/models/{self.model_name}",
+                headers={"Authorization": f"Bearer {os.getenv('OPENAI_API_KEY')}"},
+                timeout=_timeout("OPENAI", 10.0),
+            )
+        except httpx.HTTPError as e:
+            raise ValueError(f"OpenAI unreachable at {base_url}: {e}") from e
+        if response.status_code != 200:
+            raise ValueError(f"OpenAI rejected model '{self.model_name}': HTTP {response.status_code}")
+        return f"model {self.model_name} available at {base_url}"
+
     def invoke(self, prompt: str) -> str:
         """Invoke OpenAI model."""
-        response = self.client.invoke(prompt)
-        content = response.content
+        return self.invoke_with_usage(prompt)[0]
+
+    def invoke_with_usage(self, prompt: str, system: Optional[str] = None) -> Tuple[str, Usage]:
+        """Invoke OpenAI model and return the text with its token usage."""
+        response = self.client.invoke(self._messages(prompt, system))
+        usage = Usage()
+        usage.add(response)
         # Remove <think> tags and reasoning from extended thinking models
-        content = self._remove_think_tags(content)
-        return content
+        return self._remove_think_tags(response.content), usage
 
-    def _remove_think_tags(self, text: str) -> str:
-        """Remove <think>...</think> tags from text."""
-        import re
-        return re.sub(r'<think>.*?</think>', '', text, flags=re.DOTALL).strip()
+    def stream(self, prompt: str, usage: Optional[Usage] = None, system: Optional[str] = None) -> Iterator[str]:
+        """Stream model output with <think> blocks removed on the fly."""
+        return self._filter_stream(self._message_chunks(prompt, usage, system))
 
 
 class ZhipuLangChainClient(LangChainLLMClient):
     """Zhipu GLM LLM client using LangChain."""
 
+    provider = "zhipu"
+    temperature = 0.7
+    strip_think_tags = True
+
     def __init__(self, model: str = "glm-4"):
         from langchain_community.chat_models import ChatZhipuAI
 
@@ -55,53 +258,290 @@ class ZhipuLangChainClient(LangChainLLMClient):
         if not api_key:
             raise ValueError("ZHIPU_API_KEY environment variable not set")
 
+        self.model_name = model
         self.client = ChatZhipuAI(
             model=model,
             api_key=api_key,
-            temperature=0.7,
+            temperature=self.temperature,
         )
 
+    def warm_up(self) -> str:
+        """Send a one-token request (the API has no free model lookup)."""
+        try:
+            self.client.invoke("ping", max_tokens=1)
+        except Exception as e:
+            raise ValueError(f"Zhipu model '{self.model_name}' unavailable: {e}") from e
+        return f"model {self.model_name} answered a 1-token request"
+
     def invoke(self, prompt: str) -> str:
         """Invoke Zhipu GLM model."""
-        response = self.client.invoke(prompt)
-        content = response.content
+        return self.invoke_with_usage(prompt)[0]
+
+    def invoke_with_usage(self, prompt: str, system: Optional[str] = None) -> Tuple[str, Usage]:
+        """Invoke Zhipu GLM model and return the text with its token usage."""
+        response = self.client.invoke(self._messages(prompt, system))
+        usage = Usage()
+        usage.add(response)
         # Remove <think> tags and reasoning from extended thinking models
-        content = self._remove_think_tags(content)
-        return content
+        return self._remove_think_tags(response.content), usage
 
-    def _remove_think_tags(self, text: str) -> str:
-        """Remove <think>...</think> tags from text."""
-        import re
-        return re.sub(r'<think>.*?</think>', '', text, flags=re.DOTALL).strip()
+    def stream(self, prompt: str, usage: Optional[Usage] = None, system: Optional[str] = None) -> Iterator[str]:
+        """Stream model output with <think> blocks removed on the fly."""
+        return self._filter_stream(self._message_chunks(prompt, usage, system))
 
 
 class OllamaLangChainClient(LangChainLLMClient):
-    """Ollama LLM client using LangChain."""
+    """Ollama LLM client using LangChain.
+
+    ``OLLAMA_KEEP_ALIVE`` keeps the model (and its evaluated prompt prefix)
+    loaded between calls; ``OLLAMA_NUM_CTX`` sets a context window large
+    enough for the full prompt. Keep ``num_ctx`` fixed across calls: a
+    different value reloads the model and discards the cached prefix.
+    """
+
+    provider = "ollama"
 
-    def __init__(self, model: str = "llama2"):
+    def __init__(self, model: str = "llama2", base_url: Optional[str] = None):
         from langchain_community.llms import Ollama
 
-        host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+        num_ctx = os.getenv("OLLAMA_NUM_CTX")
+        self.model_name = model
+        self.base_url = base_url or os.getenv("OLLAMA_HOST", "http://localhost:11434")
+        self.keep_alive = os.getenv("OLLAMA_KEEP_ALIVE") or None
+        self.num_ctx = int(num_ctx) if num_ctx else None
         self.client = Ollama(
             model=model,
-            base_url=host,
+            base_url=self.base_url,
+            keep_alive=self.keep_alive,
+            num_ctx=self.num_ctx,
         )
 
+    def warm_up(self) -> str:
+        """Load the model into memory with an empty prompt.
+
+        Uses the same ``keep_alive`` / ``num_ctx`` as real calls so the first
+        project does not trigger a reload.
+        """
+        import httpx
+
+        payload: Dict[str, object] = {"model": self.model_name, "prompt": "", "stream": False}
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        if self.num_ctx is not None:
+            payload["options"] = {"num_ctx": self.num_ctx}
+        try:
+            response = httpx.post(
+                f"{self.base_url.rstrip('/')}/api/generate", json=payload, timeout=_timeout("OLLAMA", 300.0)
+            )
+        except httpx.HTTPError as e:
+            raise ValueError(f"Ollama unreachable at {self.base_url}: {e}") from e
+        if response.status_code == 404:
+            raise ValueError(f"Ollama has no model '{self.model_name}' (run: ollama pull {self.model_name})")
+        if response.status_code != 200:
+            raise ValueError(f"Ollama failed to load '{self.model_name}': HTTP {response.status_code}")
+        load = (response.json().get("load_duration") or 0) / 1e9
+        return f"model {self.model_name} loaded at {self.base_url} (load {load:.2f}s)"
+
     def invoke(self, prompt: str) -> str:
         """Invoke Ollama model."""
-        response = self.client.invoke(prompt)
-        return response
-
-
-def get_llm_client(model_name: str) -> LangChainLLMClient:
-    """Get appropriate LLM client based on model name."""
-    model_lower = model_name.lower()
-
-    if "gpt" in model_lower or "o1" in model_lower or "o4" in model_lower:
-        return OpenAILangChainClient(model=model_name)
-    elif "glm" in model_lower or "spark" in model_lower:
-        return ZhipuLangChainClient(model=model_name)
-    elif "ollama" in model_lower or "qwen" in model_lower or "mixtral" in model_lower:
-        return OllamaLangChainClient(model=model_name)
-    else:
-        raise ValueError(f"Unknown model: {model_name}")
+        return self.invoke_with_usage(prompt)[0]
+
+    def invoke_with_usage(self, prompt: str, system: Optional[str] = None) -> Tuple[str, Usage]:
+        """Invoke Ollama and return the text with token counts and prompt-eval time."""
+        result = self.client.generate([prompt], system=system)
+        generation = result.generations[0][0]
+        usage = Usage()
+        usage.add_ollama(generation.generation_info)
+        return generation.text, usage
+
+    def stream(self, prompt: str, usage: Optional[Usage] = None, system: Optional[str] = None) -> Iterator[str]:
+        """Stream Ollama output chunks (the streamed text carries no usage)."""
+        return self._filter_stream(self.client.stream(prompt, system=system))
+
+
+def _timeout(prefix: str, default: float) -> float:
+    value = os.getenv(f"{prefix}_TIMEOUT")
+    return float(value) if value else default
+
+
+PROVIDERS = {
+    "openai": OpenAILangChainClient,
+    "zhipu": ZhipuLangChainClient,
+    "ollama": OllamaLangChainClient,
+}
+# Base URL environment variable per provider (part of the registry key)
+BASE_URL_ENV = {"openai": "OPENAI_BASE_URL", "ollama": "OLLAMA_HOST"}
+
+# Exact model names / aliases -> (provider, model); model None = the provider's configured default
+MODEL_ALIASES: Dict[str, Tuple[str, Optional[str]]] = {
+    "gpt-4o": ("openai", "gpt-4o"),
+    "gpt-4o-mini": ("openai", "gpt-4o-mini"),
+    "glm-4": ("zhipu", "glm-4"),
+    "glm-4.6": ("zhipu", "glm-4.6"),
+    "ollama": ("ollama", None),
+}
+# Model families, matched as name prefixes when no alias applies
+MODEL_FAMILIES: Tuple[Tuple[str, str], ...] = (
+    ("gpt-", "openai"),
+    ("o1", "openai"),
+    ("o3", "openai"),
+    ("o4", "openai"),
+    ("glm-", "zhipu"),
+    ("spark", "zhipu"),
+    ("qwen", "ollama"),
+    ("llama", "ollama"),
+    ("mixtral", "ollama"),
+    ("mistral", "ollama"),
+    ("deepseek", "ollama"),
+)
+# Environment variable holding each provider's default model (for bare aliases such as "ollama")
+DEFAULT_MODEL_ENV = {"ollama": "OLLAMA_MODEL"}
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """A resolved model: which provider serves it, under which name, at which endpoint."""
+
+    provider: str
+    model: str
+    base_url: Optional[str] = None
+
+    def __str__(self) -> str:
+        return f"{self.provider}:{self.model}" + (f" @ {self.base_url}" if self.base_url else "")
+
+
+@dataclass(frozen=True)
+class ClientIdentity:
+    """What a client contributes to polish cache keys, known without creating the client."""
+
+    provider: str
+    model_name: str
+    temperature: Optional[float]
+
+
+@dataclass
+class WarmUpResult:
+    spec: ModelSpec
+    seconds: float
+    detail: str
+
+
+class ClientRegistry:
+    """Resolve model names explicitly and share one client per (provider, model, base_url).
+
+    A name resolves, in order, as ``provider:model`` (e.g. ``ollama:qwen2.5:7b``),
+    a configured or built-in alias (``MODEL_ALIASES``), or a known model
+    family prefix (``MODEL_FAMILIES``); anything else is rejected instead of
+    guessed. The base URL comes from the provider's environment variable at
+    lookup time, so a changed endpoint gets its own client.
+
+    Callers that retry through an ``LLMScheduler`` ask for ``sdk_retries=False``
+    so a failing request is not retried by both the SDK and the scheduler;
+    for providers whose SDK retries, that is a separate client.
+    """
+
+    def __init__(self, aliases: Optional[Mapping[str, str]] = None):
+        self.aliases: Dict[str, str] = dict(aliases or {})
+        self._clients: Dict[Tuple[ModelSpec, bool], LangChainLLMClient] = {}
+        self._warm: Dict[ModelSpec, WarmUpResult] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, config: Mapping) -> None:
+        """Add user aliases from runtime_config.yaml's optional ``model_aliases`` section.
+
+        ``model_aliases: {<alias>: <provider>:<model> | <model name>}``
+        """
+        self.aliases.update(config.get("model_aliases") or {})
+
+    def resolve(self, name: str, _seen: Tuple[str, ...] = ()) -> ModelSpec:
+        """Map a model name or alias to a ``ModelSpec``; raises ValueError when unknown."""
+        if name in self.aliases:
+            if name in _seen:
+                raise ValueError(f"Model alias loop: {' -> '.join((*_seen, name))}")
+            return self.resolve(self.aliases[name], (*_seen, name))
+        provider, model = self._split(name)
+        if model is None:
+            env = DEFAULT_MODEL_ENV.get(provider)
+            model = os.getenv(env) if env else None
+            if not model:
+                raise ValueError(f"No default model for '{name}'; use {provider}:<model> or set {env or 'an alias'}")
+        env = BASE_URL_ENV.get(provider)
+        return ModelSpec(provider, model, (os.getenv(env) or None) if env else None)
+
+    def _split(self, name: str) -> Tuple[str, Optional[str]]:
+        prefix, _, rest = name.partition(":")
+        if prefix in PROVIDERS and rest:
+            return prefix, rest
+        if name in MODEL_ALIASES:
+            return MODEL_ALIASES[name]
+        lowered = name.lower()
+        for family, provider in MODEL_FAMILIES:
+            if lowered.startswith(family):
+                return provider, name
+        options = ", ".join(sorted({*MODEL_ALIASES, *self.aliases}))
+        raise ValueError(
+            f"Unknown model: {name}. Use <provider>:<model> with provider in "
+            f"{', '.join(PROVIDERS)}, or one of: {options}"
+        )
+
+    def identity(self, name: str) -> ClientIdentity:
+        """Provider, model name and temperature ``get(name)`` would use; creates nothing.
+
+        Needs no API key or LangChain import, so cache-only runs work offline.
+        """
+        spec = self.resolve(name)
+        return ClientIdentity(spec.provider, spec.model, PROVIDERS[spec.provider].temperature)
+
+    def get(self, name: str, sdk_retries: bool = True) -> LangChainLLMClient:
+        """Return the shared client for ``name``, creating it on first use.
+
+        ``sdk_retries=False`` disables the SDK's own retries (``max_retries=0``).
+        """
+        spec = self.resolve(name)
+        client_class = PROVIDERS[spec.provider]
+        no_retries = client_class.sdk_retries and not sdk_retries
+        with self._lock:
+            client = self._clients.get((spec, no_retries))
+            if client is None:
+                kwargs: Dict[str, object] = {"model": spec.model}
+                if spec.base_url is not None:
+                    kwargs["base_url"] = spec.base_url
+                if no_retries:
+                    kwargs["max_retries"] = 0
+                client = self._clients[(spec, no_retries)] = client_class(**kwargs)
+            return client
+
+    def warm_up(self, name: str, sdk_retries: bool = True) -> WarmUpResult:
+        """Create the client and check its backend once per process (Ollama: load the model)."""
+        spec = self.resolve(name)
+        with self._lock:
+            if spec in self._warm:
+                return self._warm[spec]
+        client = self.get(name, sdk_retries)
+        started = time.perf_counter()
+        detail = client.warm_up()
+        result = WarmUpResult(spec, time.perf_counter() - started, detail)
+        with self._lock:
+            self._warm[spec] = result
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+            self._warm.clear()
+
+
+_registry = ClientRegistry()
+
+
+def get_client_registry() -> ClientRegistry:
+    """Return the process-wide client registry."""
+    return _registry
+
+
+def get_llm_client(model_name: str, sdk_retries: bool = True) -> LangChainLLMClient:
+    """Get the shared LLM client for a model name or alias (see ``ClientRegistry``).
+
+    Pass ``sdk_retries=False`` when calls go through an ``LLMScheduler``, which retries itself.
+    """
+    return _registry.get(model_name, sdk_retries)
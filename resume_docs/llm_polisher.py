@@ -1,17 +1,185 @@
 """LLM-based content polishing for resume projects."""
 from __future__ import annotations
 
-from typing import Dict, List, Optional
-
-from .langchain_clients import get_llm_client
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .field_mask import ProjectView
+from .hedging import HedgeCancelled, HedgePolicy
+from .langchain_clients import LangChainLLMClient, Usage, get_client_registry, get_llm_client
 from .llm_role_resolver import resolve_polish_role
+from .llm_scheduler import LLMScheduler, estimate_tokens
 from .models import ImpactMetrics, Project
-from .prompt_loader import PromptLoader
+from .polish_cache import PolishCache
+from .prompt_loader import CompiledPrompt, compile_prompt, get_prompt_loader, parse_batch_output
+from .telemetry import Telemetry
+
+
+@dataclass
+class PolishFailure:
+    """A project that could not be polished and kept its original content."""
+
+    index: int
+    project_name: str
+    error: str
+
+
+@dataclass
+class PolishTiming:
+    """Latency of one project's LLM call.
+
+    ``time_to_first_token`` is only measured in streaming mode.
+    """
+
+    project_name: str
+    total_seconds: float
+    time_to_first_token: Optional[float] = None
+    chars: int = 0
+
+
+@dataclass
+class PolishBatch:
+    """One multi-project request in batched mode.
+
+    ``parsed`` projects came back intact; the rest fell back to single requests.
+    """
+
+    project_names: List[str]
+    parsed: int
+    seconds: float
+
+
+@dataclass
+class PolishRequest:
+    """One LLM call ``polish_projects`` would make, for offline batch jobs.
+
+    ``key`` is the polish cache key, so a result stored under it is what a
+    later run (e.g. with ``cache_only``) picks up.
+    """
+
+    key: str
+    project_name: str
+    system: Optional[str]
+    prompt: str
+
+
+@dataclass
+class _CallStats:
+    """What one ``_call`` observed across its attempts."""
+
+    attempts: int = 0
+    time_to_first_token: Optional[float] = None
+    usage: Optional[Usage] = None
+    # Set when this call lost a hedged pair; streaming stops at the next chunk
+    cancelled: Optional[threading.Event] = None
+
+
+class _DeferredClient:
+    """A model's cache identity; the real client is created on its first LLM call.
+
+    Cache hits (and cache-only runs) therefore need no API key, LangChain
+    import or network access.
+    """
+
+    def __init__(self, model_name: str, sdk_retries: bool = True):
+        identity = get_client_registry().identity(model_name)
+        self.name = model_name
+        self.sdk_retries = sdk_retries
+        self.provider = identity.provider
+        self.model_name = identity.model_name
+        self.temperature = identity.temperature
+
+    def resolve(self):
+        return get_llm_client(self.name, self.sdk_retries)
+
+
+# Called as progress(project_name, chunk) for every streamed chunk. If the callback
+# has a ``reset(project_name)`` attribute, it is called when an attempt that already
+# streamed chunks fails (it is retried, or lost a hedged pair): its text is discarded.
+ProgressCallback = Callable[[str, str], None]
+
+
+class PolishError(ValueError):
+    """Raised when one or more projects failed to polish.
+
+    ``projects`` holds the full result list in input order: polished projects
+    where the LLM call succeeded and the original project where it failed, so
+    callers can still render a complete resume.
+    """
+
+    def __init__(self, projects: List[Project], failures: List[PolishFailure]):
+        self.projects = projects
+        self.failures = failures
+        names = ", ".join(f"'{f.project_name}'" for f in failures)
+        super().__init__(f"Failed to polish {len(failures)} project(s): {names}")
+
+
+# "inline": one prompt with the project text spliced into the instructions;
+# "prefix": static instructions first (as a system message where supported),
+# byte-identical per role × language so providers and Ollama can reuse the prefix
+PROMPT_LAYOUTS = ("inline", "prefix")
+# Batched polishing: completion tokens reserved per project when sizing a batch,
+# and a cap on projects per request to keep the delimited output reliable
+BATCH_OUTPUT_TOKENS = 800
+BATCH_MAX_PROJECTS = 8
 
 
 class LLMPolisher:
     """Polishes project descriptions using LLM."""
 
+    def __init__(
+        self,
+        max_workers: int = 1,
+        cache: Optional[PolishCache] = None,
+        stream: bool = False,
+        progress: Optional[ProgressCallback] = None,
+        scheduler: Optional[LLMScheduler] = None,
+        telemetry: Optional[Telemetry] = None,
+        prompt_layout: str = "inline",
+        batch_tokens: int = 0,
+        cache_only: bool = False,
+        hedge: Optional[HedgePolicy] = None,
+    ):
+        """
+        Args:
+            max_workers: Number of projects polished concurrently (1 = sequential)
+            cache: Optional persistent cache of polished text; None disables caching
+            stream: Consume client output incrementally to measure time to first token
+            progress: Optional callback receiving (project_name, chunk) while streaming
+            scheduler: Optional rate limiter / retry layer shared across polishers
+            telemetry: Optional recorder receiving one record per LLM call
+            prompt_layout: "inline" or "prefix" (see ``PROMPT_LAYOUTS``)
+            batch_tokens: Token budget (prompt plus expected completion) per
+                multi-project request; 0 sends one project per request
+            cache_only: Never call the LLM; projects without a cached result
+                fail (and keep their original content)
+            hedge: Optional policy re-sending slow single-project calls to a
+                backup model (see ``resume_docs.hedging``)
+        """
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be >= 1, got {max_workers}")
+        if prompt_layout not in PROMPT_LAYOUTS:
+            raise ValueError(f"Unknown prompt layout '{prompt_layout}'. Options: {', '.join(PROMPT_LAYOUTS)}")
+        if batch_tokens < 0:
+            raise ValueError(f"batch_tokens must be >= 0, got {batch_tokens}")
+        if cache_only and cache is None:
+            raise ValueError("cache_only requires a cache")
+        self.max_workers = max_workers
+        self.cache = cache
+        self.stream = stream
+        self.progress = progress
+        self.scheduler = scheduler
+        self.telemetry = telemetry
+        self.prompt_layout = prompt_layout
+        self.batch_tokens = batch_tokens
+        self.cache_only = cache_only
+        self.hedge = hedge
+        self._fallback_prompts: Dict[str, CompiledPrompt] = {}
+        self.timings: List[PolishTiming] = []
+        self.batches: List[PolishBatch] = []
+
     def polish_projects(
         self,
         projects: List[Project],
@@ -19,33 +187,113 @@ class LLMPolisher:
         locale: str,
         persona: Optional[Dict] = None,
         role: Optional[str] = None,
+        client=None,
     ) -> List[Project]:
         """Polish project descriptions using LLM.
 
+        Projects are polished on up to ``max_workers`` threads; the returned
+        list always keeps the input order. With ``batch_tokens`` set, projects
+        sharing a prompt are grouped into multi-project requests sized to the
+        budget; any project missing from a batched reply is retried alone.
+
         Args:
             projects: List of projects to polish
             model_name: Name of the LLM model to use
             locale: Locale for language-aware polishing (e.g., 'zh-CN', 'en-US')
             persona: Optional persona configuration
             role: Optional role name for role-aware prompt generation
+            client: Optional pre-built LLM client to share across calls;
+                when omitted, the shared client for ``model_name`` is created
+                only once a cache miss needs an LLM call
 
         Returns:
             List of projects with polished descriptions
 
         Raises:
-            ValueError: If LLM invocation fails
+            PolishError: If any project fails; carries the partial results and
+                per-project failures
+            ValueError: If the LLM client cannot be created
         """
-        client = get_llm_client(model_name)
-        polished_projects = []
+        # The scheduler retries failed calls; the SDK must not retry them as well
+        sdk_retries = self.scheduler is None
+        if client is None:
+            client = _DeferredClient(model_name, sdk_retries)
+        backup = (
+            _DeferredClient(self.hedge.backup, sdk_retries) if self.hedge is not None and not self.cache_only else None
+        )
+        polished_projects: List[Project] = list(projects)
+        failures: List[PolishFailure] = []
+
+        def polish(unit: List[int]) -> None:
+            if len(unit) > 1:
+                unit = self._polish_batch(unit, projects, client, locale, persona, role, polished_projects)
+            for index in unit:
+                project = projects[index]
+                try:
+                    polished_projects[index] = self._polish_single_project(
+                        project, client, locale, persona, role, backup
+                    )
+                except ValueError as e:
+                    failures.append(PolishFailure(index, project.project_name, str(e)))
+
+        if self.batch_tokens and not self.cache_only:
+            units = self.plan_batches(projects, client, locale, persona, role)
+        else:
+            units = [[index] for index in self.polish_order(projects, role)]
+        if self.max_workers == 1 or len(units) <= 1:
+            for unit in units:
+                polish(unit)
+        else:
+            from concurrent.futures import ThreadPoolExecutor
 
-        for project in projects:
-            polished_project = self._polish_single_project(
-                project, client, locale, persona, role
-            )
-            polished_projects.append(polished_project)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                list(executor.map(polish, units))
 
+        if failures:
+            failures.sort(key=lambda f: f.index)
+            raise PolishError(polished_projects, failures)
         return polished_projects
 
+    def polish_order(self, projects: List[Project], role: Optional[str] = None) -> List[int]:
+        """Indices in the order projects are sent to the LLM.
+
+        In the prefix layout and in batched mode, projects sharing an
+        effective role (and thus a static prefix) are sent back to back so a
+        backend that keeps only the last evaluated context (e.g. Ollama) can
+        reuse it, and so they can share a batch.
+        """
+        if (self.prompt_layout != "prefix" and not self.batch_tokens) or not role:
+            return list(range(len(projects)))
+        first_seen: Dict[Optional[str], int] = {}
+        groups = [first_seen.setdefault(resolve_polish_role(role, project), len(first_seen)) for project in projects]
+        return sorted(range(len(projects)), key=groups.__getitem__)
+
+    def pending_requests(
+        self,
+        projects: List[Project],
+        client,
+        locale: str,
+        persona: Optional[Dict] = None,
+        role: Optional[str] = None,
+    ) -> List[PolishRequest]:
+        """Single-project requests ``polish_projects`` would send, skipping cached ones.
+
+        Args mirror ``polish_projects``; ``client`` only supplies the model
+        name and temperature for the cache key and is not called.
+        """
+        if self.cache is None:
+            raise ValueError("pending_requests requires a cache")
+        requests = []
+        for index in self.polish_order(projects, role):
+            project = projects[index]
+            if not project.project_overview:
+                continue
+            system, prompt = self.build_prompt(project, locale, persona, role)
+            key = self._cache_key(client, system, prompt)
+            if self.cache.get(key) is None:
+                requests.append(PolishRequest(key, project.project_name, system, prompt))
+        return requests
+
     def _polish_single_project(
         self,
         project: Project,
@@ -53,6 +301,7 @@ class LLMPolisher:
         locale: str,
         persona: Optional[Dict] = None,
         role: Optional[str] = None,
+        backup=None,
     ) -> Project:
         """Polish a single project's description.
 
@@ -62,42 +311,24 @@ class LLMPolisher:
             locale: Locale for language-aware polishing
             persona: Optional persona configuration
             role: Optional role name for role-aware prompt
+            backup: Optional client the call is hedged on (requires ``hedge``)
 
         Returns:
             Project with polished description
+
+        Raises:
+            ValueError: If the LLM invocation fails
         """
         if not project.project_overview:
             return project
-        language = self._get_language_from_locale(locale)
-        persona_hint = self._get_persona_hint(persona, language)
-
-        # Use project-level effective role when available to reduce hallucinations
         effective_role = resolve_polish_role(role, project) if role else None
+        system, prompt = self.build_prompt(project, locale, persona, role)
 
-        # If the effective role for this project differs from the global CLI role,
-        # drop the persona hint to avoid mixing, e.g. "AI 应用工程"结构 + "数据平台负责人"语气，
-        # which has been shown to encourage made-up data platform narratives.
-        if effective_role and role and effective_role != role:
-            persona_hint = None
-
-        if effective_role:
-            prompt_loader = PromptLoader()
-            prompt = prompt_loader.build_role_aware_prompt(
-                project.project_overview, language, effective_role, persona_hint
-            )
-        else:
-            # No suitable role hint: fall back to a base polishing prompt
-            prompt = self._build_polish_prompt(
-                project.project_overview, language, persona_hint
-            )
-
-        try:
-            polished_text = client.invoke(prompt)
-        except Exception as e:
-            raise ValueError(
-                f"Failed to polish project '{project.project_name}': {e}"
-            )
+        polished_text = self._invoke_cached(client, prompt, project, effective_role or role, locale, system, backup)
+        return self._apply_polished(project, polished_text)
 
+    def _apply_polished(self, project: Project, polished_text: str) -> Project:
+        """Copy of ``project`` whose overview is ``polished_text`` and raw fields are cleared."""
         # Create a copy of the project with polished description
         polished_project = self._copy_project(project)
         polished_text = polished_text.strip()
@@ -119,6 +350,338 @@ class LLMPolisher:
 
         return polished_project
 
+    def build_prompt(
+        self,
+        project: Project,
+        locale: str,
+        persona: Optional[Dict] = None,
+        role: Optional[str] = None,
+    ) -> Tuple[Optional[str], str]:
+        """Build the polishing prompt for one project in this polisher's layout.
+
+        Args:
+            project: Project whose overview is polished
+            locale: Locale for language-aware polishing
+            persona: Optional persona configuration
+            role: Optional role name for role-aware prompt
+
+        Returns:
+            (system, prompt): ``system`` is None in the inline layout; in the
+            prefix layout it holds the static instructions shared by every
+            project with the same effective role and language
+        """
+        compiled, persona_hint = self._prompt_parts(project, locale, persona, role)
+        if self.prompt_layout == "prefix":
+            return compiled.split(project.project_overview, persona_hint)
+        return None, compiled.render(project.project_overview, persona_hint)
+
+    def _prompt_parts(
+        self, project: Project, locale: str, persona: Optional[Dict], role: Optional[str]
+    ) -> Tuple[CompiledPrompt, Optional[str]]:
+        """Compiled prompt and persona hint used for ``project``."""
+        language = self._get_language_from_locale(locale)
+        persona_hint = self._get_persona_hint(persona, language)
+
+        # Use project-level effective role when available to reduce hallucinations
+        effective_role = resolve_polish_role(role, project) if role else None
+
+        # If the effective role for this project differs from the global CLI role,
+        # drop the persona hint to avoid mixing, e.g. "AI 应用工程"结构 + "数据平台负责人"语气，
+        # which has been shown to encourage made-up data platform narratives.
+        if effective_role and role and effective_role != role:
+            persona_hint = None
+
+        if effective_role:
+            compiled = get_prompt_loader().compile(language, effective_role)
+        else:
+            # No suitable role hint: fall back to a base polishing prompt
+            compiled = self._fallback_prompt(language)
+        return compiled, persona_hint
+
+    def plan_batches(
+        self,
+        projects: List[Project],
+        client,
+        locale: str,
+        persona: Optional[Dict] = None,
+        role: Optional[str] = None,
+    ) -> List[List[int]]:
+        """Group project indices into requests that fit ``batch_tokens``.
+
+        Only projects sharing a compiled prompt and persona hint are batched.
+        Each batch pays for the shared instructions once, plus every project's
+        text and ``BATCH_OUTPUT_TOKENS`` of expected completion. Empty and
+        cached projects stay single (they make no LLM call).
+        """
+        units: List[List[int]] = []
+        current: List[int] = []
+        current_parts = None
+        used = 0
+        for index in self.polish_order(projects, role):
+            project = projects[index]
+            if not project.project_overview or self._cached_text(client, project, locale, persona, role) is not None:
+                units.append([index])
+                continue
+            parts = self._prompt_parts(project, locale, persona, role)
+            cost = estimate_tokens(project.project_overview) + BATCH_OUTPUT_TOKENS
+            if parts != current_parts or len(current) >= BATCH_MAX_PROJECTS or used + cost > self.batch_tokens:
+                if current:
+                    units.append(current)
+                compiled, persona_hint = parts
+                current, current_parts = [], parts
+                used = estimate_tokens("".join(compiled.split_batch([], persona_hint)))
+            current.append(index)
+            used += cost
+        if current:
+            units.append(current)
+        return units
+
+    def _polish_batch(
+        self,
+        unit: List[int],
+        projects: List[Project],
+        client,
+        locale: str,
+        persona: Optional[Dict],
+        role: Optional[str],
+        results: List[Project],
+    ) -> List[int]:
+        """Polish ``unit`` in one request; returns indices that need single requests."""
+        first = projects[unit[0]]
+        compiled, persona_hint = self._prompt_parts(first, locale, persona, role)
+        system, prompt = compiled.split_batch([projects[index].project_overview for index in unit], persona_hint)
+        if self.prompt_layout != "prefix":
+            system, prompt = None, _join_prompt(system, prompt)
+        names = [projects[index].project_name for index in unit]
+        effective_role = resolve_polish_role(role, first) if role else None
+        started = time.perf_counter()
+        try:
+            reply = self._call(client, prompt, f"batch: {', '.join(names)}", effective_role or role, locale, system)
+        except ValueError:
+            self.batches.append(PolishBatch(names, 0, time.perf_counter() - started))
+            return list(unit)
+
+        items = parse_batch_output(reply)
+        remaining = []
+        for number, index in enumerate(unit, 1):
+            polished_text = items.get(number)
+            if polished_text is None:
+                remaining.append(index)
+                continue
+            project = projects[index]
+            results[index] = self._apply_polished(project, polished_text)
+            if self.cache is not None:
+                # Stored under the single-project key: the same content is not polished again
+                self.cache.set(
+                    self._cache_key(client, *self.build_prompt(project, locale, persona, role)),
+                    polished_text,
+                    project_name=project.project_name,
+                )
+        self.batches.append(PolishBatch(names, len(unit) - len(remaining), time.perf_counter() - started))
+        return remaining
+
+    def _cache_key(self, client, system: Optional[str], prompt: str) -> str:
+        model_name = getattr(client, "model_name", "") or type(client).__name__
+        return self.cache.make_key(
+            prompt if system is None else f"{system}\x00{prompt}", model_name, getattr(client, "temperature", None)
+        )
+
+    def _cached_text(self, client, project: Project, locale: str, persona, role) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return self.cache.get(self._cache_key(client, *self.build_prompt(project, locale, persona, role)))
+
+    def _invoke_cached(
+        self,
+        client,
+        prompt: str,
+        project: Project,
+        role: Optional[str] = None,
+        locale: Optional[str] = None,
+        system: Optional[str] = None,
+        backup=None,
+    ) -> str:
+        """Invoke the client, serving and storing results through the cache.
+
+        The cache key is the final prompt (and system prefix, if any) plus the
+        client's model name and temperature, so any edit to the project text
+        or prompt config misses. Calls that reach the client are reported to
+        ``telemetry``. With a ``backup`` client the call is hedged; a backup
+        reply is cached under the primary's key (tagged ``hedged_by``) so
+        later runs reproduce the same output.
+        """
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self._cache_key(client, system, prompt)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+            if self.cache_only:
+                raise ValueError(f"No cached result for project '{project.project_name}' (cache-only mode)")
+
+        if backup is None:
+            polished_text, winner = self._call(client, prompt, project.project_name, role, locale, system), "primary"
+        else:
+            polished_text, winner = self._hedged_call(client, backup, prompt, project.project_name, role, locale, system)
+        if cache_key is not None:
+            metadata = {"hedged_by": getattr(backup, "model_name", "")} if winner == "backup" else {}
+            self.cache.set(cache_key, polished_text, project_name=project.project_name, **metadata)
+        return polished_text
+
+    def _hedged_call(
+        self, client, backup, prompt: str, name: str, role: Optional[str], locale: Optional[str], system: Optional[str]
+    ) -> Tuple[str, str]:
+        """``_call`` on ``client``, re-sent to ``backup`` when slow; returns (text, winner)."""
+        key = (
+            getattr(client, "provider", "") or type(client).__name__,
+            getattr(client, "model_name", "") or type(client).__name__,
+        )
+
+        def attempt(target, label: str):
+            return lambda cancelled: self._call(target, prompt, name, role, locale, system, label, cancelled)
+
+        return self.hedge.run(key, attempt(client, "primary"), attempt(backup, "backup"))
+
+    def _call(
+        self,
+        client,
+        prompt: str,
+        name: str,
+        role: Optional[str] = None,
+        locale: Optional[str] = None,
+        system: Optional[str] = None,
+        hedge: Optional[str] = None,
+        cancelled: Optional[threading.Event] = None,
+    ) -> str:
+        """Invoke the client through the scheduler and report the call to ``telemetry``.
+
+        ``name`` labels the call (project name, or the projects of a batch).
+        ``hedge`` ("primary" / "backup") marks a call of a hedged pair;
+        ``cancelled`` is set when it lost.
+
+        Raises:
+            ValueError: If the LLM invocation fails
+        """
+        if isinstance(client, _DeferredClient):
+            client = client.resolve()
+        model_name = getattr(client, "model_name", "") or type(client).__name__
+        provider = getattr(client, "provider", "") or type(client).__name__
+        full_prompt = _join_prompt(system, prompt)
+        stats = _CallStats(cancelled=cancelled)
+        started = time.perf_counter()
+        try:
+            if self.scheduler is not None:
+                text = self.scheduler.run(
+                    provider,
+                    lambda: self._invoke(client, prompt, name, stats, system),
+                    estimate_tokens(full_prompt),
+                    cancelled=cancelled,
+                )
+            else:
+                text = self._invoke(client, prompt, name, stats, system)
+        except HedgeCancelled as e:
+            self._record(provider, model_name, full_prompt, None, stats, started, role, locale, name, e, hedge)
+            raise
+        except Exception as e:
+            self._record(provider, model_name, full_prompt, None, stats, started, role, locale, name, e, hedge)
+            raise ValueError(
+                f"Failed to polish project '{name}': {e}"
+            )
+        self._record(provider, model_name, full_prompt, text, stats, started, role, locale, name, hedge=hedge)
+        return text
+
+    def _record(
+        self, provider, model_name, prompt, text, stats: _CallStats, started, role, locale, name, error=None, hedge=None
+    ) -> None:
+        """Send one call to ``telemetry``; token counts are estimated when the client reports none."""
+        if self.telemetry is None:
+            return
+        usage = stats.usage
+        estimated = usage is None or not usage.reported
+        self.telemetry.record(
+            provider,
+            model_name,
+            estimate_tokens(prompt) if estimated else usage.prompt_tokens,
+            (estimate_tokens(text) if text else 0) if estimated else usage.completion_tokens,
+            time.perf_counter() - started,
+            tokens_estimated=estimated,
+            role=role,
+            locale=locale,
+            project=name,
+            time_to_first_token=stats.time_to_first_token,
+            cached_prompt_tokens=0 if estimated else usage.cached_prompt_tokens,
+            prompt_eval_seconds=None if usage is None else usage.prompt_eval_seconds,
+            retries=max(0, stats.attempts - 1),
+            hedge=hedge,
+            status="ok" if error is None else "cancelled" if isinstance(error, HedgeCancelled) else "error",
+            error=None if error is None else str(error)[:200],
+        )
+
+    def _invoke(
+        self,
+        client,
+        prompt: str,
+        name: str,
+        stats: Optional[_CallStats] = None,
+        system: Optional[str] = None,
+    ) -> str:
+        """Call the client (streaming when enabled) and record its latency.
+
+        ``stats`` collects attempts, time to first token and reported usage.
+        ``system`` is sent as a separate system prompt by LangChain clients;
+        other clients receive it prepended to ``prompt``.
+        """
+        stats = stats if stats is not None else _CallStats()
+        stats.attempts += 1
+        # Only LangChain clients report usage; other clients (e.g. stubs) get estimates
+        usage = stats.usage = Usage() if isinstance(client, LangChainLLMClient) else None
+        if usage is None:
+            prompt, system = _join_prompt(system, prompt), None
+        started = time.perf_counter()
+        if not self.stream or not hasattr(client, "stream"):
+            if usage is not None:
+                text, stats.usage = client.invoke_with_usage(prompt, system=system)
+            else:
+                text = client.invoke(prompt)
+            if stats.cancelled is not None and stats.cancelled.is_set():
+                # A blocking request cannot be interrupted; drop its reply once it returns
+                raise HedgeCancelled(f"'{name}' answered by the other hedged call")
+            self.timings.append(
+                PolishTiming(name, time.perf_counter() - started, chars=len(text))
+            )
+            return text
+
+        first_token = None
+        chunks: List[str] = []
+        try:
+            chunks_source = client.stream(prompt, usage, system=system) if usage is not None else client.stream(prompt)
+            for chunk in chunks_source:
+                if stats.cancelled is not None and stats.cancelled.is_set():
+                    # Lost a hedged pair: stop reading so the connection is released
+                    close = getattr(chunks_source, "close", None)
+                    if close is not None:
+                        close()
+                    raise HedgeCancelled(f"'{name}' answered by the other hedged call")
+                if not chunk:
+                    continue
+                if first_token is None:
+                    first_token = time.perf_counter() - started
+                chunks.append(chunk)
+                if self.progress:
+                    self.progress(name, chunk)
+        except BaseException:
+            # A retry streams from the start again: let the display drop this attempt's text
+            reset = getattr(self.progress, "reset", None)
+            if chunks and reset is not None:
+                reset(name)
+            raise
+        text = "".join(chunks)
+        stats.time_to_first_token = first_token
+        self.timings.append(
+            PolishTiming(name, time.perf_counter() - started, first_token, len(text))
+        )
+        return text
+
     def _build_polish_prompt(
         self, text: str, language: str, persona_hint: Optional[str] = None
     ) -> str:
@@ -132,13 +695,19 @@ class LLMPolisher:
         Returns:
             Prompt for LLM
         """
-        persona_line = ""
-        if persona_hint:
-            if language == "Chinese":
-                persona_line = f"\n角色视角提示（必须体现在措辞、指标与优先级中）：{persona_hint}\n"
-            else:
-                persona_line = f"\nPerspective cue (must shape tone, metrics, and emphasis): {persona_hint}\n"
+        return self._fallback_prompt(language).render(text, persona_hint)
+
+    def _fallback_prompt(self, language: str) -> CompiledPrompt:
+        """Base polishing prompt (used without a role), compiled once per language."""
+        compiled = self._fallback_prompts.get(language)
+        if compiled is None:
+            compiled = self._fallback_prompts[language] = compile_prompt(
+                lambda persona_line, text: self._polish_template(language, persona_line, text), language
+            )
+        return compiled
 
+    @staticmethod
+    def _polish_template(language: str, persona_line: str, text: str) -> str:
         if language == "Chinese":
             return f"""你是一名资深技术招聘官与简历优化专家，擅长根据候选人提供的项目内容，重写为结构清晰、量化明确、对招聘方友好的项目经验。
 
@@ -171,7 +740,7 @@ class LLMPolisher:
    - 原文缺少数据时，可以引用上述行业区间生成保守指标，并注明这是区间表现；严禁出现夸张数字（例如：超大用户量、远高于行业均值的增长率）。
 
 4. 重要：只输出上述6个部分的内容，不要包含任何其他信息（如Business、Technical、Challenges、Responsibilities、Solution、Deliverables、Impact等原始数据）；可以在成果部分使用前述行业区间，但不要超出这些范围，更不要虚构庞大里程碑、收入或用户规模。
-{persona_line if persona_line else ''}
+{persona_line}
 
 原始项目内容：
 {text}
@@ -209,7 +778,7 @@ Requirements:
    - When inferring metrics, rely only on the benchmark ranges above, clearly mark them as approximate, and never exceed those limits with inflated user counts or growth claims.
 
 4. Important: Output ONLY the 6 sections above. Do NOT include any other information such as Business, Technical, Challenges, Responsibilities, Solution, Deliverables, Impact, or any raw data from the source. The only acceptable synthetic metrics are those within the stated benchmark bands; do not introduce additional milestones, revenue, user counts, or percentages beyond them.
-{persona_line if persona_line else ''}
+{persona_line}
 
 Original project content:
 {text}
@@ -262,11 +831,18 @@ Please return only the structured project experience content without any prefix
         """Create a copy of a project.
 
         Args:
-            project: Project to copy
+            project: Project, or a role-filtered ``ProjectView``, to copy
 
         Returns:
-            Copy of the project
+            Mutable copy of the project; hidden view fields keep their defaults
         """
         from dataclasses import replace
 
+        if isinstance(project, ProjectView):
+            return project.materialize()
         return replace(project)
+
+
+def _join_prompt(system: Optional[str], prompt: str) -> str:
+    """Single-string form of a (system, prompt) pair for clients without system messages."""
+    return prompt if system is None else f"{system}\n\n{prompt}"
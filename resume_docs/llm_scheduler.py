@@ -0,0 +1,270 @@
+"""Rate-limit-aware scheduling, retry and backoff for LLM calls."""
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, TypeVar
+
+from .hedging import HedgeCancelled
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+PROVIDERS = ("openai", "zhipu", "ollama")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: one per CJK character, one per four other characters."""
+    if not text:
+        return 0
+    cjk = sum(1 for char in text if "一" <= char <= "鿿")
+    return max(1, cjk + (len(text) - cjk) // 4)
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``rate_per_minute``.
+
+    ``debit`` may push the balance negative (e.g. charging completion tokens
+    after the fact); later ``reserve`` calls then wait for the debt to refill.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None, clock=time.monotonic):
+        if rate_per_minute <= 0:
+            raise ValueError(f"rate_per_minute must be > 0, got {rate_per_minute}")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` tokens and return how long the caller must wait first."""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def debit(self, amount: float) -> None:
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+
+
+@dataclass
+class ProviderLimits:
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+
+
+@dataclass
+class RetryPolicy:
+    max_retries: int = 4
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given 0-based retry attempt."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+
+@dataclass
+class ProviderStats:
+    calls: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    waited_seconds: float = 0.0
+
+
+class LLMScheduler:
+    """Throttle, retry and back off LLM calls per provider.
+
+    Each provider may have a request bucket and a token bucket. Retryable
+    failures (429/5xx, timeouts, connection errors) are retried with
+    full-jitter exponential backoff; a ``Retry-After`` hint overrides the
+    backoff and pauses the whole provider, not just the failing call.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, ProviderLimits]] = None,
+        retry: Optional[RetryPolicy] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock=time.monotonic,
+    ):
+        self.retry = retry or RetryPolicy()
+        self._sleep = sleep
+        self._clock = clock
+        self._request_buckets: Dict[str, TokenBucket] = {}
+        self._token_buckets: Dict[str, TokenBucket] = {}
+        for provider, provider_limits in (limits or {}).items():
+            if provider_limits.requests_per_minute:
+                self._request_buckets[provider] = TokenBucket(provider_limits.requests_per_minute, clock=clock)
+            if provider_limits.tokens_per_minute:
+                self._token_buckets[provider] = TokenBucket(provider_limits.tokens_per_minute, clock=clock)
+        self._paused_until: Dict[str, float] = {}
+        self.stats: Dict[str, ProviderStats] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "LLMScheduler":
+        """Build from runtime_config.yaml (``<provider>.rate_limit`` and ``retry``)."""
+        limits = {}
+        for provider in PROVIDERS:
+            rate_cfg = (config.get(provider) or {}).get("rate_limit") or {}
+            if rate_cfg:
+                limits[provider] = ProviderLimits(
+                    requests_per_minute=rate_cfg.get("requests_per_minute"),
+                    tokens_per_minute=rate_cfg.get("tokens_per_minute"),
+                )
+        retry_cfg = config.get("retry") or {}
+        retry = RetryPolicy(
+            max_retries=int(retry_cfg.get("max_retries", RetryPolicy.max_retries)),
+            base_delay=float(retry_cfg.get("base_delay", RetryPolicy.base_delay)),
+            max_delay=float(retry_cfg.get("max_delay", RetryPolicy.max_delay)),
+        )
+        return cls(limits=limits, retry=retry)
+
+    def run(
+        self,
+        provider: str,
+        call: Callable[[], T],
+        tokens: int = 0,
+        cancelled: Optional[threading.Event] = None,
+    ) -> T:
+        """Run ``call`` within ``provider``'s budgets, retrying retryable errors.
+
+        Args:
+            provider: Provider key, e.g. "openai"
+            call: Zero-argument callable performing one LLM request
+            tokens: Estimated prompt tokens charged to the token bucket
+            cancelled: Set when the result is no longer wanted (e.g. the call
+                lost a hedged pair); checked before every attempt, retry and
+                wait, and waits end as soon as it is set
+
+        Returns:
+            The callable's result; string results are also charged to the
+            token bucket as completion tokens
+
+        Raises:
+            HedgeCancelled: If ``cancelled`` is set before the call succeeds
+        """
+        stats = self._stats(provider)
+        attempt = 0
+        while True:
+            self._wait_for_capacity(provider, tokens, stats, cancelled)
+            try:
+                result = call()
+            except Exception as exc:
+                _check(cancelled)
+                status = status_code_of(exc)
+                if attempt >= self.retry.max_retries or not is_retryable(exc, status):
+                    raise
+                retry_after = retry_after_of(exc)
+                with self._lock:
+                    stats.retries += 1
+                    if status == 429:
+                        stats.rate_limited += 1
+                    if retry_after is not None:
+                        # Pause the provider; _wait_for_capacity sleeps it off
+                        until = self._clock() + retry_after
+                        self._paused_until[provider] = max(self._paused_until.get(provider, 0.0), until)
+                if retry_after is None:
+                    self._pause(self.retry.backoff(attempt), stats, cancelled)
+                attempt += 1
+                continue
+            with self._lock:
+                stats.calls += 1
+            bucket = self._token_buckets.get(provider)
+            if bucket is not None and isinstance(result, str):
+                bucket.debit(estimate_tokens(result))
+            return result
+
+    def _wait_for_capacity(
+        self, provider: str, tokens: int, stats: ProviderStats, cancelled: Optional[threading.Event] = None
+    ) -> None:
+        _check(cancelled)
+        with self._lock:
+            paused = self._paused_until.get(provider, 0.0) - self._clock()
+        if paused > 0:
+            self._pause(paused, stats, cancelled)
+        wait = 0.0
+        bucket = self._request_buckets.get(provider)
+        if bucket is not None:
+            wait = max(wait, bucket.reserve(1))
+        bucket = self._token_buckets.get(provider)
+        if bucket is not None and tokens:
+            wait = max(wait, bucket.reserve(tokens))
+        if wait > 0:
+            self._pause(wait, stats, cancelled)
+
+    def _pause(self, seconds: float, stats: ProviderStats, cancelled: Optional[threading.Event] = None) -> None:
+        """Sleep ``seconds``; a cancellable pause waits on the event instead so it ends early."""
+        with self._lock:
+            stats.waited_seconds += seconds
+        if cancelled is None:
+            self._sleep(seconds)
+        elif cancelled.wait(seconds):
+            raise HedgeCancelled("call cancelled while waiting to retry")
+
+    def _stats(self, provider: str) -> ProviderStats:
+        with self._lock:
+            return self.stats.setdefault(provider, ProviderStats())
+
+
+def _check(cancelled: Optional[threading.Event]) -> None:
+    if cancelled is not None and cancelled.is_set():
+        raise HedgeCancelled("call cancelled before it was retried")
+
+
+def status_code_of(exc: BaseException) -> Optional[int]:
+    """Extract an HTTP status code from provider/SDK exceptions, if any."""
+    for source in (exc, getattr(exc, "response", None)):
+        for attr in ("status_code", "status", "http_status"):
+            value = getattr(source, attr, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def retry_after_of(exc: BaseException) -> Optional[float]:
+    """Return the ``Retry-After`` delay in seconds carried by ``exc``, if any."""
+    value = getattr(exc, "retry_after", None)
+    if value is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+        try:
+            value = headers.get("retry-after") or headers.get("Retry-After")
+        except AttributeError:
+            value = None
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc: BaseException, status: Optional[int] = None) -> bool:
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    # SDK transport errors (httpx, openai, requests) without a status code
+    names = {cls.__name__ for cls in type(exc).__mro__}
+    return any("Timeout" in name or "Connection" in name for name in names)
@@ -1,10 +1,13 @@
 """Load resume YAML data into in-memory dataclasses."""
 from __future__ import annotations
 
+import hashlib
+import os
+import pickle
+import sys
+import threading
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
-
-import yaml
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
 
 from . import constants, models
 from .role_config import ROLE_FILTERS
@@ -14,31 +17,134 @@ SKILLS_FILE = "skills_summary.yaml"
 PROJECTS_FILE = "projects_summary.yaml"
 WORK_FILE = "work_experience_summary.yaml"
 
+# Bump when parsing or validation changes in a way the input hashes cannot see
+SNAPSHOT_VERSION = 1
 
-def _read_yaml(path: Path) -> Any:
-    with path.open("r", encoding="utf-8") as handle:
-        return yaml.safe_load(handle)
 
+def _load_yaml(content) -> Any:
+    """Parse YAML bytes or a binary stream.
+
+    PyYAML is imported here, not at module level: a snapshot hit (e.g.
+    ``--dry-run`` on unchanged data) never needs it.
+    """
+    import yaml
 
-def load_resume_data(base_dir: Path | None = None, locale: str = "zh-CN") -> models.ResumeDocument:
+    # libyaml-backed loader when PyYAML was built with it; same safe semantics
+    return yaml.load(content, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def _read_yaml(path: Path) -> Any:
+    with path.open("rb") as handle:
+        return _load_yaml(handle)
+
+
+def load_resume_data(
+    base_dir: Path | None = None,
+    locale: str = "zh-CN",
+    use_snapshot: bool = True,
+    snapshot_dir: Path | None = None,
+) -> models.ResumeDocument:
+    """Parse and validate the four ``*_summary.yaml`` files for ``locale``.
+
+    A validated snapshot of the result is pickled under ``snapshot_dir``
+    (default ``artifacts/cache/resume``), keyed by the input file hashes, so
+    unchanged inputs skip YAML parsing and validation on the next load.
+    """
+    base_path = Path(base_dir or constants.LATEST_RESUMES_DIR)
+    files = list(locale_files(base_path, locale).values())
+    if not use_snapshot:
+        return _parse_files(*(_read_yaml(path) for path in files))
+
+    contents = [path.read_bytes() for path in files]
+    key = _snapshot_key(contents)
+    snapshot_path = _snapshot_path(snapshot_dir, base_path, locale)
+    document = _read_snapshot(snapshot_path, key)
+    if document is None:
+        document = _parse_files(*(_load_yaml(content) for content in contents))
+        _write_snapshot(snapshot_path, key, document)
+    return document
+
+
+def locale_files(base_dir: Path | None = None, locale: str = "zh-CN") -> Dict[str, Path]:
+    """Map each ``ResumeDocument`` section to the YAML file it is parsed from."""
     base_path = Path(base_dir or constants.LATEST_RESUMES_DIR)
     suffix = "_en" if locale == "en-US" else ""
-    personal_file = f"personal_info_summary{suffix}.yaml"
-    skills_file = f"skills_summary{suffix}.yaml"
-    projects_file = f"projects_summary{suffix}.yaml"
-    work_file = f"work_experience_summary{suffix}.yaml"
-    personal = _parse_personal(_read_yaml(base_path / personal_file))
-    skills = _parse_skills(_read_yaml(base_path / skills_file))
-    projects = _parse_projects(_read_yaml(base_path / projects_file))
-    work = _parse_work(_read_yaml(base_path / work_file))
+    return {
+        "personal_info": base_path / f"personal_info_summary{suffix}.yaml",
+        "skills": base_path / f"skills_summary{suffix}.yaml",
+        "projects": base_path / f"projects_summary{suffix}.yaml",
+        "work": base_path / f"work_experience_summary{suffix}.yaml",
+    }
+
+
+def _parse_files(personal: Any, skills: Any, projects: Any, work: Any) -> models.ResumeDocument:
     return models.ResumeDocument(
-        personal_info=personal,
-        skills=skills,
-        projects=projects,
-        work=work,
+        personal_info=_parse_personal(personal),
+        skills=_parse_skills(skills),
+        projects=_parse_projects(projects),
+        work=_parse_work(work),
     )
 
 
+def _snapshot_key(contents: Iterable[bytes]) -> str:
+    """Hash the inputs plus everything else that shapes the parsed result."""
+    digest = hashlib.sha256()
+    digest.update(f"{SNAPSHOT_VERSION}:{sys.version_info[:2]}".encode())
+    digest.update(_models_fingerprint())
+    for allowed in (
+        ROLE_FILTERS,
+        constants.ROLE_PERSPECTIVE_ALLOWED,
+        constants.BUDGET_LEVEL_ALLOWED,
+        constants.DECISION_ACCOUNTABILITY_ALLOWED,
+        constants.RESPONSIBILITY_FOCUS_ALLOWED,
+    ):
+        digest.update(repr(sorted(allowed)).encode())
+    for content in contents:
+        digest.update(hashlib.sha256(content).digest())
+    return digest.hexdigest()
+
+
+_models_digest: Optional[bytes] = None
+
+
+def _models_fingerprint() -> bytes:
+    """Hash of models.py so dataclass changes invalidate pickled snapshots."""
+    global _models_digest
+    if _models_digest is None:
+        _models_digest = hashlib.sha256(Path(models.__file__).read_bytes()).digest()
+    return _models_digest
+
+
+def _snapshot_path(snapshot_dir: Path | None, base_path: Path, locale: str) -> Path:
+    # One slot per data directory and locale; a new key overwrites the old snapshot
+    slot = hashlib.sha256(str(base_path.resolve()).encode("utf-8")).hexdigest()[:16]
+    return Path(snapshot_dir or constants.RESUME_SNAPSHOT_DIR) / f"{slot}-{locale}.pickle"
+
+
+def _read_snapshot(path: Path, key: str) -> Optional[models.ResumeDocument]:
+    try:
+        with path.open("rb") as handle:
+            stored_key, document = pickle.load(handle)
+    except Exception:  # missing, truncated or from an incompatible version
+        return None
+    if stored_key != key or not isinstance(document, models.ResumeDocument):
+        return None
+    return document
+
+
+def _write_snapshot(path: Path, key: str, document: models.ResumeDocument) -> None:
+    # Unique per thread too: the service and watch mode load locales concurrently
+    tmp_path = path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("wb") as handle:
+            pickle.dump((key, document), handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        # The snapshot is only an optimisation; a read-only tree still loads
+        tmp_path.unlink(missing_ok=True)
+
+
 def _parse_personal(data: Dict[str, Any]) -> models.PersonalInfo:
     education_entries = [models.EducationEntry(description=e["description"]) for e in data.get("education", [])]
     certs = [models.Certification(name=item["name"], url=item.get("url")) for item in data.get("certifications", [])]
@@ -65,8 +171,9 @@ def _parse_skills(data: Dict[str, Any]) -> models.SkillsSummary:
 
 def _parse_projects(data: Dict[str, Any]) -> List[models.Project]:
     projects: List[models.Project] = []
+    allowed_roles = frozenset(ROLE_FILTERS)
     for raw in data.get("projects", []):
-        _validate_project_enums(raw)
+        _validate_project_enums(raw, allowed_roles)
         timeframe = models.Timeframe(**raw.get("timeframe", {}) or {})
         management_scope = models.ManagementScope(**(raw.get("management_scope", {}) or {}))
         impact_metrics = models.ImpactMetrics(**(raw.get("impact_metrics", {}) or {}))
@@ -117,7 +224,7 @@ def _parse_work(data: Dict[str, Any]) -> models.WorkSummary:
     return models.WorkSummary(experiences=experiences, role_responsibilities=role_responsibilities)
 
 
-def _validate_project_enums(raw: Dict[str, Any]) -> None:
+def _validate_project_enums(raw: Dict[str, Any], allowed_roles: FrozenSet[str] | None = None) -> None:
     # Validate role_perspective against allowed enum values
     role = raw.get("role_perspective")
     if role and role not in constants.ROLE_PERSPECTIVE_ALLOWED:
@@ -134,7 +241,8 @@ def _validate_project_enums(raw: Dict[str, Any]) -> None:
             raise ValueError(f"Invalid responsibility_focus '{tag}' in project {raw.get('project_name')}")
 
     # Validate project-level LLM role hints against defined ROLE_FILTERS
-    allowed_roles = set(ROLE_FILTERS.keys())
+    if allowed_roles is None:
+        allowed_roles = frozenset(ROLE_FILTERS)
 
     primary = raw.get("llm_primary_role")
     if primary and primary not in allowed_roles:
@@ -1,7 +1,20 @@
 """Model client adapters package."""
 from . import base
-from .ollama_client import OllamaClient
-from .openai_client import OpenAIClient
-from .zhipu_client import ZhipuClient
 
 __all__ = ["base", "OllamaClient", "OpenAIClient", "ZhipuClient"]
+
+_LAZY_CLIENTS = {
+    "OllamaClient": ".ollama_client",
+    "OpenAIClient": ".openai_client",
+    "ZhipuClient": ".zhipu_client",
+}
+
+
+def __getattr__(name: str):
+    # Client modules import requests; load them only when a client is used.
+    module_name = _LAZY_CLIENTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    return getattr(import_module(module_name, __name__), name)
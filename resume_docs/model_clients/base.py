@@ -1,13 +1,100 @@
 """Base client definition."""
 from __future__ import annotations
 
-from typing import Dict
+import asyncio
+import os
+from typing import Dict, List, Sequence, Tuple
+
+from . import http_pool
+
+DEFAULT_TIMEOUT = 60
+DEFAULT_MAX_CONCURRENCY = 4
 
 
 class ModelInvocationError(RuntimeError):
-    """Raised when a downstream model invocation fails."""
+    """Raised when a downstream model invocation fails.
+
+    ``status_code`` and ``retry_after`` (raw Retry-After header) are set for HTTP errors so
+    the scheduler can decide whether and when to retry.
+    """
+
+    def __init__(self, message: str, status_code: int | None = None, retry_after: str | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
 
 
 class BaseModelClient:
-    def send_prompt(self, model_name: str, prompt: str, **kwargs) -> Dict[str, object]:  # pragma: no cover - interface
+    """HTTP model client with pooled sync and async transports.
+
+    Subclasses describe a request via :meth:`_build_request`; the base class
+    sends it over a keep-alive session (sync) or the event loop's shared
+    ``httpx`` pool with a per-host concurrency limit (async).
+    """
+
+    # Prefix for runtime-config driven env vars, e.g. OPENAI_TIMEOUT
+    env_prefix = ""
+    error_label = "Model"
+
+    def __init__(self, timeout: float | None = None, max_concurrency: int | None = None) -> None:
+        self.timeout = timeout if timeout is not None else _env_number(
+            f"{self.env_prefix}_TIMEOUT", DEFAULT_TIMEOUT, float
+        )
+        self.max_concurrency = max_concurrency or _env_number(
+            f"{self.env_prefix}_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY, int
+        )
+
+    def _build_request(self, model_name: str, prompt: str, **kwargs) -> Tuple[str, Dict[str, object], Dict[str, str]]:  # pragma: no cover - interface
+        """Return (url, json payload, headers) for one prompt."""
         raise NotImplementedError
+
+    def send_prompt(self, model_name: str, prompt: str, **kwargs) -> Dict[str, object]:
+        url, payload, headers = self._build_request(model_name, prompt, **kwargs)
+        response = http_pool.get_session().post(url, json=payload, headers=headers, timeout=self.timeout)
+        self._check_status(response.status_code, response.text, response.headers)
+        return response.json()
+
+    async def asend_prompt(self, model_name: str, prompt: str, **kwargs) -> Dict[str, object]:
+        """Async ``send_prompt`` sharing the loop's keep-alive connection pool."""
+        url, payload, headers = self._build_request(model_name, prompt, **kwargs)
+        pool = http_pool.get_async_pool()
+        async with pool.limit(url, self.max_concurrency):
+            response = await pool.client.post(url, json=payload, headers=headers, timeout=self.timeout)
+        self._check_status(response.status_code, response.text, response.headers)
+        return response.json()
+
+    def send_prompts(self, model_name: str, prompts: Sequence[str], **kwargs) -> List[object]:
+        """Send many prompts concurrently and return results in input order.
+
+        Failed prompts yield their exception instead of a response, so one bad
+        prompt does not discard the rest.
+        """
+
+        async def gather() -> List[object]:
+            try:
+                return await asyncio.gather(
+                    *(self.asend_prompt(model_name, prompt, **kwargs) for prompt in prompts),
+                    return_exceptions=True,
+                )
+            finally:
+                await http_pool.close_async_pool()
+
+        return asyncio.run(gather())
+
+    def _check_status(self, status_code: int, text: str, headers=None) -> None:
+        if status_code >= 400:
+            raise ModelInvocationError(
+                f"{self.error_label} error {status_code}: {text[:200]}",
+                status_code=status_code,
+                retry_after=(headers or {}).get("retry-after"),
+            )
+
+
+def _env_number(key: str, default, cast):
+    value = os.getenv(key)
+    if value in (None, ""):
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        return default
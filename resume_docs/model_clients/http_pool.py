@@ -0,0 +1,76 @@
+"""Shared keep-alive HTTP connection pools for model clients."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+from urllib.parse import urlsplit
+
+DEFAULT_MAX_CONNECTIONS = 32
+
+_thread_local = threading.local()
+
+
+def get_session():
+    """Return this thread's pooled ``requests.Session``.
+
+    Sessions keep TCP/TLS connections alive between calls; one per thread
+    avoids sharing a session's adapters across threads.
+    """
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        import requests
+
+        session = requests.Session()
+        _thread_local.session = session
+    return session
+
+
+class AsyncHTTPPool:
+    """Keep-alive ``httpx.AsyncClient`` plus per-host concurrency limits.
+
+    asyncio primitives are bound to an event loop, so each running loop gets
+    its own pool via :func:`get_async_pool`.
+    """
+
+    def __init__(self, max_connections: int = DEFAULT_MAX_CONNECTIONS):
+        import httpx
+
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def limit(self, url: str, max_concurrency: int) -> AsyncIterator[None]:
+        """Hold one of ``max_concurrency`` slots for the URL's host."""
+        host = urlsplit(url).netloc
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            semaphore = self._host_limits[host] = asyncio.Semaphore(max_concurrency)
+        async with semaphore:
+            yield
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+_async_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHTTPPool]" = weakref.WeakKeyDictionary()
+
+
+def get_async_pool() -> AsyncHTTPPool:
+    """Return the pool for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    pool = _async_pools.get(loop)
+    if pool is None:
+        pool = _async_pools[loop] = AsyncHTTPPool()
+    return pool
+
+
+async def close_async_pool() -> None:
+    """Close the running loop's pool (call before the loop shuts down)."""
+    pool = _async_pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.aclose()
@@ -2,28 +2,33 @@
 from __future__ import annotations
 
 import os
-from typing import Dict
-
-import requests
+from typing import Dict, Tuple
 
 from . import base
 
 
 class OllamaClient(base.BaseModelClient):
-    def __init__(self, host: str | None = None, timeout: int = 60) -> None:
+    env_prefix = "OLLAMA"
+    error_label = "Ollama"
+
+    def __init__(self, host: str | None = None, timeout: float | None = None, max_concurrency: int | None = None) -> None:
+        super().__init__(timeout=timeout, max_concurrency=max_concurrency)
         self.host = (host or os.getenv("OLLAMA_HOST") or "http://localhost:11434").rstrip("/")
-        self.timeout = timeout
+        self.keep_alive = os.getenv("OLLAMA_KEEP_ALIVE") or None
+        num_ctx = os.getenv("OLLAMA_NUM_CTX")
+        self.num_ctx = int(num_ctx) if num_ctx else None
 
-    def send_prompt(self, model_name: str, prompt: str, **kwargs) -> Dict[str, object]:
+    def _build_request(self, model_name: str, prompt: str, **kwargs) -> Tuple[str, Dict[str, object], Dict[str, str]]:
         url = f"{self.host}/api/generate"
         payload = {
             "model": model_name,
             "prompt": prompt,
             "stream": False,
         }
-        response = requests.post(url, json=payload, timeout=self.timeout)
-        if response.status_code >= 400:
-            raise base.ModelInvocationError(
-                f"Ollama error {response.status_code}: {response.text[:200]}"
-            )
-        return response.json()
+        if kwargs.get("system"):
+            payload["system"] = kwargs["system"]
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        if self.num_ctx is not None:
+            payload["options"] = {"num_ctx": self.num_ctx}
+        return url, payload, {}
@@ -1,22 +1,30 @@
-"""Dataclasses describing resume content."""
+"""Dataclasses describing resume content.
+
+All models use ``__slots__`` (no per-instance ``__dict__``). Immutable
+``Frozen*`` variants with tuple sequences are created by :func:`freeze`, and
+:func:`to_builtin` / :func:`write_json` serialise either kind without the
+deep copies made by ``dataclasses.asdict``.
+"""
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
-from typing import Dict, List, Optional
+import json
+import threading
+from dataclasses import MISSING, dataclass, field, fields, make_dataclass
+from typing import IO, Dict, Iterable, Iterator, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Certification:
     name: str
     url: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class EducationEntry:
     description: str
 
 
-@dataclass
+@dataclass(slots=True)
 class PersonalInfo:
     name: str
     phone: Optional[str] = None
@@ -29,32 +37,32 @@ class PersonalInfo:
     certifications: List[Certification] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class SkillCategory:
     category: str
     items: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class SkillsSummary:
     categories: List[SkillCategory] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Timeframe:
     label: Optional[str] = None
     start: Optional[str] = None
     end: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ManagementScope:
     team_size: Optional[int] = None
     budget_level: Optional[str] = None
     stakeholder_tiers: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ImpactMetrics:
     business_metrics: List[str] = field(default_factory=list)
     technical_metrics: List[str] = field(default_factory=list)
@@ -68,7 +76,7 @@ class ImpactMetrics:
         ]
 
 
-@dataclass
+@dataclass(slots=True)
 class Project:
     project_name: str
     company_or_context: Optional[str] = None
@@ -97,26 +105,26 @@ class Project:
     notes: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkExperienceEntry:
     company: str
     duration: Optional[str] = None
     title: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RoleResponsibility:
     role: str
     responsibilities: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkSummary:
     experiences: List[WorkExperienceEntry] = field(default_factory=list)
     role_responsibilities: List[RoleResponsibility] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ResumeDocument:
     personal_info: PersonalInfo
     skills: SkillsSummary
@@ -124,4 +132,149 @@ class ResumeDocument:
     work: WorkSummary
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return to_builtin(self)
+
+
+MODEL_CLASSES = (
+    Certification,
+    EducationEntry,
+    PersonalInfo,
+    SkillCategory,
+    SkillsSummary,
+    Timeframe,
+    ManagementScope,
+    ImpactMetrics,
+    Project,
+    WorkExperienceEntry,
+    RoleResponsibility,
+    WorkSummary,
+    ResumeDocument,
+)
+
+
+# Field names per model class (mutable and frozen), computed once for the serialisers;
+# frozen variants are added when first built
+_FIELD_NAMES: Dict[type, tuple] = {cls: tuple(f.name for f in fields(cls)) for cls in MODEL_CLASSES}
+_MODELS_BY_NAME: Dict[str, type] = {cls.__name__: cls for cls in MODEL_CLASSES}
+_FROZEN: Dict[type, type] = {}
+_frozen_lock = threading.RLock()
+
+
+def _frozen_variant(cls: type) -> type:
+    """Build ``Frozen<cls>``: same fields and methods, frozen and slotted.
+
+    Defaults are immutable too: list factories become ``()`` and nested
+    model factories a shared frozen instance; dict factories stay factories.
+    """
+    specs = []
+    for f in fields(cls):
+        if f.default is not MISSING:
+            specs.append((f.name, f.type, field(default=f.default)))
+        elif f.default_factory is not MISSING:
+            default = f.default_factory()
+            if isinstance(default, list) or type(default) in _FIELD_NAMES:
+                specs.append((f.name, f.type, field(default=freeze(default))))
+            else:
+                specs.append((f.name, f.type, field(default_factory=f.default_factory)))
+        else:
+            specs.append((f.name, f.type))
+    methods = {
+        name: value for name, value in vars(cls).items()
+        if callable(value) and not name.startswith("__") and name != "to_dict"
+    }
+    frozen = make_dataclass(f"Frozen{cls.__name__}", specs, namespace=methods, frozen=True, slots=True)
+    frozen.__module__ = __name__
+    return frozen
+
+
+def frozen_variant(cls: type) -> Optional[type]:
+    """Return ``Frozen<cls>`` for a model class (built on first use), or None for other types.
+
+    Built lazily so importing the models does not pay for ``make_dataclass``.
+    """
+    frozen = _FROZEN.get(cls)
+    if frozen is None and _MODELS_BY_NAME.get(getattr(cls, "__name__", "")) is cls:
+        with _frozen_lock:
+            frozen = _FROZEN.get(cls)
+            if frozen is None:
+                frozen = _frozen_variant(cls)
+                _FIELD_NAMES[frozen] = _FIELD_NAMES[cls]
+                globals()[frozen.__name__] = frozen  # importable/picklable by name
+                _FROZEN[cls] = frozen
+    return frozen
+
+
+def __getattr__(name: str):
+    """Resolve ``Frozen<Model>`` names (imports, unpickling) and ``FROZEN_VARIANTS`` lazily."""
+    if name == "FROZEN_VARIANTS":
+        return {cls: frozen_variant(cls) for cls in MODEL_CLASSES}
+    if name.startswith("Frozen") and name[len("Frozen"):] in _MODELS_BY_NAME:
+        return frozen_variant(_MODELS_BY_NAME[name[len("Frozen"):]])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def register_serializable(cls: type, names: Iterable[str]) -> None:
+    """Let :func:`to_builtin` / :func:`iter_json` serialise ``cls`` by attribute names (e.g. views)."""
+    _FIELD_NAMES[cls] = tuple(names)
+
+
+def freeze(value):
+    """Return an immutable copy: models become ``Frozen*``, lists become tuples.
+
+    ``team_info`` and other dict values are copied but remain dicts.
+    """
+    cls = type(value)
+    frozen = frozen_variant(cls) if cls in _FIELD_NAMES else None
+    if frozen is not None:
+        return frozen(*(freeze(getattr(value, name)) for name in _FIELD_NAMES[cls]))
+    if cls is list or cls is tuple:
+        return tuple(freeze(item) for item in value)
+    if cls is dict:
+        return {key: freeze(item) for key, item in value.items()}
+    return value
+
+
+def to_builtin(value):
+    """Convert a model (mutable or frozen) to plain dicts/lists.
+
+    Equivalent to ``dataclasses.asdict`` for these models, but strings and
+    other scalars are shared instead of passed through ``copy.deepcopy``.
+    """
+    names = _FIELD_NAMES.get(type(value))
+    if names is not None:
+        return {name: to_builtin(getattr(value, name)) for name in names}
+    if isinstance(value, (list, tuple)):
+        return [to_builtin(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_builtin(item) for key, item in value.items()}
+    return value
+
+
+def iter_json(value) -> Iterator[str]:
+    """Yield JSON text for a model without building an intermediate dict tree.
+
+    Only models and sequences of models are walked; everything else (strings,
+    lists of strings, ``team_info`` dicts) is encoded by one ``json.dumps`` call.
+    """
+    names = _FIELD_NAMES.get(type(value))
+    if names is not None:
+        yield "{"
+        for index, name in enumerate(names):
+            yield f'{", " if index else ""}"{name}": '
+            yield from iter_json(getattr(value, name))
+        yield "}"
+    elif isinstance(value, (list, tuple)) and value and type(value[0]) in _FIELD_NAMES:
+        yield "["
+        for index, item in enumerate(value):
+            if index:
+                yield ", "
+            yield from iter_json(item)
+        yield "]"
+    else:
+        yield json.dumps(value, ensure_ascii=False, default=to_builtin)
+
+
+def write_json(value, stream: IO[str]) -> None:
+    """Stream a model as JSON to ``stream``."""
+    for chunk in iter_json(value):
+        stream.write(chunk)
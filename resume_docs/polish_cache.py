@@ -0,0 +1,135 @@
+"""Content-addressed on-disk cache for LLM-polished project text."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from . import constants
+
+logger = logging.getLogger(__name__)
+
+
+class PolishCache:
+    """Persistent cache of polished text keyed by prompt, model and temperature.
+
+    Each entry is a small JSON file named after the SHA-256 of its key, so an
+    unchanged project produces the same prompt and therefore the same file.
+    Reads bump the file mtime, which makes mtime order an LRU order; once the
+    cache grows past ``max_entries`` the least recently used files are removed.
+
+    The entry count is scanned once and then tracked per write, so the
+    directory is only listed again when the count goes over the cap. Other
+    processes sharing the directory are picked up at that rescan, so the
+    cache can briefly exceed ``max_entries`` when several write to it.
+    A failed write is logged and skipped: the cache is only an optimisation.
+    """
+
+    def __init__(self, cache_dir: Path | None = None, max_entries: int = constants.POLISH_CACHE_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries}")
+        self.cache_dir = Path(cache_dir or constants.POLISH_CACHE_DIR)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entry_count: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(prompt: str, model_name: str, temperature: Optional[float]) -> str:
+        """Return the content address for a prompt/model/temperature triple."""
+        digest = hashlib.sha256()
+        for part in (model_name or "", repr(temperature), prompt):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached text for ``key`` or None on a miss."""
+        path = self._entry_path(key)
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                text = json.load(handle)["text"]
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return text
+
+    def set(self, key: str, text: str, **metadata) -> None:
+        """Store ``text`` under ``key`` and evict old entries if over capacity."""
+        path = self._entry_path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            existed = path.exists()
+            with tmp_path.open("w", encoding="utf-8") as handle:
+                json.dump({"text": text, **metadata}, handle, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not write polish cache entry %s: %s", path, e)
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            if self._entry_count is None:
+                self._entry_count = len(self._entries())
+            elif not existed:
+                self._entry_count += 1
+            if self._entry_count > self.max_entries:
+                self._evict()
+
+    def clear(self) -> int:
+        """Remove every cache entry and return how many were deleted."""
+        removed = 0
+        with self._lock:
+            for path in self._entries():
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+            self._entry_count = None
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _entries(self) -> list[Path]:
+        if not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob("*.json"))
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries over the cap; call with ``_lock`` held."""
+        entries = self._entries()
+        overflow = len(entries) - self.max_entries
+        self._entry_count = len(entries)
+        if overflow <= 0:
+            return
+        entries.sort(key=_mtime)
+        for path in entries[:overflow]:
+            try:
+                path.unlink()
+                self._entry_count -= 1
+            except OSError:
+                pass
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return 0.0
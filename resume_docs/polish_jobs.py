@@ -0,0 +1,302 @@
+"""Offline polishing through batch job files (OpenAI batch JSONL format).
+
+Nightly regeneration does not need interactive latency, so polishing can be
+split from rendering:
+
+1. ``export``: write every pending (uncached) polish prompt across roles ×
+   locales as a JSONL job file. Each line is one ``/v1/chat/completions``
+   request whose ``custom_id`` is the polish cache key.
+2. Run the job file on a discounted batch endpoint (upload it as an OpenAI
+   batch with ``purpose=batch``), or locally with ``run``, which executes it
+   against any configured client and writes a results file in the same format.
+3. ``ingest``: store the results file in the polish cache.
+4. Render with ``python -m resume_docs.batch --model <model> --cache-only``;
+   no LLM is called and projects without a result keep their original text.
+
+Use the same ``--prompt-layout`` when exporting and rendering: the cache key
+covers the exact prompt.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from . import constants
+from .batch import BatchRunner, _validate
+from .role_config import ROLE_FILTERS
+
+JOB_URL = "/v1/chat/completions"
+
+
+@dataclass
+class JobReport:
+    """Counts for one export / run / ingest pass."""
+
+    requests: int = 0
+    ok: int = 0
+    skipped: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def job_line(custom_id: str, model: str, system: Optional[str], prompt: str, temperature: Optional[float]) -> Dict:
+    """One request in OpenAI batch input format."""
+    messages = [{"role": "user", "content": prompt}]
+    if system is not None:
+        messages.insert(0, {"role": "system", "content": system})
+    body: Dict = {"model": model, "messages": messages}
+    if temperature is not None:
+        body["temperature"] = temperature
+    return {"custom_id": custom_id, "method": "POST", "url": JOB_URL, "body": body}
+
+
+def export_jobs(runner: BatchRunner, roles: Sequence[str], locales: Sequence[str], path: Path) -> JobReport:
+    """Write every uncached polish request for ``roles`` × ``locales`` to ``path``.
+
+    Identical prompts (e.g. a project polished the same way for two roles)
+    are exported once.
+    """
+    from .llm_polisher import LLMPolisher
+
+    if not runner.model or runner.cache is None:
+        raise ValueError("Exporting polish jobs requires a model and the polish cache")
+    from .langchain_clients import get_client_registry
+
+    # Cache identity only: exporting needs no API key
+    client = get_client_registry().identity(runner.model)
+    model_name, temperature = client.model_name, client.temperature
+    polisher = LLMPolisher(cache=runner.cache, prompt_layout=runner.prompt_layout)
+    report = JobReport()
+    seen = set()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        for locale in locales:
+            for role in roles:
+                resume = runner.filtered_for(locale, role)
+                requests = polisher.pending_requests(
+                    resume.projects, client, locale, ROLE_FILTERS[role].get("persona"), role
+                )
+                report.skipped += sum(1 for project in resume.projects if project.project_overview) - len(requests)
+                for request in requests:
+                    if request.key in seen:
+                        continue
+                    seen.add(request.key)
+                    line = job_line(request.key, model_name, request.system, request.prompt, temperature)
+                    handle.write(json.dumps(line, ensure_ascii=False) + "\n")
+                    report.requests += 1
+    return report
+
+
+def _read_jsonl(path: Path) -> Iterator[Dict]:
+    with path.open("r", encoding="utf-8") as handle:
+        for number, line in enumerate(handle, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{number}: invalid JSON ({e})") from e
+
+
+def _split_messages(messages: List[Dict]) -> Tuple[Optional[str], str]:
+    """(system, prompt) of a chat request: system messages joined, user messages joined."""
+    system = "\n\n".join(m["content"] for m in messages if m.get("role") == "system") or None
+    prompt = "\n\n".join(m["content"] for m in messages if m.get("role") == "user")
+    return system, prompt
+
+
+def run_jobs(
+    jobs_path: Path,
+    results_path: Path,
+    client_for: Callable[[str], object],
+    workers: int = 4,
+    scheduler=None,
+) -> JobReport:
+    """Execute a job file locally; writes results in OpenAI batch output format.
+
+    ``client_for(model)`` returns the client for a request's model. Lines are
+    written as requests finish, so the output order may differ from the input.
+    """
+    from .langchain_clients import LangChainLLMClient, Usage
+    from .llm_scheduler import estimate_tokens
+
+    jobs = list(_read_jsonl(jobs_path))
+    report = JobReport(requests=len(jobs))
+    lock = threading.Lock()
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def execute(item: Tuple[int, Dict]) -> Dict:
+        number, job = item
+        body = job["body"]
+        system, prompt = _split_messages(body["messages"])
+        client = client_for(body["model"])
+
+        def call() -> Tuple[str, Usage]:
+            if isinstance(client, LangChainLLMClient):
+                return client.invoke_with_usage(prompt, system=system)
+            return client.invoke(prompt if system is None else f"{system}\n\n{prompt}"), Usage()
+
+        provider = getattr(client, "provider", "") or type(client).__name__
+        text, usage = (
+            scheduler.run(provider, call, estimate_tokens(f"{system or ''}{prompt}")) if scheduler else call()
+        )
+        return {
+            "id": f"batch_req_{number}",
+            "custom_id": job["custom_id"],
+            "response": {
+                "status_code": 200,
+                "request_id": f"local-{number}",
+                "body": {
+                    "object": "chat.completion",
+                    "model": getattr(client, "model_name", "") or body["model"],
+                    "choices": [
+                        {"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}
+                    ],
+                    "usage": {
+                        "prompt_tokens": usage.prompt_tokens,
+                        "completion_tokens": usage.completion_tokens,
+                        "total_tokens": usage.prompt_tokens + usage.completion_tokens,
+                    },
+                },
+            },
+            "error": None,
+        }
+
+    with results_path.open("w", encoding="utf-8") as handle:
+
+        def process(item: Tuple[int, Dict]) -> None:
+            number, job = item
+            try:
+                result = execute(item)
+            except Exception as e:  # one failed request must not stop the job
+                result = {
+                    "id": f"batch_req_{number}",
+                    "custom_id": job.get("custom_id"),
+                    "response": None,
+                    "error": {"code": "local_error", "message": str(e)[:500]},
+                }
+            with lock:
+                handle.write(json.dumps(result, ensure_ascii=False) + "\n")
+                handle.flush()
+                if result["error"] is None:
+                    report.ok += 1
+                else:
+                    report.errors.append(f"{result['custom_id']}: {result['error']['message']}")
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            list(executor.map(process, enumerate(jobs, 1)))
+    return report
+
+
+def ingest_results(results_path: Path, cache) -> JobReport:
+    """Store successful results (OpenAI batch output or error file) in the polish cache."""
+    from .langchain_clients import ThinkTagFilter
+
+    report = JobReport()
+    for result in _read_jsonl(results_path):
+        report.requests += 1
+        custom_id = result.get("custom_id")
+        response = result.get("response") or {}
+        error = result.get("error")
+        try:
+            if error or response.get("status_code") != 200:
+                raise ValueError((error or {}).get("message") or f"status {response.get('status_code')}")
+            content = response["body"]["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            report.errors.append(f"{custom_id}: {e}")
+            continue
+        # Same cleanup the interactive clients apply to reasoning models' output
+        think_filter = ThinkTagFilter()
+        text = (think_filter.feed(content or "") + think_filter.flush()).strip()
+        if not custom_id or not text:
+            report.errors.append(f"{custom_id}: empty result")
+            continue
+        cache.set(custom_id, text, source="batch", batch_request=result.get("id"))
+        report.ok += 1
+    return report
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Polish offline through OpenAI-format batch job files.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Write pending polish prompts as a JSONL job file")
+    export.add_argument("--model", required=True, help="Model the results are cached for (e.g. gpt-4o)")
+    export.add_argument("--roles", nargs="+", default=list(ROLE_FILTERS), help="Target roles (default: all)")
+    export.add_argument(
+        "--locales", nargs="+", default=list(constants.SUPPORTED_LOCALES), help="Locales (default: all supported)"
+    )
+    export.add_argument(
+        "--prompt-layout",
+        choices=["inline", "prefix"],
+        default="inline",
+        help="Must match the layout used when rendering from the cache",
+    )
+    export.add_argument("--output", required=True, help="Job file to write (.jsonl)")
+
+    run = commands.add_parser("run", help="Execute a job file locally against a configured client")
+    run.add_argument("jobs", help="Job file written by export")
+    run.add_argument("--output", required=True, help="Results file to write (.jsonl)")
+    run.add_argument("--model", help="Run every request on this model instead of the one in the job file")
+    run.add_argument("--workers", type=int, default=4, help="Concurrent requests")
+
+    ingest = commands.add_parser("ingest", help="Store a results file in the polish cache")
+    ingest.add_argument("results", help="Batch output (or error) file")
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    from .polish_cache import PolishCache
+    from .runtime_config import load_runtime_config
+
+    runtime_cfg = load_runtime_config()
+    if args.command == "export":
+        try:
+            _validate(args.roles, args.locales, [])
+            runner = BatchRunner(model=args.model, cache=PolishCache(), prompt_layout=args.prompt_layout)
+            report = export_jobs(runner, args.roles, args.locales, Path(args.output))
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+        print(f"Exported {report.requests} request(s) to {args.output} ({report.skipped} already cached)")
+        return 0
+
+    if args.command == "run":
+        from .llm_scheduler import LLMScheduler
+
+        runner = BatchRunner()
+        try:
+            report = run_jobs(
+                Path(args.jobs),
+                Path(args.output),
+                lambda model: runner.client_for(args.model or model),
+                workers=args.workers,
+                scheduler=LLMScheduler.from_config(runtime_cfg),
+            )
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            return 1
+        for error in report.errors:
+            print(f"  error: {error}")
+        print(f"Ran {report.ok}/{report.requests} request(s); results in {args.output}")
+        return 0 if not report.errors else 1
+
+    try:
+        report = ingest_results(Path(args.results), PolishCache())
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    for error in report.errors:
+        print(f"  error: {error}")
+    print(f"Cached {report.ok}/{report.requests} result(s)")
+    return 0 if not report.errors else 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,199 @@
+"""Stage-level profiling for the generation pipeline.
+
+:class:`StageProfiler` wraps pipeline stages (load, filter, polish, render,
+save) in timing spans. Every span records wall time and CPU time; a large gap
+between them means the stage was waiting, e.g. on the network. Optional extras:
+
+- ``cprofile``: one ``cProfile`` run across all stages, dumped to ``cpu.prof``
+  (open with snakeviz, or convert with flameprof/gprof2dot); it only sees
+  the calling thread, so use ``sample`` when polishing with several workers
+- ``sample``: a built-in sampling profiler that writes ``stacks.folded``
+  (``stage;thread;frame;...  count``), loadable in speedscope or flamegraph.pl
+- ``memory``: tracemalloc peak per stage (slows the run down)
+
+Spans are always written as ``trace.json`` in Chrome trace-event format
+(chrome://tracing, Perfetto, speedscope).
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+PROFILE_MODES = ("cprofile", "sample")
+SAMPLE_INTERVAL = 0.005
+
+
+@dataclass
+class StageSpan:
+    name: str
+    start: float
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_bytes: Optional[int] = None
+
+    @property
+    def wait_seconds(self) -> float:
+        """Wall time not spent on this process's CPU (I/O, network, sleeps)."""
+        return max(0.0, self.wall_seconds - self.cpu_seconds)
+
+
+class StageProfiler:
+    """Collect stage spans and optional CPU / memory profiles for one run."""
+
+    def __init__(
+        self,
+        output_dir: Path,
+        mode: Optional[str] = None,
+        memory: bool = False,
+        sample_interval: float = SAMPLE_INTERVAL,
+    ):
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}'. Options: {', '.join(PROFILE_MODES)}")
+        self.output_dir = Path(output_dir)
+        self.mode = mode
+        self.memory = memory
+        self.spans: List[StageSpan] = []
+        self._origin = time.perf_counter()
+        self._profile = None
+        self._sampler: Optional[_Sampler] = None
+        self._current: Optional[str] = None
+        if mode == "cprofile":
+            import cProfile
+
+            self._profile = cProfile.Profile()
+        elif mode == "sample":
+            self._sampler = _Sampler(lambda: self._current, sample_interval)
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageSpan]:
+        """Time the enclosed block as stage ``name``."""
+        span = StageSpan(name, time.perf_counter() - self._origin)
+        self._current = name
+        if self.memory:
+            tracemalloc.reset_peak()
+        if self._profile is not None:
+            self._profile.enable()
+        cpu_started = time.process_time()
+        wall_started = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.wall_seconds = time.perf_counter() - wall_started
+            span.cpu_seconds = time.process_time() - cpu_started
+            if self._profile is not None:
+                self._profile.disable()
+            if self.memory:
+                span.peak_bytes = tracemalloc.get_traced_memory()[1]
+            self._current = None
+            self.spans.append(span)
+
+    def finish(self) -> Dict[str, Path]:
+        """Stop profilers and write the artefacts; returns {kind: path}."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        written = {"trace": self._write_trace(self.output_dir / "trace.json")}
+        if self._profile is not None:
+            path = self.output_dir / "cpu.prof"
+            self._profile.dump_stats(str(path))
+            written["cprofile"] = path
+        if self._sampler is not None:
+            self._sampler.stop()
+            path = self.output_dir / "stacks.folded"
+            self._sampler.write_folded(path)
+            written["sample"] = path
+        if self.memory:
+            tracemalloc.stop()
+        summary = self.output_dir / "stages.json"
+        summary.write_text(
+            json.dumps([{**asdict(span), "wait_seconds": span.wait_seconds} for span in self.spans], indent=2),
+            encoding="utf-8",
+        )
+        written["stages"] = summary
+        return written
+
+    def _write_trace(self, path: Path) -> Path:
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "resume_docs"}}]
+        for span in self.spans:
+            args = {"cpu_ms": round(span.cpu_seconds * 1000, 3), "wait_ms": round(span.wait_seconds * 1000, 3)}
+            if span.peak_bytes is not None:
+                args["peak_mib"] = round(span.peak_bytes / 1024 / 1024, 3)
+            events.append({
+                "name": span.name,
+                "cat": "stage",
+                "ph": "X",
+                "ts": round(span.start * 1_000_000),
+                "dur": round(span.wall_seconds * 1_000_000),
+                "pid": pid,
+                "tid": 0,
+                "args": args,
+            })
+        path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8")
+        return path
+
+    def report(self, written: Dict[str, Path]) -> None:
+        print("Profile (wall / cpu / wait):")
+        for span in self.spans:
+            peak = f"  peak {span.peak_bytes / 1024 / 1024:7.2f} MiB" if span.peak_bytes is not None else ""
+            print(
+                f"  {span.name:<8} {span.wall_seconds:8.3f}s {span.cpu_seconds:8.3f}s "
+                f"{span.wait_seconds:8.3f}s{peak}"
+            )
+        for kind, path in written.items():
+            print(f"  {kind}: {path}")
+
+
+class _Sampler:
+    """Samples every thread's Python stack on a background thread."""
+
+    def __init__(self, current_stage, interval: float):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._labels: Dict[object, str] = {}
+        self._current_stage = current_stage
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            stage = self._current_stage()
+            if stage is None:
+                continue
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                frames = []
+                while frame is not None:
+                    frames.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                frames.reverse()
+                self.stacks[";".join([stage, names.get(ident, str(ident)), *frames])] += 1
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+        return label
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write_folded(self, path: Path) -> Path:
+        with path.open("w", encoding="utf-8") as handle:
+            for stack, count in sorted(self.stacks.items()):
+                handle.write(f"{stack} {count}\n")
+        return path
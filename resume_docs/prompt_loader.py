@@ -1,26 +1,142 @@
 """加载和构建角色感知的 LLM Prompt"""
 
-import yaml
+import os
+import re
+import threading
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, NamedTuple, Optional, Sequence, Tuple
+
+import yaml
+
+DEFAULT_CONFIG_PATH = Path(__file__).parent.parent / "latest_resumes" / "prompt_config.yaml"
+
+# 编译模板时占位的哨兵，渲染时替换为项目原文与 persona 提示行
+_TEXT_SLOT = "\x00TEXT\x00"
+_PERSONA_SLOT = "\x00PERSONA\x00"
+
+# 批量润色：每个项目的原文与改写结果都包在编号标记之间
+_BATCH_OPEN = "<<<PROJECT {number}>>>"
+_BATCH_CLOSE = "<<<END {number}>>>"
+_BATCH_ITEM = re.compile(r"<<<PROJECT (\d+)>>>\s*(.*?)\s*(?:<<<END \1>>>|(?=<<<PROJECT \d+>>>)|\Z)", re.S)
+_BATCH_INSTRUCTIONS = {
+    "Chinese": (
+        "批量模式：下面给出多个项目，每个项目位于 <<<PROJECT n>>> 与 <<<END n>>> 之间。"
+        "请对每个项目分别、独立地按以上要求改写，不要混用不同项目的信息。"
+        "输出时每个项目以单独一行的 <<<PROJECT n>>> 开头、以单独一行的 <<<END n>>> 结尾（n 与输入编号一致），"
+        "标记之外不要输出任何内容。"
+    ),
+    "English": (
+        "Batch mode: several projects follow, each between <<<PROJECT n>>> and <<<END n>>>. "
+        "Rewrite each project separately and independently according to the requirements above; "
+        "never mix details across projects. In your output, start each project with <<<PROJECT n>>> "
+        "on its own line and end it with <<<END n>>> on its own line (n matches the input number). "
+        "Output nothing outside these markers."
+    ),
+}
+
+
+class CompiledPrompt(NamedTuple):
+    """预编译的角色 × 语言模板：只剩 persona 与项目原文两个插槽
+
+    ``render`` 返回原有的单段 prompt；``split`` 返回前缀稳定布局：
+    ``prefix``（全部静态指令，同一角色 × 语言逐字节相同，可作 system 消息）
+    与只含 persona 提示和项目原文的 user 部分，便于 provider 前缀缓存与
+    Ollama 复用已计算的上下文。
+    """
+
+    head: str
+    middle: str
+    tail: str
+    language: str
+    prefix: str
+
+    @classmethod
+    def from_template(cls, rendered: str, language: str) -> "CompiledPrompt":
+        """从以哨兵占位的完整模板编译"""
+        head, rest = rendered.split(_PERSONA_SLOT)
+        middle, tail = rest.split(_TEXT_SLOT)
+        return cls(head, middle, tail, language, f"{head.rstrip()}\n\n{tail.strip()}")
+
+    def render(self, text: str, persona_hint: Optional[str] = None) -> str:
+        return "".join((self.head, _persona_line(self.language, persona_hint), self.middle, text, self.tail))
+
+    def split(self, text: str, persona_hint: Optional[str] = None) -> Tuple[str, str]:
+        """返回 (静态前缀, 可变部分)"""
+        persona = _persona_line(self.language, persona_hint).strip()
+        variable = f"{self.middle.strip()}\n{text}"
+        return self.prefix, f"{persona}\n\n{variable}" if persona else variable
+
+    def split_batch(self, texts: Sequence[str], persona_hint: Optional[str] = None) -> Tuple[str, str]:
+        """批量布局：返回 (静态前缀 + 批量说明, persona 提示 + 按 1..n 编号包裹的多个项目原文)
+
+        结果用 ``parse_batch_output`` 按编号拆回。
+        """
+        instructions = _BATCH_INSTRUCTIONS.get(self.language, _BATCH_INSTRUCTIONS["English"])
+        persona = _persona_line(self.language, persona_hint).strip()
+        label = self.middle.strip()
+        items = [
+            f"{_BATCH_OPEN.format(number=number)}\n{label}\n{text}\n{_BATCH_CLOSE.format(number=number)}"
+            for number, text in enumerate(texts, 1)
+        ]
+        return f"{self.prefix}\n\n{instructions}", "\n\n".join([persona, *items] if persona else items)
+
+
+class _PromptState(NamedTuple):
+    """一次加载的配置快照；重新加载时整体替换，读者不会看到半更新状态"""
+
+    mtime_ns: int
+    size: int
+    config: Dict
+    compiled: Dict[Tuple[str, str], CompiledPrompt]
 
 
 class PromptLoader:
-    """加载 YAML 配置并构建角色感知的 prompt"""
+    """加载 YAML 配置并构建角色感知的 prompt
+
+    配置只解析一次，每个角色 × 语言模板在首次使用时编译并缓存；
+    文件 mtime 或大小变化时自动重新加载，长驻进程无需重启即可使用新 prompt。
+    """
 
     def __init__(self, config_path: Optional[Path] = None):
         if config_path is None:
-            config_path = Path(__file__).parent.parent / "latest_resumes" / "prompt_config.yaml"
+            config_path = DEFAULT_CONFIG_PATH
         self.config_path = config_path
-        self._config = None
+        self._state: Optional[_PromptState] = None
+        self._lock = threading.Lock()
 
     @property
     def config(self) -> Dict:
-        """延迟加载配置"""
-        if self._config is None:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                self._config = yaml.safe_load(f)
-        return self._config
+        """当前配置（必要时重新加载）"""
+        return self._current_state().config
+
+    def _current_state(self) -> _PromptState:
+        stat = os.stat(self.config_path)
+        state = self._state
+        if state is not None and (state.mtime_ns, state.size) == (stat.st_mtime_ns, stat.st_size):
+            return state
+        with self._lock:
+            state = self._state
+            if state is None or (state.mtime_ns, state.size) != (stat.st_mtime_ns, stat.st_size):
+                with open(self.config_path, "r", encoding="utf-8") as f:
+                    config = yaml.safe_load(f)
+                state = _PromptState(stat.st_mtime_ns, stat.st_size, config, {})
+                self._state = state
+            return state
+
+    def reload(self) -> None:
+        """强制在下次访问时重新读取配置"""
+        with self._lock:
+            self._state = None
+
+    def compile(self, language: str, role: str) -> CompiledPrompt:
+        """返回（并缓存）角色 × 语言的预编译模板"""
+        state = self._current_state()
+        key = (language, role)
+        compiled = state.compiled.get(key)
+        if compiled is None:
+            rendered = self._render_template(state.config, _TEXT_SLOT, language, role, _PERSONA_SLOT)
+            compiled = state.compiled[key] = CompiledPrompt.from_template(rendered, language)
+        return compiled
 
     def build_role_aware_prompt(
         self, text: str, language: str, role: str, persona_hint: Optional[str] = None
@@ -36,9 +152,14 @@ class PromptLoader:
         Returns:
             完整的 LLM prompt
         """
+        return self.compile(language, role).render(text, persona_hint)
+
+    @staticmethod
+    def _render_template(config: Dict, text: str, language: str, role: str, persona_line: str) -> str:
+        """按配置拼接完整 prompt；编译时以哨兵代替 text 与 persona_line"""
         lang_key = "zh" if language == "Chinese" else "en"
-        base = self.config["base_templates"][lang_key]
-        role_config = self.config["roles"].get(role, {})
+        base = config["base_templates"][lang_key]
+        role_config = config["roles"].get(role, {})
 
         # 获取角色特定的输出结构
         output_structure = role_config.get("output_structure", {}).get(lang_key, [])
@@ -59,14 +180,6 @@ class PromptLoader:
             part for part in (base_guard, role_guard) if part
         )
 
-        # 构建 persona 提示行
-        persona_line = ""
-        if persona_hint:
-            if language == "Chinese":
-                persona_line = f"\n角色视角提示（必须体现在措辞、指标与优先级中）：{persona_hint}\n"
-            else:
-                persona_line = f"\nPerspective cue (must shape tone, metrics, and emphasis): {persona_hint}\n"
-
         if language == "Chinese":
             return f"""你是一名{base['system_role']}，需要用自然、流畅、听起来像真实候选人表述但仍然专业的中文，把候选人提供的项目内容改写成结构清晰、量化明确、对招聘方友好的项目经验。
 
@@ -137,3 +250,44 @@ Original project content:
 {text}
 
 Please return only the structured project experience content without any prefix or explanation."""
+
+
+def compile_prompt(template: Callable[[str, str], str], language: str) -> CompiledPrompt:
+    """把 ``template(persona_line, text)`` 编译为 CompiledPrompt（用于代码内置的兜底 prompt）"""
+    return CompiledPrompt.from_template(template(_PERSONA_SLOT, _TEXT_SLOT), language)
+
+
+def parse_batch_output(text: str) -> Dict[int, str]:
+    """把批量润色的输出按编号拆成 {编号: 改写内容}；缺失或为空的编号不出现在结果中
+
+    缺少结束标记时，内容截止到下一个开始标记或文本末尾。
+    """
+    items: Dict[int, str] = {}
+    for match in _BATCH_ITEM.finditer(text):
+        number, body = int(match.group(1)), match.group(2).strip()
+        if body and number not in items:
+            items[number] = body
+    return items
+
+
+def _persona_line(language: str, persona_hint: Optional[str]) -> str:
+    """构建 persona 提示行"""
+    if not persona_hint:
+        return ""
+    if language == "Chinese":
+        return f"\n角色视角提示（必须体现在措辞、指标与优先级中）：{persona_hint}\n"
+    return f"\nPerspective cue (must shape tone, metrics, and emphasis): {persona_hint}\n"
+
+
+_shared_loaders: Dict[Path, PromptLoader] = {}
+_shared_lock = threading.Lock()
+
+
+def get_prompt_loader(config_path: Optional[Path] = None) -> PromptLoader:
+    """返回进程内共享的 PromptLoader（按配置路径区分）"""
+    path = Path(config_path or DEFAULT_CONFIG_PATH).resolve()
+    with _shared_lock:
+        loader = _shared_loaders.get(path)
+        if loader is None:
+            loader = _shared_loaders[path] = PromptLoader(path)
+        return loader
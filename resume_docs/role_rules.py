@@ -0,0 +1,180 @@
+"""职位规则编译 - 将 ROLE_FILTERS 中的 include/exclude 规则编译为谓词，一次遍历为所有职位打分"""
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from resume_docs.models import Project
+
+
+class Predicate:
+    """单个字段谓词；``__call__`` 接收字段值而不是项目，便于同一字段只取值一次"""
+
+    __slots__ = ("field",)
+    kind = "never"
+
+    def __init__(self, field: Optional[str]):
+        self.field = field
+
+    @property
+    def key(self) -> Hashable:
+        """去重键：字段、类型与参数都相同的规则只编译/求值一次"""
+        return (self.kind, self.field)
+
+    def __call__(self, value) -> bool:
+        return False
+
+
+class PatternPredicate(Predicate):
+    """``pattern``：预编译正则，``search`` 语义与 ``re.search`` 一致，仅匹配字符串"""
+
+    __slots__ = ("regex",)
+    kind = "pattern"
+
+    def __init__(self, field: Optional[str], pattern: str):
+        super().__init__(field)
+        self.regex = re.compile(pattern)
+
+    @property
+    def key(self) -> Hashable:
+        return (self.kind, self.field, self.regex.pattern)
+
+    def __call__(self, value) -> bool:
+        return isinstance(value, str) and self.regex.search(value) is not None
+
+
+class ContainsPredicate(Predicate):
+    """``contains``：列表/元组字段（含 Frozen 变体）与候选集合有交集即匹配"""
+
+    __slots__ = ("items",)
+    kind = "contains"
+
+    def __init__(self, field: Optional[str], items: Iterable):
+        super().__init__(field)
+        self.items = frozenset(items)
+
+    @property
+    def key(self) -> Hashable:
+        return (self.kind, self.field, self.items)
+
+    def __call__(self, value) -> bool:
+        if not isinstance(value, (list, tuple)):
+            return False
+        try:
+            return not self.items.isdisjoint(value)
+        except TypeError:  # 列表中含不可哈希元素时退回逐项比较
+            return any(item in value for item in self.items)
+
+
+class EqualsPredicate(Predicate):
+    """``exact`` / ``value``：相等比较"""
+
+    __slots__ = ("expected",)
+    kind = "equals"
+
+    def __init__(self, field: Optional[str], expected):
+        super().__init__(field)
+        self.expected = expected
+
+    @property
+    def key(self) -> Hashable:
+        try:
+            hash(self.expected)
+        except TypeError:
+            return (self.kind, self.field, id(self.expected))
+        return (self.kind, self.field, type(self.expected).__name__, self.expected)
+
+    def __call__(self, value) -> bool:
+        return value == self.expected
+
+
+def compile_rule(rule: dict) -> Predicate:
+    """将单条规则字典编译为谓词；优先级与旧实现一致：pattern > contains > exact > value"""
+    field = rule.get("field")
+    if "pattern" in rule:
+        return PatternPredicate(field, rule["pattern"])
+    if "contains" in rule:
+        return ContainsPredicate(field, rule["contains"])
+    if "exact" in rule:
+        return EqualsPredicate(field, rule["exact"])
+    if "value" in rule:
+        return EqualsPredicate(field, rule["value"])
+    return Predicate(field)
+
+
+class CompiledRoleRules:
+    """所有职位规则的编译结果
+
+    所有职位的规则去重后每条占一个比特位；每个项目只对每个唯一谓词求值一次，
+    得到匹配位图。排除判断为 ``bits & exclude_mask``，相关性分数为
+    ``(bits & include_mask).bit_count()``。与旧实现一致，同一职位内重复的
+    include 规则每条各计一分：重复部分记在 ``include_extra`` 中另行累加。
+    """
+
+    def __init__(self, role_config: Dict[str, dict]):
+        self.roles: Tuple[str, ...] = tuple(role_config)
+        self.predicates: List[Predicate] = []
+        bit_of: Dict[Hashable, int] = {}
+        self.include_masks: Dict[str, int] = {}
+        self.exclude_masks: Dict[str, int] = {}
+        # {role: ((flag, 额外次数), ...)}，仅含同一职位内重复出现的 include 谓词
+        self.include_extra: Dict[str, Tuple[Tuple[int, int], ...]] = {}
+
+        def flags_for(rules: Sequence[dict]) -> Counter:
+            flags: Counter = Counter()
+            for rule in rules:
+                predicate = compile_rule(rule)
+                bit = bit_of.get(predicate.key)
+                if bit is None:
+                    bit = bit_of[predicate.key] = len(self.predicates)
+                    self.predicates.append(predicate)
+                flags[1 << bit] += 1
+            return flags
+
+        for role, config in role_config.items():
+            include = flags_for(config.get("include_projects", []))
+            self.include_masks[role] = sum(include)
+            self.include_extra[role] = tuple((flag, count - 1) for flag, count in include.items() if count > 1)
+            self.exclude_masks[role] = sum(flags_for(config.get("exclude_projects", [])))
+
+        # 按字段分组，每个项目每个字段只 getattr 一次
+        grouped: Dict[Optional[str], List[Tuple[int, Predicate]]] = {}
+        for bit, predicate in enumerate(self.predicates):
+            grouped.setdefault(predicate.field, []).append((1 << bit, predicate))
+        self._by_field = [(field, tuple(items)) for field, items in grouped.items()]
+
+    def match_bits(self, project: Project) -> int:
+        """返回项目命中的谓词位图"""
+        bits = 0
+        for field, predicates in self._by_field:
+            value = getattr(project, field, None) if field else None
+            for flag, predicate in predicates:
+                if predicate(value):
+                    bits |= flag
+        return bits
+
+    def sweep(
+        self, projects: Sequence[Project], roles: Optional[Sequence[str]] = None
+    ) -> Dict[str, List[Tuple[Project, int]]]:
+        """一次遍历为多个职位过滤并打分
+
+        Returns:
+            {role: [(project, relevance_score), ...]}，保持输入顺序，已去除被排除的项目
+        """
+        roles = tuple(roles) if roles is not None else self.roles
+        masks = [
+            (role, self.include_masks[role], self.exclude_masks[role], self.include_extra[role]) for role in roles
+        ]
+        results: Dict[str, List[Tuple[Project, int]]] = {role: [] for role in roles}
+        for project in projects:
+            bits = self.match_bits(project)
+            for role, include_mask, exclude_mask, extra in masks:
+                if bits & exclude_mask:
+                    continue
+                score = (bits & include_mask).bit_count()
+                for flag, count in extra:
+                    if bits & flag:
+                        score += count
+                results[role].append((project, score))
+        return results
@@ -32,6 +32,14 @@ def apply_env(config: Dict[str, Any]) -> None:
     _set_env_var("OLLAMA_HOST", ollama_cfg.get("host"))
     _set_env_var("OLLAMA_BASE_URL", ollama_cfg.get("host"))
     _set_env_var("OLLAMA_MODEL", ollama_cfg.get("model"))
+    # Keep the model (and its evaluated prompt prefix) loaded; fixed context size
+    _set_env_var("OLLAMA_KEEP_ALIVE", ollama_cfg.get("keep_alive"))
+    _set_env_var("OLLAMA_NUM_CTX", ollama_cfg.get("num_ctx"))
+
+    # HTTP transport settings used by resume_docs.model_clients
+    for prefix, provider_cfg in (("OPENAI", openai_cfg), ("ZHIPU", zhipu_cfg), ("OLLAMA", ollama_cfg)):
+        _set_env_var(f"{prefix}_TIMEOUT", provider_cfg.get("timeout"))
+        _set_env_var(f"{prefix}_MAX_CONCURRENCY", provider_cfg.get("max_concurrency"))
 
     extra_env = config.get("env", {})
     for key, value in extra_env.items():
@@ -49,4 +57,7 @@ def load_runtime_config(path: Path | str | None = None, apply: bool = True) -> D
 
     if apply:
         apply_env(config)
+        from .langchain_clients import get_client_registry
+
+        get_client_registry().configure(config)
     return config
@@ -0,0 +1,447 @@
+"""Local HTTP service that generates resumes from a warm, shared pipeline.
+
+One process keeps the parsed YAML, filtered views, compiled prompts, LLM
+clients and the polish cache in memory, so a request only pays for the work
+that actually changed. Endpoints:
+
+    GET  /health    liveness plus what is loaded
+    GET  /stats     request counts and latency percentiles per stage
+    POST /generate  {"role", "locale", "template", "model", "skip_polish",
+                     "include_contact", "response": "docx" | "path"}
+
+Bound to 127.0.0.1 by default: responses contain personal data.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+from . import constants
+from .batch import BatchRunner, PolishResult, _validate
+from .langchain_clients import get_client_registry
+from .loader import locale_files
+from .prompt_loader import DEFAULT_CONFIG_PATH, get_prompt_loader
+from .role_config import ROLE_FILTERS
+from .telemetry import percentile
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 64 * 1024
+STATS_WINDOW = 1000
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+# Expected JSON type of each optional /generate field
+REQUEST_FIELDS = {
+    "role": str,
+    "locale": str,
+    "template": str,
+    "model": str,
+    "response": str,
+    "skip_polish": bool,
+    "include_contact": bool,
+}
+
+
+class UpstreamError(RuntimeError):
+    """The LLM provider could not polish a request that was itself valid (HTTP 502)."""
+
+
+class LatencyStats:
+    """Rolling latency window (most recent ``STATS_WINDOW`` samples) per name."""
+
+    def __init__(self, window: int = STATS_WINDOW):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(name, deque(maxlen=self.window)).append(seconds)
+            self._counts[name] = self._counts.get(name, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+            counts = dict(self._counts)
+        return {
+            name: {
+                "count": counts[name],
+                "mean_ms": round(sum(values) / len(values) * 1000, 2),
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2),
+            }
+            for name, values in samples.items()
+        }
+
+
+class GenerationService:
+    """Request handling on top of a shared ``BatchRunner``.
+
+    Input files are re-checked (by mtime) on every request, so edits to
+    ``latest_resumes/`` are picked up without a restart; the prompt loader
+    reloads itself the same way. Concurrent requests for the same
+    role × locale × model share one polish pass.
+    """
+
+    def __init__(self, runner: BatchRunner, max_concurrent: int = 4):
+        if max_concurrent < 1:
+            raise ValueError(f"max_concurrent must be >= 1, got {max_concurrent}")
+        self.runner = runner
+        self.stats = LatencyStats()
+        self.started = time.time()
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._mtimes: Dict[str, Tuple[Optional[int], ...]] = {}
+        self._inflight: Dict[tuple, Future] = {}
+        self._polished: Dict[tuple, PolishResult] = {}
+        self.active = 0
+        self.errors = 0
+
+    def warm_up(self, locales=constants.SUPPORTED_LOCALES, check_model: bool = False) -> None:
+        """Parse and filter every locale, compile prompts and create the default client.
+
+        ``check_model`` also checks the default model's backend and loads it (Ollama).
+        """
+        for locale in locales:
+            self._refresh(locale)
+            self.runner.filtered_for(locale, next(iter(ROLE_FILTERS)))  # filters every role
+        get_prompt_loader().config  # parse prompt_config.yaml once
+        if self.runner.model:
+            self.runner.client_for(self.runner.model)
+            if check_model:
+                hedge = self.runner.hedge
+                for model in [self.runner.model] + ([hedge.backup] if hedge is not None else []):
+                    warm = self.runner.warm_up(model)
+                    print(f"Warm-up: {warm.spec}: {warm.detail} in {warm.seconds:.2f}s")
+
+    def health(self) -> Dict[str, object]:
+        return {
+            "status": "ok",
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "loaded_locales": sorted(self._mtimes),
+            "default_model": self.runner.model,
+            "active_requests": self.active,
+        }
+
+    def stats_payload(self) -> Dict[str, object]:
+        cache = self.runner.cache
+        return {
+            "latency": self.stats.snapshot(),
+            "errors": self.errors,
+            "polish_cache": None if cache is None else {"hits": cache.hits, "misses": cache.misses},
+            "llm": None if self.runner.telemetry is None else self.runner.telemetry.summary(),
+        }
+
+    def handle(self, request: object) -> Tuple[int, Dict[str, object], Optional[bytes]]:
+        """Run :meth:`generate` and map errors to HTTP status codes, recording stats."""
+        started = time.perf_counter()
+        with self._lock:
+            self.active += 1
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("Request body must be a JSON object")
+            metadata, payload = self.generate(request)
+            status = 200
+        except ValueError as e:  # bad field, unknown role/locale/template/model, invalid YAML
+            status, metadata, payload = 400, {"error": str(e)}, None
+        except UpstreamError as e:
+            status, metadata, payload = 502, {"error": str(e)}, None
+        except Exception as e:  # keep serving other requests
+            status, metadata, payload = 500, {"error": f"{type(e).__name__}: {e}"}, None
+        finally:
+            with self._lock:
+                self.active -= 1
+        self.stats.record("generate", time.perf_counter() - started)
+        if status != 200:
+            with self._lock:
+                self.errors += 1
+        return status, metadata, payload
+
+    def generate(self, request: Dict[str, object]) -> Tuple[Dict[str, object], Optional[bytes]]:
+        """Generate one resume; returns (metadata, DOCX bytes or None when written to disk).
+
+        Raises:
+            ValueError: If the request is invalid (HTTP 400)
+            UpstreamError: If the polish pass failed as a whole (HTTP 502);
+                per-project failures are reported in ``polish_failures`` instead
+        """
+        from . import docx_renderer
+
+        for name, expected in REQUEST_FIELDS.items():
+            value = request.get(name)
+            if value is not None and not isinstance(value, expected):
+                raise ValueError(f"'{name}' must be a {'boolean' if expected is bool else 'string'}")
+        role = request.get("role")
+        locale = request.get("locale") or constants.DEFAULT_LOCALE
+        template = request.get("template") or constants.DEFAULT_THEME
+        response = request.get("response") or "docx"
+        if not isinstance(role, str):
+            raise ValueError("'role' is required")
+        _validate([role], [locale], [template])
+        if response not in ("docx", "path"):
+            raise ValueError(f"Unknown response '{response}'. Options: docx, path")
+        model = None if request.get("skip_polish") else (request.get("model") or self.runner.model)
+        if model:
+            get_client_registry().resolve(model)  # unknown model or alias -> 400
+        include_contact = bool(request.get("include_contact", self.runner.include_contact))
+
+        with self._slots:
+            self._refresh(locale)
+            started = time.perf_counter()
+            result = self._polish(role, locale, model)
+            if result.error is not None:
+                raise UpstreamError(result.error)
+            self.stats.record("polish", time.perf_counter() - started)
+
+            started = time.perf_counter()
+            if response == "docx":
+                payload = docx_renderer.render_docx_bytes(result.resume, template, locale, include_contact)
+                path = None
+            else:
+                timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+                path = self.runner.output_path(role, locale, template, timestamp)
+                docx_renderer.render_docx(result.resume, path, template, locale, include_contact)
+                payload = None
+            self.stats.record("render", time.perf_counter() - started)
+        if self.runner.telemetry is not None and model:
+            self.runner.telemetry.write_prometheus()
+
+        metadata = {
+            "role": role,
+            "locale": locale,
+            "template": template,
+            "model": model,
+            "polish_failures": list(result.failures),
+        }
+        if path is not None:
+            metadata["path"] = str(path)
+        return metadata, payload
+
+    def _refresh(self, locale: str) -> None:
+        """Drop cached data for ``locale`` when any of its YAML files changed."""
+        mtimes = tuple(_mtime(path) for path in locale_files(self.runner.base_dir, locale).values())
+        with self._lock:
+            if self._mtimes.get(locale) == mtimes:
+                return
+            self._mtimes[locale] = mtimes
+            self._polished = {key: value for key, value in self._polished.items() if key[1] != locale}
+        self.runner.invalidate(locale)
+
+    def _polish(self, role: str, locale: str, model: Optional[str]) -> PolishResult:
+        """Polish once per role × locale × model; concurrent callers wait for the same pass.
+
+        Results are kept until the locale's files or the prompt config change
+        (polished text also stays in the polish cache across those changes).
+        """
+        key = (role, locale, model, _mtime(DEFAULT_CONFIG_PATH) if model else None)
+        with self._lock:
+            cached = self._polished.get(key)
+            if cached is not None:
+                return cached
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            return future.result()
+        try:
+            result = self.runner.polish(role, locale, model)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        if result.error is None and not result.failures:
+            with self._lock:
+                self._polished[key] = result
+        return result
+
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "ResumeDocs/1.0"
+    service: GenerationService  # set by make_server
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, self.service.health())
+        elif self.path == "/stats":
+            self._send_json(200, self.service.stats_payload())
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self) -> None:
+        if self.path != "/generate":
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self._send_json(413, {"error": f"Request body larger than {MAX_BODY_BYTES} bytes"})
+            return
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            self._send_json(400, {"error": f"Invalid JSON: {e}"})
+            return
+        status, metadata, payload = self.service.handle(request)
+        if status != 200:
+            self._send_json(status, metadata)
+        elif payload is None:
+            self._send_json(200, metadata)
+        else:
+            filename = f"resume-{metadata['role']}-{metadata['locale']}.docx"
+            self._send(200, payload, DOCX_CONTENT_TYPE, {
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                "X-Polish-Failures": str(len(metadata["polish_failures"])),
+            })
+
+    def _send_json(self, status: int, payload: Dict[str, object]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send(status, body, "application/json; charset=utf-8")
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_server(service: GenerationService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """Create (but do not start) a threaded HTTP server bound to ``service``."""
+    handler = type("Handler", (_Handler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Serve resume generation over HTTP with warm, shared state.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Bind address (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument("--model", help="Default LLM model for polishing; requests may override or skip it")
+    parser.add_argument("--include-contact", action="store_true", help="Include phone/address by default")
+    parser.add_argument("--output-dir", default=str(constants.DEFAULT_OUTPUT_DIR), help="Root for response=path")
+    parser.add_argument("--max-concurrent", type=int, default=4, help="Requests generated at the same time")
+    parser.add_argument("--polish-workers", type=int, default=1, help="Concurrent projects per polish pass")
+    parser.add_argument(
+        "--prompt-layout",
+        choices=["inline", "prefix"],
+        default="inline",
+        help="prefix: send the static instructions first as a system prompt so providers/Ollama can reuse them",
+    )
+    parser.add_argument(
+        "--polish-batch-tokens",
+        type=int,
+        default=0,
+        help="Polish several projects per request within this token budget (prompt + expected output); 0 = one per request",
+    )
+    parser.add_argument(
+        "--warm-up",
+        action="store_true",
+        help="At startup, check the model's backend and load it (Ollama) so the first request skips the cold start",
+    )
+    parser.add_argument(
+        "--hedge",
+        nargs="?",
+        const="",
+        metavar="BACKUP_MODEL",
+        help="Re-send polish calls slower than the model's latency percentile to BACKUP_MODEL "
+        "(default: hedge.backup in runtime_config.yaml); the first reply wins",
+    )
+    parser.add_argument(
+        "--hedge-percentile",
+        type=float,
+        help="Latency percentile (from telemetry) after which a call is hedged (default: hedge.percentile or 95)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the polished-text cache")
+    parser.add_argument(
+        "--telemetry",
+        action="store_true",
+        help="Record every LLM call to artifacts/telemetry/ (JSONL + Prometheus textfile)",
+    )
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    from .llm_scheduler import LLMScheduler
+    from .polish_cache import PolishCache
+    from .runtime_config import load_runtime_config
+
+    runtime_cfg = load_runtime_config()
+    telemetry = None
+    if args.telemetry:
+        from .telemetry import Telemetry
+
+        telemetry = Telemetry.from_config(runtime_cfg)
+    hedge = None
+    if args.model and args.hedge is not None:
+        from .hedging import HedgePolicy
+
+        try:
+            hedge = HedgePolicy.from_config(runtime_cfg, backup=args.hedge, percentile=args.hedge_percentile)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+    runner = BatchRunner(
+        model=args.model,
+        output_dir=Path(args.output_dir),
+        include_contact=args.include_contact,
+        polish_workers=args.polish_workers,
+        cache=None if args.no_cache else PolishCache(),
+        scheduler=LLMScheduler.from_config(runtime_cfg),
+        telemetry=telemetry,
+        prompt_layout=args.prompt_layout,
+        batch_tokens=args.polish_batch_tokens,
+        hedge=hedge,
+    )
+    service = GenerationService(runner, max_concurrent=args.max_concurrent)
+    try:
+        service.warm_up(check_model=args.warm_up)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    server = make_server(service, args.host, args.port)
+    print(f"Serving on http://{args.host}:{server.server_port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if telemetry is not None:
+            telemetry.write_prometheus()
+            telemetry.close()
+        if hedge is not None:
+            from .hedging import print_report
+
+            hedge.close()
+            print_report(hedge)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,340 @@
+"""Per-call LLM telemetry: latency, tokens, retries and cost.
+
+Each LLM invocation becomes one :class:`CallRecord`. A :class:`Telemetry`
+recorder appends records to ``artifacts/telemetry/calls-<run>.jsonl`` as they
+happen and writes a Prometheus textfile (node_exporter textfile collector
+format) with per provider × model × role counters and a latency histogram,
+so p95 polish latency and spend per role can be tracked across runs.
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, IO, List, Mapping, Optional, Tuple
+
+from . import constants
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+METRIC_PREFIX = "resume_llm"
+# Latencies kept per role for the percentile summary
+SUMMARY_WINDOW = 1000
+# Local providers cost nothing per token
+FREE_PROVIDERS = frozenset({"ollama"})
+
+
+@dataclass
+class CallRecord:
+    """One LLM invocation (all attempts, including retries)."""
+
+    timestamp: str
+    run_id: str
+    provider: str
+    model: str
+    role: Optional[str]
+    locale: Optional[str]
+    project: Optional[str]
+    prompt_tokens: int
+    completion_tokens: int
+    tokens_estimated: bool
+    latency_seconds: float
+    time_to_first_token: Optional[float] = None
+    # Prompt tokens the provider served from its prefix cache
+    cached_prompt_tokens: int = 0
+    # Backend prompt evaluation time, when reported (Ollama)
+    prompt_eval_seconds: Optional[float] = None
+    retries: int = 0
+    cost_usd: Optional[float] = None
+    # "primary" / "backup" for the two calls of a hedged request
+    hedge: Optional[str] = None
+    status: str = "ok"
+    error: Optional[str] = None
+
+
+@dataclass
+class ModelPrice:
+    """USD per one million prompt / completion tokens."""
+
+    prompt: float
+    completion: float
+
+    def cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return (prompt_tokens * self.prompt + completion_tokens * self.completion) / 1_000_000
+
+
+@dataclass
+class _Series:
+    """Running totals for one provider × model × role (bounded memory for long-lived processes)."""
+
+    statuses: Dict[str, int] = field(default_factory=dict)
+    retries: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_prompt_tokens: int = 0
+    prompt_eval_seconds: float = 0.0
+    hedges: int = 0
+    cost_usd: Optional[float] = None
+    buckets: List[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    latency_sum: float = 0.0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=SUMMARY_WINDOW))
+
+    @property
+    def count(self) -> int:
+        return sum(self.statuses.values())
+
+    def add(self, record: CallRecord) -> None:
+        self.statuses[record.status] = self.statuses.get(record.status, 0) + 1
+        self.retries += record.retries
+        self.prompt_tokens += record.prompt_tokens
+        self.completion_tokens += record.completion_tokens
+        self.cached_prompt_tokens += record.cached_prompt_tokens
+        self.prompt_eval_seconds += record.prompt_eval_seconds or 0.0
+        self.hedges += record.hedge == "backup"
+        if record.cost_usd is not None:
+            self.cost_usd = (self.cost_usd or 0.0) + record.cost_usd
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if record.latency_seconds <= bound:
+                self.buckets[index] += 1
+        self.latency_sum += record.latency_seconds
+        self.latencies.append(record.latency_seconds)
+
+
+class Telemetry:
+    """Thread-safe recorder shared by every polisher in a process.
+
+    Records go straight to the JSONL file; only per-series totals and a
+    bounded latency window stay in memory.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path | None = None,
+        prices: Optional[Mapping[str, ModelPrice]] = None,
+        run_id: Optional[str] = None,
+    ):
+        self.output_dir = Path(output_dir or constants.TELEMETRY_DIR)
+        self.prices = dict(prices or {})
+        self.run_id = run_id or f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.jsonl_path = self.output_dir / f"calls-{self.run_id}.jsonl"
+        self.prometheus_path = self.output_dir / "resume_llm.prom"
+        self._series: Dict[Tuple[str, str, str], _Series] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stream: Optional[IO[str]] = None
+
+    @classmethod
+    def from_config(cls, config: Dict, output_dir: Path | None = None) -> "Telemetry":
+        """Build from runtime_config.yaml's optional ``pricing`` section.
+
+        ``pricing: {<model>: {prompt: <usd per 1M>, completion: <usd per 1M>}}``
+        """
+        prices = {
+            model: ModelPrice(float(price.get("prompt", 0.0)), float(price.get("completion", 0.0)))
+            for model, price in (config.get("pricing") or {}).items()
+        }
+        return cls(output_dir=output_dir, prices=prices)
+
+    def cost(self, provider: str, model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+        """Estimated cost in USD; None when the model has no configured price."""
+        if provider in FREE_PROVIDERS:
+            return 0.0
+        price = self.prices.get(model)
+        if price is None:
+            return None
+        return round(price.cost(prompt_tokens, completion_tokens), 6)
+
+    def record(
+        self,
+        provider: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        latency_seconds: float,
+        tokens_estimated: bool = False,
+        **fields,
+    ) -> CallRecord:
+        """Store one call and append it to the run's JSONL file."""
+        record = CallRecord(
+            timestamp=datetime.now().isoformat(timespec="milliseconds"),
+            run_id=self.run_id,
+            provider=provider,
+            model=model,
+            role=fields.pop("role", None),
+            locale=fields.pop("locale", None),
+            project=fields.pop("project", None),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            tokens_estimated=tokens_estimated,
+            latency_seconds=round(latency_seconds, 4),
+            cost_usd=self.cost(provider, model, prompt_tokens, completion_tokens),
+            **fields,
+        )
+        line = json.dumps(asdict(record), ensure_ascii=False)
+        with self._lock:
+            self._series.setdefault((provider, model, record.role or ""), _Series()).add(record)
+            if self._stream is None:
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                self._stream = self.jsonl_path.open("a", encoding="utf-8")
+            self._stream.write(line + "\n")
+            self._stream.flush()
+        return record
+
+    def close(self) -> None:
+        with self._lock:
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+
+    def write_prometheus(self, path: Path | None = None) -> Path:
+        """Write the metrics textfile atomically (the collector may read at any time)."""
+        path = Path(path or self.prometheus_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(path.suffix + ".tmp")
+        with self._write_lock:
+            temp.write_text(self.prometheus_text(), encoding="utf-8")
+            os.replace(temp, path)
+        return path
+
+    def prometheus_text(self) -> str:
+        with self._lock:
+            series = sorted(((key, _copy_series(value)) for key, value in self._series.items()), key=lambda item: item[0])
+
+        p = METRIC_PREFIX
+        lines = [f"# HELP {p}_calls_total LLM calls by outcome.", f"# TYPE {p}_calls_total counter"]
+        for key, value in series:
+            for status, count in sorted(value.statuses.items()):
+                lines.append(f"{p}_calls_total{_labels(key, status=status)} {count}")
+        lines += [f"# HELP {p}_retries_total Retried attempts.", f"# TYPE {p}_retries_total counter"]
+        lines += [f"{p}_retries_total{_labels(key)} {value.retries}" for key, value in series]
+        lines += [f"# HELP {p}_tokens_total Prompt and completion tokens.", f"# TYPE {p}_tokens_total counter"]
+        for key, value in series:
+            lines.append(f"{p}_tokens_total{_labels(key, kind='prompt')} {value.prompt_tokens}")
+            lines.append(f"{p}_tokens_total{_labels(key, kind='completion')} {value.completion_tokens}")
+        lines += [
+            f"# HELP {p}_cached_prompt_tokens_total Prompt tokens served from the provider's prefix cache.",
+            f"# TYPE {p}_cached_prompt_tokens_total counter",
+        ]
+        lines += [f"{p}_cached_prompt_tokens_total{_labels(key)} {value.cached_prompt_tokens}" for key, value in series]
+        lines += [
+            f"# HELP {p}_prompt_eval_seconds_total Backend prompt evaluation time, where reported.",
+            f"# TYPE {p}_prompt_eval_seconds_total counter",
+        ]
+        lines += [
+            f"{p}_prompt_eval_seconds_total{_labels(key)} {round(value.prompt_eval_seconds, 4)}" for key, value in series
+        ]
+        lines += [
+            f"# HELP {p}_hedge_calls_total Backup calls sent because the primary exceeded the hedge delay.",
+            f"# TYPE {p}_hedge_calls_total counter",
+        ]
+        lines += [f"{p}_hedge_calls_total{_labels(key)} {value.hedges}" for key, value in series]
+        lines += [
+            f"# HELP {p}_cost_usd_total Estimated spend; models without a price are omitted.",
+            f"# TYPE {p}_cost_usd_total counter",
+        ]
+        lines += [
+            f"{p}_cost_usd_total{_labels(key)} {round(value.cost_usd, 6)}"
+            for key, value in series
+            if value.cost_usd is not None
+        ]
+        lines += [
+            f"# HELP {p}_call_latency_seconds End-to-end call latency including retries.",
+            f"# TYPE {p}_call_latency_seconds histogram",
+        ]
+        for key, value in series:
+            for bound, count in zip(LATENCY_BUCKETS, value.buckets):
+                lines.append(f"{p}_call_latency_seconds_bucket{_labels(key, le=str(bound))} {count}")
+            lines.append(f"{p}_call_latency_seconds_bucket{_labels(key, le='+Inf')} {value.count}")
+            lines.append(f"{p}_call_latency_seconds_sum{_labels(key)} {round(value.latency_sum, 4)}")
+            lines.append(f"{p}_call_latency_seconds_count{_labels(key)} {value.count}")
+        lines += [
+            f"# HELP {p}_last_run_timestamp_seconds When this file was written.",
+            f"# TYPE {p}_last_run_timestamp_seconds gauge",
+            f"{p}_last_run_timestamp_seconds {int(time.time())}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> List[Dict[str, object]]:
+        """Per-role rows (calls, p50/p95/p99 latency, tokens, cost) for terminal output."""
+        roles: Dict[str, _Series] = {}
+        with self._lock:
+            for (_, _, role), value in self._series.items():
+                merged = roles.setdefault(role or "-", _Series(latencies=deque()))
+                for status, count in value.statuses.items():
+                    merged.statuses[status] = merged.statuses.get(status, 0) + count
+                merged.prompt_tokens += value.prompt_tokens
+                merged.completion_tokens += value.completion_tokens
+                if value.cost_usd is not None:
+                    merged.cost_usd = (merged.cost_usd or 0.0) + value.cost_usd
+                merged.latencies.extend(value.latencies)
+        rows = []
+        for role, value in sorted(roles.items()):
+            latencies = sorted(value.latencies)
+            rows.append({
+                "role": role,
+                "calls": value.count,
+                # Hedged calls that lost are not errors
+                "errors": value.count - value.statuses.get("ok", 0) - value.statuses.get("cancelled", 0),
+                "p50_seconds": percentile(latencies, 50),
+                "p95_seconds": percentile(latencies, 95),
+                "p99_seconds": percentile(latencies, 99),
+                "prompt_tokens": value.prompt_tokens,
+                "completion_tokens": value.completion_tokens,
+                "cost_usd": round(value.cost_usd, 4) if value.cost_usd is not None else None,
+            })
+        return rows
+
+
+def _copy_series(value: _Series) -> _Series:
+    return _Series(
+        statuses=dict(value.statuses),
+        retries=value.retries,
+        prompt_tokens=value.prompt_tokens,
+        completion_tokens=value.completion_tokens,
+        cached_prompt_tokens=value.cached_prompt_tokens,
+        prompt_eval_seconds=value.prompt_eval_seconds,
+        hedges=value.hedges,
+        cost_usd=value.cost_usd,
+        buckets=list(value.buckets),
+        latency_sum=value.latency_sum,
+        latencies=deque(),
+    )
+
+
+def percentile(ordered: List[float], percent: float) -> float:
+    """Nearest-rank percentile of a sorted list (0.0 when empty)."""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def print_summary(telemetry: Telemetry) -> None:
+    rows = telemetry.summary()
+    if not rows:
+        return
+    print("LLM telemetry (per role):")
+    for row in rows:
+        cost = f"${row['cost_usd']:.4f}" if row["cost_usd"] is not None else "n/a"
+        print(
+            f"  {row['role']}: {row['calls']} call(s), {row['errors']} error(s), "
+            f"p50 {row['p50_seconds']:.2f}s, p95 {row['p95_seconds']:.2f}s, p99 {row['p99_seconds']:.2f}s, "
+            f"tokens {row['prompt_tokens']}+{row['completion_tokens']}, cost {cost}"
+        )
+    print(f"Telemetry: {telemetry.jsonl_path}, {telemetry.prometheus_path}")
+
+
+def _labels(key: Tuple[str, str, str], **extra: str) -> str:
+    provider, model, role = key
+    pairs = {"provider": provider, "model": model, "role": role, **extra}
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs.items()) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
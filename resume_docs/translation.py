@@ -0,0 +1,286 @@
+"""Batched zh-CN → en-US translation of project data.
+
+Every translatable string in a project becomes a segment addressed by its
+path (e.g. ``("responsibilities", 2)``). Segments are packed into JSON-keyed
+requests sized to the model's context window, so a project usually costs a
+single LLM call; results are mapped back by path. Only segments too large for
+one request are split, at sentence boundaries.
+
+Work is incremental: unchanged projects (same fingerprint) are reused as a
+whole, remembered segments come from the translation memory, and segments
+without Chinese text never reach the model.
+"""
+from __future__ import annotations
+
+import copy
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from .llm_scheduler import estimate_tokens
+from .translation_memory import needs_translation, project_fingerprint
+
+Path = Tuple[Union[str, int], ...]
+
+DEFAULT_CONTEXT_WINDOW = 8192
+DEFAULT_MAX_WORKERS = 4
+
+# Metadata, enums and numbers that are never translated
+PRESERVE_FIELDS = frozenset({
+    "role_perspective", "decision_accountability",
+    "responsibility_focus", "governance_artifacts", "ai_component_flag",
+    "start", "end", "team_size", "budget_level", "stakeholder_tiers",
+    "management_scope", "llm_primary_role", "llm_secondary_roles",
+})
+
+BATCH_PROMPT = """Translate the Chinese values of the JSON object below to English. Keep the translation concise and professional.
+Keep every key unchanged and leave values that are already English as they are.
+Only output a JSON object with exactly the same keys, nothing else.
+
+{payload}"""
+
+FIELD_PROMPT = """Translate the following Chinese text to English. Keep the translation concise and professional.
+Only output the translated text, nothing else.
+
+Chinese text:
+{text}"""
+
+_SENTENCE_END = re.compile(r"(?<=[。！？；.!?;\n])")
+
+
+@dataclass
+class Segment:
+    """One translatable string and where it lives in the project."""
+
+    path: Path
+    text: str
+
+
+def collect_segments(project: dict, preserve_fields=PRESERVE_FIELDS) -> List[Segment]:
+    """Return every translatable string leaf of ``project`` with its path."""
+    segments: List[Segment] = []
+
+    def walk(value, path: Path) -> None:
+        if isinstance(value, str):
+            if value.strip():
+                segments.append(Segment(path, value))
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                walk(item, path + (index,))
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                if key not in preserve_fields:
+                    walk(item, path + (key,))
+
+    for key, value in project.items():
+        if key in preserve_fields:
+            continue
+        if key == "timeframe":
+            # Only the label is prose; start/end stay as YYYY-MM
+            if isinstance(value, dict) and isinstance(value.get("label"), str) and value["label"].strip():
+                segments.append(Segment((key, "label"), value["label"]))
+            continue
+        walk(value, (key,))
+    return segments
+
+
+def apply_translations(project: dict, translations: Dict[Path, str]) -> dict:
+    """Return a deep copy of ``project`` with the translated segments written back."""
+    translated = copy.deepcopy(project)
+    for path, text in translations.items():
+        target = translated
+        for step in path[:-1]:
+            target = target[step]
+        target[path[-1]] = text
+    return translated
+
+
+def split_text(text: str, budget: int) -> List[str]:
+    """Split ``text`` into pieces of at most ``budget`` estimated tokens.
+
+    Sentences are kept whole where possible; a single over-long sentence is
+    cut by characters.
+    """
+    if estimate_tokens(text) <= budget:
+        return [text]
+    pieces: List[str] = []
+    current = ""
+    for sentence in filter(None, _SENTENCE_END.split(text)):
+        while estimate_tokens(sentence) > budget:
+            cut = max(1, len(sentence) * budget // estimate_tokens(sentence))
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:]
+        if current and estimate_tokens(current + sentence) > budget:
+            pieces.append(current)
+            current = ""
+        current += sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def parse_json_object(text: str) -> Optional[dict]:
+    """Parse a JSON object from an LLM reply, tolerating code fences or chatter."""
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        data = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+class TranslationEngine:
+    """Translate projects with few, large, structured LLM requests.
+
+    Args:
+        client: LangChain-style client exposing ``invoke(prompt) -> str``
+        context_window: Model context window in tokens; a third of it is
+            used for request values so the reply fits as well
+        max_workers: Projects translated concurrently
+        scheduler: Optional ``LLMScheduler`` for rate limits and retries
+        memory: Optional ``TranslationMemory`` consulted before the model
+    """
+
+    def __init__(
+        self,
+        client,
+        context_window: int = DEFAULT_CONTEXT_WINDOW,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        scheduler=None,
+        memory=None,
+    ):
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be >= 1, got {max_workers}")
+        self.client = client
+        self.batch_budget = max(64, context_window // 3)
+        self.max_workers = max_workers
+        self.scheduler = scheduler
+        self.memory = memory
+        self.calls = 0
+        self.skipped = 0
+        self.reused_projects = 0
+        self._lock = threading.Lock()
+
+    def translate_projects(
+        self,
+        projects: Sequence[dict],
+        progress=None,
+        previous: Optional[Dict[str, dict]] = None,
+    ) -> List[dict]:
+        """Translate ``projects`` concurrently, returning them in input order.
+
+        Args:
+            projects: Raw project mappings from projects_summary.yaml
+            progress: Optional callable receiving each project name when done
+            previous: Earlier translations keyed by source project fingerprint;
+                unchanged projects are reused as-is
+        """
+        previous = previous or {}
+
+        def run(project: dict) -> dict:
+            earlier = previous.get(project_fingerprint(project))
+            if earlier is not None:
+                with self._lock:
+                    self.reused_projects += 1
+                return earlier
+            translated = self.translate_project(project)
+            if progress is not None:
+                progress(project.get("project_name", "Unknown"))
+            return translated
+
+        if self.max_workers == 1 or len(projects) <= 1:
+            return [run(project) for project in projects]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(projects))) as executor:
+            return list(executor.map(run, projects))
+
+    def translate_project(self, project: dict) -> dict:
+        """Translate one project's segments and write them back by path."""
+        segments = collect_segments(project)
+        return apply_translations(project, self.translate_segments(segments))
+
+    def translate_segments(self, segments: Sequence[Segment]) -> Dict[Path, str]:
+        """Translate ``segments`` in as few requests as the budget allows."""
+        done: Dict[Path, str] = {}
+        pending: List[Segment] = []
+        for segment in segments:
+            if not needs_translation(segment.text):
+                done[segment.path] = segment.text
+                with self._lock:
+                    self.skipped += 1
+                continue
+            remembered = self.memory.get(segment.text) if self.memory is not None else None
+            if remembered is not None:
+                done[segment.path] = remembered
+            else:
+                pending.append(segment)
+
+        # Oversized segments are split into parts keyed (path, part index)
+        units: List[Tuple[Path, int, str]] = []
+        for segment in pending:
+            for part, piece in enumerate(split_text(segment.text, self.batch_budget)):
+                units.append((segment.path, part, piece))
+
+        results: Dict[Tuple[Path, int], str] = {}
+        for batch in self._batches(units):
+            results.update(self._translate_batch(batch))
+
+        translations: Dict[Path, List[str]] = {}
+        for path, part, _ in units:
+            translations.setdefault(path, []).append(results[(path, part)])
+        for segment in pending:
+            done[segment.path] = " ".join(translations[segment.path])
+            if self.memory is not None:
+                self.memory.set(segment.text, done[segment.path])
+        return done
+
+    def translate_text(self, text: str) -> str:
+        """Translate a single string with a plain-text request."""
+        return self._invoke(FIELD_PROMPT.format(text=text)).strip()
+
+    def _batches(self, units: List[Tuple[Path, int, str]]):
+        batch: List[Tuple[Path, int, str]] = []
+        used = 0
+        for unit in units:
+            tokens = estimate_tokens(unit[2])
+            if batch and used + tokens > self.batch_budget:
+                yield batch
+                batch, used = [], 0
+            batch.append(unit)
+            used += tokens
+        if batch:
+            yield batch
+
+    def _translate_batch(self, batch: List[Tuple[Path, int, str]]) -> Dict[Tuple[Path, int], str]:
+        if len(batch) == 1:
+            path, part, text = batch[0]
+            return {(path, part): self.translate_text(text)}
+
+        payload = {str(index): text for index, (_, _, text) in enumerate(batch)}
+        reply = parse_json_object(self._invoke(BATCH_PROMPT.format(
+            payload=json.dumps(payload, ensure_ascii=False, indent=2)
+        ))) or {}
+
+        results = {}
+        for index, (path, part, text) in enumerate(batch):
+            value = reply.get(str(index))
+            if not isinstance(value, str) or not value.strip():
+                # Missing or malformed key: fall back to a single-field request
+                value = self.translate_text(text)
+            results[(path, part)] = value.strip()
+        return results
+
+    def _invoke(self, prompt: str) -> str:
+        with self._lock:
+            self.calls += 1
+        if self.scheduler is None:
+            return self.client.invoke(prompt)
+        provider = getattr(self.client, "provider", None) or type(self.client).__name__
+        return self.scheduler.run(provider, lambda: self.client.invoke(prompt), estimate_tokens(prompt))
@@ -0,0 +1,92 @@
+"""Persistent translation memory and project fingerprints for incremental translation."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from . import constants
+
+# CJK ideographs, CJK/full-width punctuation: anything else is left untranslated
+_NEEDS_TRANSLATION = re.compile(r"[\u3000-\u303f\u3400-\u9fff\uf900-\ufaff\uff00-\uffef]")
+
+
+def needs_translation(text: str) -> bool:
+    """Return True if ``text`` contains Chinese that the model must translate.
+
+    Pure ASCII, enum values, version strings and tech names such as
+    "FastAPI" or "Next.js 14" have no CJK characters and are kept verbatim.
+    """
+    return bool(text) and _NEEDS_TRANSLATION.search(text) is not None
+
+
+def segment_key(text: str) -> str:
+    """Return the memory key for a source segment."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def project_fingerprint(project: dict) -> str:
+    """Return a stable hash of a source project's full content."""
+    payload = json.dumps(project, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    """Source-segment hash → translation, stored as one JSON file.
+
+    Entries are only ever added, so an edited project re-translates just the
+    segments whose text changed. Call :meth:`save` to persist new entries.
+    With ``refresh`` nothing is looked up, but every new translation still
+    overwrites its entry, so a full retranslation leaves no stale entries.
+    """
+
+    def __init__(self, path: Path | None = None, refresh: bool = False):
+        self.path = Path(path or constants.TRANSLATION_MEMORY_PATH)
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._entries: Dict[str, str] = self._read()
+
+    def _read(self) -> Dict[str, str]:
+        try:
+            with self.path.open("r", encoding="utf-8") as handle:
+                entries = json.load(handle).get("segments", {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, text: str) -> Optional[str]:
+        """Return the remembered translation of ``text`` or None on a miss (always None with ``refresh``)."""
+        with self._lock:
+            translation = None if self.refresh else self._entries.get(segment_key(text))
+            if translation is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return translation
+
+    def set(self, text: str, translation: str) -> None:
+        with self._lock:
+            self._entries[segment_key(text)] = translation
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the memory atomically if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+            with tmp_path.open("w", encoding="utf-8") as handle:
+                json.dump({"segments": self._entries}, handle, ensure_ascii=False, indent=0)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
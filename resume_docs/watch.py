@@ -0,0 +1,293 @@
+"""Watch input files and regenerate only the outputs an edit affects."""
+from __future__ import annotations
+
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from . import models
+from .batch import BatchRunner
+from .loader import locale_files
+from .prompt_loader import DEFAULT_CONFIG_PATH, get_prompt_loader
+from .role_config import ROLE_FILTERS
+
+WATCH_INTERVAL = 1.0
+PROMPTS = "prompts"
+
+
+def _signature(value) -> str:
+    """Content hash of a model, view or section."""
+    digest = hashlib.sha1()
+    for chunk in models.iter_json(value):
+        digest.update(chunk.encode("utf-8"))
+    return digest.hexdigest()
+
+
+@dataclass
+class CycleReport:
+    """What one regeneration pass touched."""
+
+    changed_files: List[str] = field(default_factory=list)
+    changed_sections: List[str] = field(default_factory=list)
+    polished_projects: int = 0
+    rendered: List[str] = field(default_factory=list)
+    failures: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+@dataclass
+class _PolishedEntry:
+    project: object
+    effective_role: Optional[str]
+
+
+class WatchSession:
+    """Keep a ``BatchRunner`` warm and regenerate affected outputs on change.
+
+    Each watched file maps to a (locale, section) pair; ``prompt_config.yaml``
+    maps to every locale's polishing. A change reloads only the edited
+    locale, re-polishes only projects whose filtered content (or prompt)
+    changed, and re-renders only role × locale × template outputs whose
+    inputs differ. Outputs keep one path for the whole session.
+
+    A locale whose files fail to load (e.g. a half-saved YAML file) is
+    reported and skipped until it loads again; its last good outputs stay
+    in place while the other locales keep regenerating.
+    """
+
+    def __init__(
+        self,
+        runner: BatchRunner,
+        roles: Sequence[str],
+        locales: Sequence[str],
+        templates: Sequence[str],
+        interval: float = WATCH_INTERVAL,
+        prompt_path: Path | None = None,
+    ):
+        self.runner = runner
+        self.roles = list(roles)
+        self.locales = list(locales)
+        self.templates = list(templates)
+        self.interval = interval
+        self.prompt_path = Path(prompt_path or DEFAULT_CONFIG_PATH)
+        self.timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+
+        # file -> (locale, section); the prompt file affects every locale
+        self.dependencies: Dict[Path, Tuple[Optional[str], str]] = {}
+        for locale in self.locales:
+            for section, path in locale_files(runner.base_dir, locale).items():
+                self.dependencies[path] = (locale, section)
+        self.dependencies[self.prompt_path] = (None, PROMPTS)
+
+        self._mtimes: Dict[Path, Optional[int]] = {path: self._mtime(path) for path in self.dependencies}
+        self._section_sigs: Dict[Tuple[str, str], str] = {}
+        self._project_sigs: Dict[str, Dict[str, str]] = {}
+        self._prompt_config: Optional[Dict] = None
+        self._polished: Dict[Tuple[str, str, str], _PolishedEntry] = {}
+        self._outputs: Dict[Tuple[str, str, str], str] = {}
+        # locale -> load error, for locales skipped until their files load again
+        self._broken: Dict[str, str] = {}
+
+    @staticmethod
+    def _mtime(path: Path) -> Optional[int]:
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def build(self) -> CycleReport:
+        """Generate every output once, recording what each depends on."""
+        report = CycleReport()
+        started = time.perf_counter()
+        self._prompt_config = self._load_prompt_config()
+        for locale in self.locales:
+            self._refresh_sections(locale, report)
+        self._regenerate(report)
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def poll(self) -> Optional[CycleReport]:
+        """Check for changed files and regenerate; None when nothing changed."""
+        changed = [path for path in self.dependencies if self._mtime(path) != self._mtimes[path]]
+        if not changed:
+            return None
+        # Debounce: editors often write in several steps
+        time.sleep(min(self.interval, 0.2))
+        for path in self.dependencies:
+            self._mtimes[path] = self._mtime(path)
+
+        report = CycleReport(changed_files=[str(path) for path in changed])
+        started = time.perf_counter()
+        try:
+            self._apply_changes(changed, report)
+            self._regenerate(report)
+        except Exception as e:  # e.g. invalid YAML mid-edit: keep the last good outputs
+            report.failures.append(str(e))
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def run(self, on_report: Callable[[CycleReport], None] = None, stop: Callable[[], bool] = None) -> None:
+        """Build once, then poll until ``stop()`` is true or the user interrupts."""
+        on_report = on_report or print_report
+        on_report(self.build())
+        try:
+            while not (stop and stop()):
+                time.sleep(self.interval)
+                report = self.poll()
+                if report is not None:
+                    on_report(report)
+        except KeyboardInterrupt:
+            pass
+
+    def _apply_changes(self, changed: Sequence[Path], report: CycleReport) -> None:
+        locales = {self.dependencies[path][0] for path in changed if self.dependencies[path][1] != PROMPTS}
+        for locale in sorted(locales):
+            self.runner.invalidate(locale)
+            self._refresh_sections(locale, report)
+        if any(self.dependencies[path][1] == PROMPTS for path in changed):
+            self._refresh_prompts(report)
+
+    def _refresh_sections(self, locale: str, report: CycleReport) -> None:
+        try:
+            resume = self.runner.resume_for(locale)
+        except Exception as e:  # invalid YAML or data mid-edit: skip only this locale
+            self._broken[locale] = str(e)
+            report.failures.append(f"{locale}: {e}")
+            return
+        self._broken.pop(locale, None)
+        for section in ("personal_info", "skills", "work"):
+            sig = _signature(getattr(resume, section))
+            if self._section_sigs.get((locale, section)) != sig:
+                self._section_sigs[(locale, section)] = sig
+                report.changed_sections.append(f"{locale}:{section}")
+        old = self._project_sigs.get(locale, {})
+        new = self._project_sigs[locale] = {project.project_name: _signature(project) for project in resume.projects}
+        edited = sorted(name for name in set(old) | set(new) if old.get(name) != new.get(name))
+        if edited:
+            report.changed_sections.append(f"{locale}:projects[{'; '.join(edited)}]")
+
+    def _load_prompt_config(self) -> Dict:
+        try:
+            return get_prompt_loader(self.prompt_path).config or {}
+        except OSError:
+            return {}
+
+    def _refresh_prompts(self, report: CycleReport) -> None:
+        """Drop polished projects whose effective role's prompt section changed."""
+        old, new = self._prompt_config or {}, self._load_prompt_config()
+        self._prompt_config = new
+        if old.get("base_templates") != new.get("base_templates"):
+            changed_roles = None  # every role-aware prompt changed
+        else:
+            old_roles, new_roles = old.get("roles") or {}, new.get("roles") or {}
+            changed_roles = {role for role in set(old_roles) | set(new_roles) if old_roles.get(role) != new_roles.get(role)}
+        report.changed_sections.append(
+            f"{PROMPTS}:{'all' if changed_roles is None else ','.join(sorted(changed_roles)) or 'none'}"
+        )
+        self._polished = {
+            key: entry for key, entry in self._polished.items()
+            if entry.effective_role is None  # fallback prompt lives in code, not in the config
+            or (changed_roles is not None and entry.effective_role not in changed_roles)
+        }
+
+    def _regenerate(self, report: CycleReport) -> None:
+        pending: List[Tuple[models.ResumeDocument, str, str, str]] = []
+        live: Set[Tuple[str, str, str]] = set()
+        locales = [locale for locale in self.locales if locale not in self._broken]
+        for role in self.roles:
+            for locale in locales:
+                resume = self._polish(role, locale, report, live)
+                sig = hashlib.sha1("|".join(
+                    [self._section_sigs[(locale, section)] for section in ("personal_info", "skills", "work")]
+                    + [_signature(project) for project in resume.projects]
+                ).encode("utf-8")).hexdigest()
+                for template in self.templates:
+                    key = (role, locale, template)
+                    if self._outputs.get(key) != sig:
+                        pending.append((resume, role, locale, template))
+                        self._outputs[key] = sig
+        if self.runner.model:  # forget polished text for content that no longer exists
+            self._polished = {
+                key: entry for key, entry in self._polished.items() if key in live or key[1] in self._broken
+            }
+
+        def render(item) -> None:
+            resume, role, locale, template = item
+            path = self.runner.output_path(role, locale, template, self.timestamp)
+            try:
+                self.runner.render(resume, locale, template, path)
+            except Exception as e:  # keep watching; retry this output on the next change
+                self._outputs.pop((role, locale, template), None)
+                report.failures.append(f"{role} {locale} {template}: {e}")
+                return
+            report.rendered.append(str(path))
+
+        with ThreadPoolExecutor(max_workers=self.runner.max_workers) as executor:
+            list(executor.map(render, pending))
+        if self.runner.telemetry is not None:
+            self.runner.telemetry.write_prometheus()
+
+    def _polish(
+        self, role: str, locale: str, report: CycleReport, live: Set[Tuple[str, str, str]]
+    ) -> models.ResumeDocument:
+        """Filtered resume with polished projects, polishing only unseen content."""
+        resume = self.runner.filtered_for(locale, role)
+        if not self.runner.model:
+            return resume
+        from .llm_polisher import LLMPolisher, PolishError
+        from .llm_role_resolver import resolve_polish_role
+
+        keys = [(role, locale, _signature(project)) for project in resume.projects]
+        live.update(keys)
+        missing = [index for index, key in enumerate(keys) if key not in self._polished]
+        unpolished: Dict[int, object] = {}
+        if missing:
+            polisher = LLMPolisher(
+                max_workers=self.runner.polish_workers,
+                cache=self.runner.cache,
+                scheduler=self.runner.scheduler,
+                telemetry=self.runner.telemetry,
+                prompt_layout=self.runner.prompt_layout,
+                batch_tokens=self.runner.batch_tokens,
+                cache_only=self.runner.cache_only,
+                hedge=self.runner.hedge,
+            )
+            subset = [resume.projects[index] for index in missing]
+            failed: Set[int] = set()
+            try:
+                polished = polisher.polish_projects(
+                    subset, self.runner.model, locale, ROLE_FILTERS[role].get("persona"), role
+                )
+            except PolishError as e:
+                polished = e.projects
+                failed = {failure.index for failure in e.failures}
+                report.failures.extend(failure.error for failure in e.failures)
+            for offset, index in enumerate(missing):
+                if offset in failed:
+                    unpolished[index] = polished[offset]  # retried on the next change
+                    continue
+                self._polished[keys[index]] = _PolishedEntry(polished[offset], resolve_polish_role(role, subset[offset]))
+            report.polished_projects += len(missing) - len(failed)
+        projects = [
+            unpolished[index] if index in unpolished else self._polished[key].project
+            for index, key in enumerate(keys)
+        ]
+        return replace(resume, projects=projects)
+
+
+def print_report(report: CycleReport) -> None:
+    if report.changed_files:
+        print(f"Changed: {', '.join(Path(path).name for path in report.changed_files)}")
+    if report.changed_sections:
+        print(f"  sections: {', '.join(report.changed_sections)}")
+    for failure in report.failures:
+        print(f"  error: {failure}")
+    print(f"  re-polished {report.polished_projects} project(s), re-rendered {len(report.rendered)} output(s) "
+          f"in {report.seconds:.2f}s")
+    for path in report.rendered:
+        print(f"    {path}")
+    print("Watching for changes (Ctrl+C to stop)...")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""CLI 启动耗时基准：检查 import 时间预算与重量级依赖是否被提前加载
+
+功能：
+- 用 `python -X importtime` 统计 `resume_docs.cli` 的累计 import 耗时
+- 确认 import 后未加载 LangChain / python-docx / requests 等重量级模块
+- 可选：测量完整 `--dry-run` 校验的端到端耗时（先跑一次预热解析快照，再取中位数；
+  命中快照时不导入 PyYAML）
+
+使用：
+    python scripts/benchmark_import_time.py
+    python scripts/benchmark_import_time.py --import-budget-ms 80 --dry-run-budget-ms 200 --role data_development
+
+输出：控制台报告；超出预算或加载了禁止模块时返回码为 1，可直接用于 pre-commit。
+依赖：仅标准库。
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TARGET_MODULE = "resume_docs.cli"
+FORBIDDEN_PREFIXES = ("langchain", "langchain_core", "langchain_community", "langchain_openai", "openai", "docx", "requests")
+
+
+def measure_import_us(module: str) -> int:
+    """Return the cumulative import time of ``module`` in microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise RuntimeError(f"No importtime entry for {module}")
+
+
+def loaded_modules(module: str) -> list:
+    script = f"import json, sys, {module}; print(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+def measure_command_ms(args: list) -> float:
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, *args], cwd=REPO_ROOT, capture_output=True, text=True)
+    elapsed = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else result.stdout)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark resume_docs.cli startup time")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of samples per measurement")
+    parser.add_argument("--import-budget-ms", type=float, default=100.0, help="Budget for importing the CLI")
+    parser.add_argument("--dry-run-budget-ms", type=float, default=200.0, help="Budget for a full --dry-run")
+    parser.add_argument("--role", default="data_development", help="Role used for the dry-run sample")
+    parser.add_argument("--locale", default="zh-CN", help="Locale used for the dry-run sample")
+    parser.add_argument("--skip-dry-run", action="store_true", help="Only measure import time")
+    args = parser.parse_args()
+
+    failed = False
+
+    import_ms = [measure_import_us(TARGET_MODULE) / 1000 for _ in range(args.repeat)]
+    median_import = statistics.median(import_ms)
+    status = "OK" if median_import <= args.import_budget_ms else "OVER BUDGET"
+    failed |= status != "OK"
+    print(f"import {TARGET_MODULE}: median {median_import:.1f} ms, min {min(import_ms):.1f} ms "
+          f"(budget {args.import_budget_ms:.0f} ms) {status}")
+
+    heavy = [name for name in loaded_modules(TARGET_MODULE) if name.split(".")[0] in FORBIDDEN_PREFIXES]
+    if heavy:
+        failed = True
+        print(f"✗ heavy modules loaded at import: {', '.join(sorted(set(n.split('.')[0] for n in heavy)))}")
+    else:
+        print("✓ no LangChain / python-docx / requests modules loaded at import")
+
+    if not args.skip_dry_run:
+        baseline_ms = [measure_command_ms(["-c", "pass"]) for _ in range(args.repeat)]
+        print(f"interpreter startup (python -c pass): median {statistics.median(baseline_ms):.1f} ms")
+        dry_run_args = ["-m", TARGET_MODULE, "--role", args.role, "--locale", args.locale, "--dry-run"]
+        try:
+            # 首次运行会写入解析快照（artifacts/cache/resume），不计时；之后测量命中快照的常态路径
+            measure_command_ms(dry_run_args)
+            dry_ms = [measure_command_ms(dry_run_args) for _ in range(args.repeat)]
+        except RuntimeError as exc:
+            failed = True
+            print(f"✗ dry-run failed: {exc}")
+        else:
+            median_dry = statistics.median(dry_ms)
+            status = "OK" if median_dry <= args.dry_run_budget_ms else "OVER BUDGET"
+            failed |= status != "OK"
+            print(f"--dry-run ({args.role}, {args.locale}): median {median_dry:.1f} ms, min {min(dry_ms):.1f} ms "
+                  f"(budget {args.dry_run_budget_ms:.0f} ms) {status}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""模型内存基准：对比 __dict__ 数据类、slots 数据类与 Frozen 变体的单项目开销
+
+功能：
+- 用合成项目（与 benchmark_pipeline.py 相同的数据）构建三种模型：
+  legacy（旧版无 slots 的 dataclass，运行时重建）、slots（当前 models）、frozen（models.freeze）
+- tracemalloc 统计每个项目的容器开销（字符串在三种模型间共享，不计入）
+- 对比 dataclasses.asdict、models.to_builtin、json.dump(asdict) 与 models.write_json 的耗时和峰值内存（输出写入 os.devnull）
+
+使用：
+    python scripts/benchmark_models_memory.py
+    python scripts/benchmark_models_memory.py --projects 20000 --output artifacts/benchmarks/models.json
+
+输出：终端表格；--output 时额外写入 JSON
+依赖：PyYAML
+"""
+
+import argparse
+import dataclasses
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_pipeline import synthetic_project
+from resume_docs import loader, models
+
+
+def _legacy_variant(cls: type) -> type:
+    """Rebuild ``cls`` as a plain (``__dict__``-based) dataclass, as models.py was before slots."""
+    specs = []
+    for f in dataclasses.fields(cls):
+        if f.default is not dataclasses.MISSING:
+            specs.append((f.name, f.type, dataclasses.field(default=f.default)))
+        elif f.default_factory is not dataclasses.MISSING:
+            specs.append((f.name, f.type, dataclasses.field(default_factory=f.default_factory)))
+        else:
+            specs.append((f.name, f.type))
+    return dataclasses.make_dataclass(f"Legacy{cls.__name__}", specs)
+
+
+LEGACY_VARIANTS = {cls: _legacy_variant(cls) for cls in models.MODEL_CLASSES}
+
+
+def to_legacy(value):
+    cls = LEGACY_VARIANTS.get(type(value))
+    if cls is not None:
+        return cls(*(to_legacy(getattr(value, f.name)) for f in dataclasses.fields(value)))
+    if isinstance(value, list):
+        return [to_legacy(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_legacy(item) for key, item in value.items()}
+    return value
+
+
+def _traced(func):
+    """Return (result, bytes still allocated, peak bytes, seconds) for ``func``."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = func()
+        elapsed = time.perf_counter() - started
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-project memory of resume model variants")
+    parser.add_argument("--projects", type=int, default=5000, help="Number of synthetic projects")
+    parser.add_argument("--output", help="Optional JSON result path")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    raw = {"projects": [synthetic_project(i, rng) for i in range(args.projects)]}
+    projects = loader._parse_projects(raw)
+    resume = models.ResumeDocument(
+        personal_info=models.PersonalInfo(name="bench"),
+        skills=models.SkillsSummary(),
+        projects=projects,
+        work=models.WorkSummary(),
+    )
+
+    results = {"projects": args.projects, "models": {}, "serializers": {}}
+    print(f"{args.projects} projects; bytes retained per project (strings shared, not counted):")
+    # Every variant is built from the same parsed strings, so only objects and containers are counted
+    variants = {
+        "legacy": lambda: to_legacy(projects),
+        "slots": lambda: loader._parse_projects(raw),
+        "frozen": lambda: models.freeze(projects),
+    }
+    for name, build in variants.items():
+        built, current, _, _ = _traced(build)
+        per_project = current / args.projects
+        results["models"][name] = round(per_project, 1)
+        print(f"  {name:<8} {per_project:10.1f} B/project")
+        del built
+
+    legacy_resume = to_legacy(resume)
+    sink = open(os.devnull, "w", encoding="utf-8")  # JSON output itself is not counted
+    serializers = {
+        "asdict": lambda: dataclasses.asdict(legacy_resume),
+        "to_builtin": lambda: models.to_builtin(resume),
+        "json.dump(asdict)": lambda: json.dump(dataclasses.asdict(legacy_resume), sink, ensure_ascii=False),
+        "write_json": lambda: models.write_json(resume, sink),
+    }
+    print("\nSerialisation of the whole document:")
+    for name, func in serializers.items():
+        _, _, peak, _ = _traced(func)
+        untraced = _time(func)  # tracemalloc slows execution; time separately
+        results["serializers"][name] = {"seconds": round(untraced, 4), "peak_bytes": peak}
+        print(f"  {name:<20} {untraced:8.4f} s  peak {peak / 1024 / 1024:8.2f} MiB")
+    sink.close()
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\n✓ Results written to {output}")
+
+
+def _time(func) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""流水线基准：用合成大简历分别测量 load / filter / polish / render 阶段
+
+功能：
+- 生成 10 / 100 / 1,000 / 10,000 个项目的合成 `*_summary.yaml`（字段、枚举、要点列表贴近真实数据）
+- 分阶段计时 `loader.load_resume_data`（load 为完整解析，snapshot 为命中已校验快照）、`RoleFilter.filter_resume`、`LLMPolisher.polish_projects`、
+  `docx_renderer.render_docx`，并用 tracemalloc 记录每阶段峰值内存
+- 润色阶段使用离线桩客户端（StubLLMClient），无需网络或 API Key
+- 结果写入 JSON，可用 `--compare` 与历史结果对比，超出阈值时返回码为 1
+
+使用：
+    python scripts/benchmark_pipeline.py
+    python scripts/benchmark_pipeline.py --sizes 10 100 --stages load filter --repeat 3
+    python scripts/benchmark_pipeline.py --compare artifacts/benchmarks/pipeline-20250101-120000.json
+
+输出：artifacts/benchmarks/pipeline-<timestamp>.json（可用 --output 指定）
+依赖：PyYAML、python-docx（render 阶段）
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from resume_docs import constants, loader
+from resume_docs.role_config import ROLE_FILTERS
+from resume_docs.role_filter import RoleFilter
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+STAGES = ["load", "snapshot", "filter", "polish", "render"]
+DEFAULT_OUTPUT_DIR = constants.ARTIFACTS_DIR / "benchmarks"
+
+DATA_DOMAINS = ["数据平台", "BI 报表", "AI 应用", "电商推荐", "基础设施", "爬虫采集", "金融风控"]
+TECH = ["Python", "FastAPI", "Spark", "Flink", "Kafka", "React", "Next.js", "PostgreSQL", "Redis", "Airflow",
+        "Databricks", "LangChain", "Docker", "Kubernetes", "Azure", "AWS"]
+VERBS = ["负责", "主导", "设计", "落地", "推动", "优化", "搭建", "重构"]
+NOUNS = ["数据管道", "实时指标", "推荐服务", "权限体系", "监控告警", "成本看板", "Prompt 治理", "发布流程",
+         "湖仓分层", "特征平台"]
+RESULTS = ["延迟降低约 30%", "成本下降约 20%", "交付周期缩短 2 周", "可用性保持在 99.9%", "人工工时节省约 40%"]
+
+
+class StubLLMClient:
+    """Offline stand-in for LangChain clients used by the polish stage."""
+
+    provider = "stub"
+    model_name = "stub"
+    temperature = None
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000
+
+    def invoke(self, prompt: str) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        return f"项目背景：基于 {len(prompt)} 字符的原始描述改写。\n主要职责：负责核心模块设计与交付。"
+
+
+def _sentence(rng: random.Random) -> str:
+    return f"{rng.choice(VERBS)}{rng.choice(NOUNS)}，{rng.choice(RESULTS)}"
+
+
+def _bullets(rng: random.Random, low: int = 3, high: int = 6) -> list:
+    return [_sentence(rng) for _ in range(rng.randint(low, high))]
+
+
+def synthetic_project(index: int, rng: random.Random) -> dict:
+    year = 2015 + index % 11
+    month = 1 + index % 12
+    roles = list(ROLE_FILTERS)
+    return {
+        "project_name": f"合成项目 {index:05d}",
+        "company_or_context": rng.choice(["Zoetis", "HP", "个人项目", "创业公司"]),
+        "timeframe": {"label": f"{year}.{month:02d} - {year + 1}.{month:02d}", "start": f"{year}-{month:02d}",
+                      "end": f"{year + 1}-{month:02d}"},
+        "role_title": rng.choice(["数据架构师", "全栈工程师", "项目经理", "AI 工程师"]),
+        "role_perspective": rng.choice(sorted(constants.ROLE_PERSPECTIVE_ALLOWED)),
+        "llm_primary_role": rng.choice(roles),
+        "llm_secondary_roles": rng.sample(roles, 2),
+        "management_scope": {"team_size": rng.randint(1, 20),
+                             "budget_level": rng.choice(sorted(constants.BUDGET_LEVEL_ALLOWED)),
+                             "stakeholder_tiers": ["business", "engineering"]},
+        "decision_accountability": rng.sample(sorted(constants.DECISION_ACCOUNTABILITY_ALLOWED), 2),
+        "responsibility_focus": rng.sample(sorted(constants.RESPONSIBILITY_FOCUS_ALLOWED), 3),
+        "impact_metrics": {"business_metrics": [rng.choice(RESULTS)], "technical_metrics": [rng.choice(RESULTS)],
+                           "operational_metrics": [rng.choice(RESULTS)]},
+        "governance_artifacts": ["runbook", "cost_dashboard"],
+        "project_overview": "。".join(_sentence(rng) for _ in range(rng.randint(6, 12))) + "。",
+        "data_domain": rng.choice(DATA_DOMAINS),
+        "ai_component_flag": rng.random() < 0.5,
+        "challenges_or_objectives": _bullets(rng),
+        "responsibilities": _bullets(rng, 4, 6),
+        "architecture_or_solution": _bullets(rng),
+        "process_or_methodology": _bullets(rng, 1, 3),
+        "deliverables_or_features": _bullets(rng),
+        "metrics_or_impact": _bullets(rng, 1, 4),
+        "tech_stack": rng.sample(TECH, 6),
+        "tools_platforms": rng.sample(TECH, 3),
+        "team_info": {"size": rng.randint(2, 30)},
+        "notes": None,
+    }
+
+
+def write_synthetic_dataset(count: int, target_dir: Path, seed: int = 42) -> Path:
+    """Write a complete zh-CN resume data set with ``count`` projects."""
+    rng = random.Random(seed)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    files = {
+        "personal_info_summary.yaml": {
+            "name": "合成候选人", "email": "bench@example.com", "phone": "000", "github": "https://github.com/example",
+            "education": [{"description": "计算机科学 学士"}],
+            "certifications": [{"name": "Azure Data Engineer", "url": "https://example.com/cert"}],
+        },
+        "skills_summary.yaml": {"skills": [{"category": f"类别 {i}", "items": rng.sample(TECH, 5)} for i in range(6)]},
+        "work_experience_summary.yaml": {
+            "experiences": [{"company": f"公司 {i}", "duration": f"{2010 + i}-{2011 + i}", "title": "工程师"}
+                            for i in range(5)],
+            "role_responsibilities": [{"role": "数据架构师", "responsibilities": _bullets(rng)}],
+        },
+        "projects_summary.yaml": {"schema_version": "1.1",
+                                  "projects": [synthetic_project(i, rng) for i in range(count)]},
+    }
+    for name, data in files.items():
+        with open(target_dir / name, "w", encoding="utf-8") as f:
+            yaml.safe_dump(data, f, allow_unicode=True, sort_keys=False)
+    return target_dir
+
+
+def _measure(func, repeat: int, memory: bool):
+    """Return (result, best seconds over ``repeat`` runs, peak traced bytes or None)."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return result, best, peak
+
+
+def run_size(count: int, stages: list, role: str, repeat: int, memory: bool, workdir: Path, polish_workers: int,
+             stub_latency_ms: float) -> list:
+    data_dir = write_synthetic_dataset(count, workdir / f"data-{count}")
+    results = []
+    resume = filtered = polished = None
+
+    def record(stage, seconds, peak):
+        results.append({"size": count, "stage": stage, "seconds": round(seconds, 6), "peak_bytes": peak,
+                        "per_project_ms": round(seconds * 1000 / count, 4)})
+        peak_text = f"{peak / 1024 / 1024:8.2f} MiB" if peak is not None else "       - "
+        print(f"  {count:>6} {stage:<8} {seconds:9.4f} s  {peak_text}")
+
+    if "load" in stages or {"filter", "polish", "render"} & set(stages):
+        resume, seconds, peak = _measure(
+            lambda: loader.load_resume_data(base_dir=data_dir, use_snapshot=False), repeat, memory)
+        if "load" in stages:
+            record("load", seconds, peak)
+    if "snapshot" in stages:
+        snapshot_dir = workdir / f"snapshot-{count}"
+        loader.load_resume_data(base_dir=data_dir, snapshot_dir=snapshot_dir)  # write the snapshot
+        _, seconds, peak = _measure(
+            lambda: loader.load_resume_data(base_dir=data_dir, snapshot_dir=snapshot_dir), repeat, memory)
+        record("snapshot", seconds, peak)
+    if {"filter", "polish", "render"} & set(stages):
+        role_filter = RoleFilter()
+        filtered, seconds, peak = _measure(lambda: role_filter.filter_resume(resume, role), repeat, memory)
+        if "filter" in stages:
+            record("filter", seconds, peak)
+    if "polish" in stages:
+        from resume_docs.llm_polisher import LLMPolisher
+
+        client = StubLLMClient(stub_latency_ms)
+        persona = ROLE_FILTERS[role].get("persona")
+        polisher = LLMPolisher(max_workers=polish_workers)
+        polished, seconds, peak = _measure(
+            lambda: polisher.polish_projects(filtered.projects, client.model_name, "zh-CN", persona, role,
+                                             client=client),
+            repeat, memory)
+        record("polish", seconds, peak)
+    if "render" in stages:
+        from resume_docs import docx_renderer
+
+        output = workdir / f"render-{count}.docx"
+        _, seconds, peak = _measure(
+            lambda: docx_renderer.render_docx(filtered, output, constants.DEFAULT_THEME, "zh-CN", True),
+            repeat, memory)
+        record("render", seconds, peak)
+    return results
+
+
+def compare(current: list, baseline_path: Path, threshold: float, min_seconds: float = 0.01) -> bool:
+    """Print per-stage ratios against a baseline file; return True if any regressed.
+
+    Stages faster than ``min_seconds`` in both runs are reported but never flagged (timer noise).
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["size"], r["stage"]): r for r in json.load(f)["results"]}
+    regressed = False
+    print(f"\nComparison with {baseline_path} (regression threshold {threshold:.0%}):")
+    for row in current:
+        old = baseline.get((row["size"], row["stage"]))
+        if not old or not old["seconds"]:
+            continue
+        ratio = row["seconds"] / old["seconds"]
+        noisy = max(row["seconds"], old["seconds"]) < min_seconds
+        flag = "REGRESSION" if ratio > 1 + threshold and not noisy else ""
+        regressed |= bool(flag)
+        print(f"  {row['size']:>6} {row['stage']:<8} {old['seconds']:9.4f} s -> {row['seconds']:9.4f} s "
+              f"({ratio:5.2f}x) {flag}")
+    return regressed
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=constants.REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark load/filter/polish/render on synthetic resumes")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES, help="Project counts")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES, help="Stages to measure")
+    parser.add_argument("--role", default="data_development", choices=list(ROLE_FILTERS), help="Role to filter")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per stage (best is reported)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory pass")
+    parser.add_argument("--polish-workers", type=int, default=1, help="LLMPolisher max_workers")
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0, help="Simulated LLM latency per call")
+    parser.add_argument("--output", help="Result JSON path")
+    parser.add_argument("--compare", help="Baseline result JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown ratio before flagging")
+    parser.add_argument("--min-seconds", type=float, default=0.01, help="Never flag stages faster than this")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'size':>8} {'stage':<8} {'seconds':>11}  {'peak':>12}")
+    with tempfile.TemporaryDirectory(prefix="resume-bench-") as tmp:
+        for count in args.sizes:
+            results.extend(run_size(count, args.stages, args.role, args.repeat, not args.no_memory, Path(tmp),
+                                    args.polish_workers, args.stub_latency_ms))
+
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    output = Path(args.output) if args.output else DEFAULT_OUTPUT_DIR / f"pipeline-{timestamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "benchmark": "pipeline",
+        "timestamp": timestamp,
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "role": args.role,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    print(f"\n✓ Results written to {output}")
+
+    if args.compare and compare(results, Path(args.compare), args.threshold, args.min_seconds):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Prompt 前缀基准：对比 inline 与 prefix 两种 prompt 布局可复用的前缀与 prompt-eval 耗时
+
+功能：
+- 离线（默认）：按真实润色顺序为每个角色 × 语言构建全部项目的 prompt，统计
+  - 每个项目的 prompt 估算 token 数
+  - 与上一个请求相同的前缀长度（单槽 KV 缓存，如 Ollama 复用上次请求已计算的上下文）；
+    按 `LLMPolisher.polish_order` 的发送顺序计算（prefix 布局会把相同有效角色的项目排在一起）
+  - prefix 布局下静态前缀（system）是否对同一有效角色 × 语言逐字节相同，及其估算 token 数
+    （OpenAI 等 provider 的前缀缓存要求至少约 1024 个相同 token）
+- 在线（`--model`）：关闭缓存，分别用两种布局润色同一批项目，读取遥测中的
+  `prompt_eval_seconds`（Ollama 上报）与 `cached_prompt_tokens`（OpenAI 上报），输出每个项目节省的 prompt-eval 时间；
+  每种布局的首个请求为冷启动，单独列出
+
+使用：
+    python scripts/benchmark_prompt_prefix.py
+    python scripts/benchmark_prompt_prefix.py --roles full_stack ai_engineer --locales zh-CN
+    python scripts/benchmark_prompt_prefix.py --model qwen2.5 --roles full_stack --locales en-US
+
+输出：终端表格 + artifacts/benchmarks/prompt-prefix-<timestamp>.json（可用 --output 指定）
+依赖：PyYAML；在线模式需要可用的 LLM（Ollama 建议在 runtime_config.yaml 中设置 keep_alive / num_ctx）
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from statistics import mean
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from resume_docs import constants, loader
+from resume_docs.llm_polisher import PROMPT_LAYOUTS, LLMPolisher, PolishError
+from resume_docs.llm_role_resolver import resolve_polish_role
+from resume_docs.llm_scheduler import estimate_tokens
+from resume_docs.role_config import ROLE_FILTERS
+from resume_docs.role_filter import RoleFilter
+
+DEFAULT_OUTPUT_DIR = constants.ARTIFACTS_DIR / "benchmarks"
+
+
+def _common_prefix(a: str, b: str) -> int:
+    limit = min(len(a), len(b))
+    index = 0
+    while index < limit and a[index] == b[index]:
+        index += 1
+    return index
+
+
+def _full_text(system, prompt: str) -> str:
+    """What the backend sees first-to-last: system prefix, then the user prompt."""
+    return prompt if system is None else f"{system}\n\n{prompt}"
+
+
+def analyze(roles, locales) -> list:
+    """离线统计每个角色 × 语言、两种布局下的 prompt 大小与可复用前缀"""
+    rows = []
+    for locale in locales:
+        filtered = RoleFilter().filter_resume_all(loader.load_resume_data(locale=locale), roles)
+        for role in roles:
+            projects = [project for project in filtered[role].projects if project.project_overview]
+            persona = ROLE_FILTERS[role].get("persona")
+            row = {"locale": locale, "role": role, "projects": len(projects)}
+            for layout in PROMPT_LAYOUTS:
+                polisher = LLMPolisher(prompt_layout=layout)
+                previous = None
+                tokens, reused = [], []
+                systems = {}
+                for index in polisher.polish_order(projects, role):
+                    project = projects[index]
+                    system, prompt = polisher.build_prompt(project, locale, persona, role)
+                    text = _full_text(system, prompt)
+                    tokens.append(estimate_tokens(text))
+                    shared = _common_prefix(previous, text) if previous is not None else 0
+                    reused.append(estimate_tokens(text[:shared]))
+                    previous = text
+                    if system is not None:
+                        systems.setdefault(resolve_polish_role(role, project), set()).add(system)
+                warm_reused = reused[1:] or [0]
+                row[layout] = {
+                    "prompt_tokens_mean": round(mean(tokens), 1) if tokens else 0,
+                    "reused_tokens_mean": round(mean(warm_reused), 1),
+                    "reused_share": round(sum(warm_reused) / max(1, sum(tokens[1:])), 3),
+                }
+                if systems:
+                    row[layout]["prefix_identical"] = all(len(values) == 1 for values in systems.values())
+                    row[layout]["prefix_tokens"] = {
+                        str(effective): estimate_tokens(next(iter(values))) for effective, values in systems.items()
+                    }
+            rows.append(row)
+    return rows
+
+
+def measure(model: str, roles, locales) -> list:
+    """在线测量：两种布局各润色一遍（不走缓存），按遥测记录统计 prompt-eval 时间"""
+    from resume_docs.langchain_clients import get_llm_client
+    from resume_docs.runtime_config import load_runtime_config
+    from resume_docs.telemetry import Telemetry
+
+    load_runtime_config()
+    client = get_llm_client(model)
+    rows = []
+    for locale in locales:
+        filtered = RoleFilter().filter_resume_all(loader.load_resume_data(locale=locale), roles)
+        for role in roles:
+            row = {"locale": locale, "role": role}
+            for layout in PROMPT_LAYOUTS:
+                telemetry = Telemetry(output_dir=Path(tempfile.mkdtemp(prefix="prompt-prefix-")))
+                polisher = LLMPolisher(telemetry=telemetry, prompt_layout=layout)
+                try:
+                    polisher.polish_projects(
+                        filtered[role].projects, model, locale, ROLE_FILTERS[role].get("persona"), role, client=client
+                    )
+                except PolishError as e:
+                    print(f"  {locale} {role} {layout}: {e}")
+                telemetry.close()
+                records = [json.loads(line) for line in telemetry.jsonl_path.read_text(encoding="utf-8").splitlines()]
+                records = [record for record in records if record["status"] == "ok"]
+                evals = [record["prompt_eval_seconds"] for record in records if record["prompt_eval_seconds"] is not None]
+                row[layout] = {
+                    "calls": len(records),
+                    "cold_prompt_eval_seconds": evals[0] if evals else None,
+                    "warm_prompt_eval_seconds_mean": round(mean(evals[1:]), 4) if len(evals) > 1 else None,
+                    "prompt_tokens_mean": round(mean(r["prompt_tokens"] for r in records), 1) if records else 0,
+                    "cached_prompt_tokens_mean": round(mean(r["cached_prompt_tokens"] for r in records), 1)
+                    if records else 0,
+                    "latency_seconds_mean": round(mean(r["latency_seconds"] for r in records), 3) if records else 0,
+                }
+            inline, prefix = row["inline"], row["prefix"]
+            if inline["warm_prompt_eval_seconds_mean"] is not None and prefix["warm_prompt_eval_seconds_mean"] is not None:
+                row["prompt_eval_saved_per_project"] = round(
+                    inline["warm_prompt_eval_seconds_mean"] - prefix["warm_prompt_eval_seconds_mean"], 4
+                )
+            rows.append(row)
+    return rows
+
+
+def print_offline(rows) -> None:
+    print("Offline (estimated tokens; reused = common prefix with the previous request):")
+    print(f"  {'locale':<6} {'role':<20} {'n':>3}  {'inline tok':>10} {'reused':>7}  {'prefix tok':>10} {'reused':>7}  prefix")
+    for row in rows:
+        inline, prefix = row["inline"], row["prefix"]
+        static = ", ".join(f"{role}={tokens}" for role, tokens in prefix.get("prefix_tokens", {}).items())
+        identical = "identical" if prefix.get("prefix_identical", True) else "DIFFERS"
+        print(
+            f"  {row['locale']:<6} {row['role']:<20} {row['projects']:>3}  "
+            f"{inline['prompt_tokens_mean']:>10} {inline['reused_share']:>7.1%}  "
+            f"{prefix['prompt_tokens_mean']:>10} {prefix['reused_share']:>7.1%}  {identical} ({static})"
+        )
+
+
+def print_live(rows) -> None:
+    print("Live (prompt-eval seconds per project, warm = after the first call):")
+    for row in rows:
+        parts = []
+        for layout in PROMPT_LAYOUTS:
+            value = row[layout]
+            warm = value["warm_prompt_eval_seconds_mean"]
+            parts.append(
+                f"{layout}: {value['calls']} call(s), cold {value['cold_prompt_eval_seconds']}, "
+                f"warm {warm if warm is not None else 'n/a'}, cached tok {value['cached_prompt_tokens_mean']}"
+            )
+        saved = row.get("prompt_eval_saved_per_project")
+        print(f"  {row['locale']} {row['role']}: {'; '.join(parts)}; saved/project {saved if saved is not None else 'n/a'}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare inline vs prefix prompt layouts")
+    parser.add_argument("--roles", nargs="+", default=list(ROLE_FILTERS), help="Roles (default: all)")
+    parser.add_argument("--locales", nargs="+", default=list(constants.SUPPORTED_LOCALES), help="Locales")
+    parser.add_argument("--model", help="Also measure prompt-eval time against this model (makes LLM calls)")
+    parser.add_argument("--output", help="Result JSON path")
+    args = parser.parse_args()
+
+    result = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "offline": analyze(args.roles, args.locales),
+    }
+    print_offline(result["offline"])
+    if args.model:
+        result["model"] = args.model
+        result["ollama"] = {key: os.getenv(f"OLLAMA_{key.upper()}") for key in ("keep_alive", "num_ctx")}
+        result["live"] = measure(args.model, args.roles, args.locales)
+        print_live(result["live"])
+
+    output = Path(args.output) if args.output else DEFAULT_OUTPUT_DIR / f"prompt-prefix-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"Results: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""生成各主题的 DOCX 基础模板（命名段落/字符样式）
+
+功能：根据 `resume_docs/constants.py` 中的 `THEMES`，为每个主题写出
+`templates/docx/<theme>.docx`，其中预置 `Resume Name`、`Resume Heading`、`Resume Body` 等样式。
+渲染器优先加载这些模板；在 Word 中修改样式后无需改代码即可生效。
+
+使用：
+    python scripts/generate_docx_templates.py            # 生成全部主题
+    python scripts/generate_docx_templates.py --theme modern --force
+
+输出：templates/docx/<theme>.docx（已存在时默认跳过，避免覆盖手工调整）
+依赖：python-docx
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from resume_docs import constants
+from resume_docs.docx_renderer import build_theme_template
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate styled DOCX base templates per theme")
+    parser.add_argument("--theme", nargs="+", default=sorted(constants.THEMES), help="Themes to generate")
+    parser.add_argument("--force", action="store_true", help="Overwrite existing template files")
+    args = parser.parse_args()
+
+    constants.DOC_TEMPLATE_DIR.mkdir(parents=True, exist_ok=True)
+    for theme_name in args.theme:
+        target = constants.DOC_TEMPLATE_DIR / f"{theme_name}.docx"
+        if target.exists() and not args.force:
+            print(f"- {target} exists, skipped (use --force to overwrite)")
+            continue
+        build_theme_template(theme_name).save(str(target))
+        print(f"✓ {target}")
+
+
+if __name__ == "__main__":
+    main()
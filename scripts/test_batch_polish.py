@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""Batched polishing: marker splitting, and single-request fallback for items the reply lost"""
+
+import re
+
+from resume_docs.llm_polisher import LLMPolisher
+from resume_docs.models import Project
+from resume_docs.polish_cache import PolishCache
+from resume_docs.prompt_loader import get_prompt_loader, parse_batch_output
+
+ROLE = "full_stack"
+
+
+def test_parse_batch_output():
+    reply = (
+        "noise before\n<<<PROJECT 2>>>\nsecond\n<<<END 2>>>\n"
+        "<<<PROJECT 1>>>\nfirst\nline two\n<<<END 1>>>\n"
+        "<<<PROJECT 3>>>\n\n<<<END 3>>>\n"  # empty: left for a single request
+        "<<<PROJECT 4>>>\nno end marker\n"
+        "<<<PROJECT 5>>>\nlast, truncated"
+    )
+    assert parse_batch_output(reply) == {
+        1: "first\nline two",
+        2: "second",
+        4: "no end marker",
+        5: "last, truncated",
+    }
+
+
+def test_first_copy_of_a_number_wins():
+    assert parse_batch_output("<<<PROJECT 1>>>a<<<END 1>>><<<PROJECT 1>>>b<<<END 1>>>") == {1: "a"}
+
+
+def test_split_batch_numbers_every_text():
+    system, prompt = get_prompt_loader().compile("English", ROLE).split_batch(["alpha", "beta"], "hint")
+    assert "<<<PROJECT n>>>" in system and "alpha" not in system
+    assert re.findall(r"<<<(PROJECT|END) (\d+)>>>", prompt) == [("PROJECT", "1"), ("END", "1"), ("PROJECT", "2"), ("END", "2")]
+    assert prompt.index("alpha") < prompt.index("beta")
+    assert "hint" in prompt
+
+
+class BatchStub:
+    """Answers a batch with every item but the second; single requests get a fixed text."""
+
+    model_name = "stub"
+    provider = "stub"
+
+    def __init__(self):
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        numbers = re.findall(r"^<<<PROJECT (\d+)>>>$", prompt, re.M)
+        if not numbers:
+            return "single"
+        return "\n".join(f"<<<PROJECT {n}>>>\nbatched {n}\n<<<END {n}>>>" for n in numbers if n != "2")
+
+
+def test_missing_items_fall_back_to_single_requests(tmp_path):
+    projects = [Project(project_name=f"P{i}", project_overview=f"Built system {i}.") for i in range(3)]
+    client = BatchStub()
+    polisher = LLMPolisher(batch_tokens=100_000, cache=PolishCache(cache_dir=tmp_path))
+
+    polished = polisher.polish_projects(projects, "stub", "en-US", None, ROLE, client=client)
+
+    assert len(client.prompts) == 2  # one batch, one retry for the lost item
+    assert polisher.batches[0].parsed == 2
+    overviews = [project.project_overview for project in polished]
+    assert sorted(overviews) == ["batched 1", "batched 3", "single"]
+    # batched results are cached under the single-project key: nothing is polished twice
+    client.prompts.clear()
+    polisher.polish_projects(projects, "stub", "en-US", None, ROLE, client=client)
+    assert client.prompts == []
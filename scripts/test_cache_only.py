@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""Cache-only polishing: cached results need no client, misses fail without calling the LLM"""
+
+import pytest
+
+from resume_docs import llm_polisher
+from resume_docs.batch import BatchRunner
+from resume_docs.langchain_clients import get_client_registry
+from resume_docs.llm_polisher import LLMPolisher, PolishError
+from resume_docs.models import PersonalInfo, Project, ResumeDocument, SkillsSummary, WorkSummary
+from resume_docs.polish_cache import PolishCache
+from resume_docs.role_config import ROLE_FILTERS
+from resume_docs.watch import CycleReport, WatchSession
+
+MODEL = "gpt-4o"
+ROLE = "full_stack"
+PERSONA = ROLE_FILTERS[ROLE].get("persona")
+
+
+def _no_client(name):
+    raise AssertionError(f"cache-only run created a client for {name}")
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    """No API key, and any attempt to build a client fails the test."""
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(llm_polisher, "get_llm_client", _no_client)
+
+
+def _projects():
+    return [
+        Project(project_name="Cached", project_overview="Built a data pipeline."),
+        Project(project_name="Missing", project_overview="Built a recommender."),
+    ]
+
+
+def _seed(cache, projects):
+    """Cache a result for the first project under the key a real run would use."""
+    requests = LLMPolisher(cache=cache).pending_requests(
+        projects[:1], get_client_registry().identity(MODEL), "en-US", PERSONA, ROLE
+    )
+    cache.set(requests[0].key, "polished from cache")
+
+
+def test_cache_only_hit_and_miss(tmp_path, offline):
+    cache = PolishCache(cache_dir=tmp_path)
+    projects = _projects()
+    _seed(cache, projects)
+
+    with pytest.raises(PolishError) as excinfo:
+        LLMPolisher(cache=cache, cache_only=True).polish_projects(projects, MODEL, "en-US", PERSONA, ROLE)
+
+    result = excinfo.value.projects
+    assert result[0].project_overview == "polished from cache"
+    assert result[1] is projects[1]
+    assert [failure.project_name for failure in excinfo.value.failures] == ["Missing"]
+    assert "cache-only" in excinfo.value.failures[0].error
+
+
+def test_cache_only_watch_makes_no_calls(tmp_path, offline):
+    cache = PolishCache(cache_dir=tmp_path)
+    projects = _projects()
+    _seed(cache, projects)
+    resume = ResumeDocument(PersonalInfo(name="Test"), SkillsSummary(), projects, WorkSummary())
+    runner = BatchRunner(model=MODEL, cache=cache, cache_only=True)
+    runner.filtered_for = lambda locale, role: resume
+
+    report = CycleReport()
+    polished = WatchSession(runner, [ROLE], ["en-US"], [])._polish(ROLE, "en-US", report, set())
+
+    assert polished.projects[0].project_overview == "polished from cache"
+    assert polished.projects[1].project_overview == "Built a recommender."
+    assert len(report.failures) == 1
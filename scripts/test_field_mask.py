@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""Role field masks: hidden fields read as empty, views are read-only, materialised views match the old copies"""
+
+import copy
+
+import pytest
+
+from benchmark_pipeline import write_synthetic_dataset
+from resume_docs.field_mask import FieldMask, ProjectView
+from resume_docs.llm_polisher import LLMPolisher
+from resume_docs.loader import load_resume_data
+from resume_docs.models import ImpactMetrics, ManagementScope, Project, Timeframe
+from resume_docs.role_config import ROLE_FILTERS
+from resume_docs.role_filter import RoleFilter
+
+LIST_FIELDS = (
+    "governance_artifacts", "challenges_or_objectives", "responsibilities", "architecture_or_solution",
+    "process_or_methodology", "deliverables_or_features", "metrics_or_impact", "tech_stack",
+    "tools_platforms", "decision_accountability", "responsibility_focus",
+)
+
+PROJECT = Project(
+    project_name="数据平台",
+    company_or_context="示例公司",
+    timeframe=Timeframe(label="一年", start="2024-01", end="2024-12"),
+    role_title="架构师",
+    role_perspective="architect",
+    llm_primary_role="full_stack",
+    llm_secondary_roles=["ai_engineer"],
+    management_scope=ManagementScope(team_size=8, budget_level="M", stakeholder_tiers=["VP"]),
+    decision_accountability=["技术战略"],
+    responsibility_focus=["平台"],
+    impact_metrics=ImpactMetrics(business_metrics=["成本 -30%"]),
+    governance_artifacts=["ADR"],
+    project_overview="建设统一的数据平台",
+    data_domain="金融",
+    ai_component_flag=True,
+    challenges_or_objectives=["实时性"],
+    responsibilities=["设计架构"],
+    architecture_or_solution=["Kafka + Spark"],
+    process_or_methodology=["Scrum"],
+    deliverables_or_features=["数据门户"],
+    metrics_or_impact=["延迟 < 1s"],
+    tech_stack=["Python", "Spark"],
+    tools_platforms=["Airflow"],
+    team_info={"size": 5},
+    notes="备注",
+)
+
+ROLES = sorted(ROLE_FILTERS)
+
+
+def _legacy_filter(project, visibility):
+    """RoleFilter._filter_project_fields followed by the polisher's deep copy, before views."""
+    values = {}
+    for name in project.__dataclass_fields__:
+        if visibility.get(name, True):
+            values[name] = getattr(project, name)
+        else:
+            values[name] = [] if name in LIST_FIELDS else None
+    return copy.deepcopy(Project(**values))
+
+
+def _hidden(role):
+    return {name for name, visible in ROLE_FILTERS[role].get("field_visibility", {}).items() if not visible}
+
+
+@pytest.mark.parametrize("role", ROLES)
+def test_hidden_fields_read_as_empty(role):
+    view = RoleFilter().field_masks[role].apply(PROJECT)
+    hidden = _hidden(role)
+
+    if not hidden:
+        assert view is PROJECT  # nothing to hide: the shared project is used as is
+        return
+    for name in Project.__dataclass_fields__:
+        value = getattr(view, name)
+        if name in hidden:
+            assert not value, name
+        else:
+            assert value is getattr(PROJECT, name), name  # visible fields are shared, not copied
+
+
+@pytest.mark.parametrize("role", [role for role in ROLES if _hidden(role)])
+def test_view_is_read_only(role):
+    view = RoleFilter().field_masks[role].apply(PROJECT)
+    hidden_name = next(iter(_hidden(role)))
+
+    for name in ("project_name", hidden_name, "not_a_field"):
+        with pytest.raises(AttributeError, match="read-only"):
+            setattr(view, name, "changed")
+    with pytest.raises((AttributeError, TypeError)):
+        getattr(view, hidden_name).append("x")  # hidden lists are empty tuples
+    assert PROJECT.project_name == "数据平台"
+
+
+@pytest.mark.parametrize("role", ROLES)
+def test_materialised_view_matches_legacy_copy(role):
+    visibility = ROLE_FILTERS[role].get("field_visibility", {})
+    copied = LLMPolisher()._copy_project(FieldMask.compile(visibility).apply(PROJECT))
+
+    assert type(copied) is Project
+    assert copied == _legacy_filter(PROJECT, visibility)
+    copied.project_overview = "润色后"
+    assert PROJECT.project_overview == "建设统一的数据平台"
+
+
+def test_filtered_resume_matches_legacy_copies(tmp_path):
+    resume = load_resume_data(write_synthetic_dataset(30, tmp_path), "zh-CN", use_snapshot=False)
+    polisher = LLMPolisher()
+
+    for role, filtered in RoleFilter().filter_resume_all(resume).items():
+        visibility = ROLE_FILTERS[role].get("field_visibility", {})
+        names = {p.project_name for p in filtered.projects}
+        expected = [_legacy_filter(p, visibility) for p in resume.projects if p.project_name in names]
+        actual = [polisher._copy_project(p) for p in filtered.projects]
+        assert sorted(actual, key=lambda p: p.project_name) == sorted(expected, key=lambda p: p.project_name), role
+
+
+def test_masks_stack_on_views():
+    first = FieldMask(frozenset({"tech_stack"})).apply(PROJECT)
+    both = FieldMask(frozenset({"notes"})).apply(first)
+
+    assert isinstance(both, ProjectView) and both.source is PROJECT
+    assert both.hidden == {"tech_stack", "notes"}
+    assert FieldMask().apply(first) is first
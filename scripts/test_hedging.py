@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""Hedged calls: when the backup fires, who wins, cancellation, and the latency-percentile delay"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from resume_docs.hedging import HedgeCancelled, HedgePolicy
+from resume_docs.llm_polisher import LLMPolisher
+from resume_docs.llm_scheduler import LLMScheduler
+
+KEY = ("openai", "gpt-4o")
+
+
+def _policy(**kwargs):
+    kwargs.setdefault("initial_delay", 0.05)
+    kwargs.setdefault("min_delay", 0.01)
+    return HedgePolicy(backup="glm-4", **kwargs)
+
+
+def _slow(cancelled: threading.Event):
+    if cancelled.wait(timeout=5):
+        raise HedgeCancelled("lost")
+    return "slow"
+
+
+def test_fast_primary_does_not_hedge():
+    policy = _policy(initial_delay=5.0)
+    backup_calls = []
+
+    result = policy.run(KEY, lambda cancelled: "primary", lambda cancelled: backup_calls.append(1))
+
+    assert result == ("primary", "primary")
+    assert backup_calls == []
+    assert policy.report()["hedged"] == 0
+
+
+def test_slow_primary_loses_to_backup_and_is_cancelled():
+    policy = _policy()
+    events = {}
+
+    def primary(cancelled):
+        events["primary"] = cancelled
+        return _slow(cancelled)
+
+    assert policy.run(KEY, primary, lambda cancelled: "backup") == ("backup", "backup")
+    assert events["primary"].wait(timeout=1)
+    report = policy.report()
+    assert (report["calls"], report["hedged"], report["backup_wins"]) == (1, 1, 1)
+
+
+def test_both_failing_raises_the_primary_error():
+    def fail(message):
+        def call(cancelled):
+            raise ValueError(message)
+        return call
+
+    with pytest.raises(ValueError, match="primary"):
+        _policy(initial_delay=0.0, min_delay=0.0).run(KEY, fail("primary"), fail("backup"))
+
+
+def test_delay_follows_observed_percentile():
+    policy = _policy(initial_delay=20.0, min_delay=1.0, min_samples=10, percentile=90)
+    assert policy.delay(KEY) == 20.0
+    for seconds in range(1, 11):
+        policy.observe(KEY, float(seconds))
+    assert 9.0 <= policy.delay(KEY) <= 10.0
+    policy.observe(("ollama", "qwen"), 0.1)
+    assert policy.delay(("ollama", "qwen")) == 20.0  # latencies are per model
+
+
+def test_history_skips_failed_batched_and_backup_calls(tmp_path):
+    records = [
+        {"provider": "openai", "model": "gpt-4o", "status": "ok", "latency_seconds": 2.0, "project": "A"},
+        {"provider": "openai", "model": "gpt-4o", "status": "error", "latency_seconds": 9.0, "project": "B"},
+        {"provider": "openai", "model": "gpt-4o", "status": "ok", "latency_seconds": 9.0, "project": "batch: A, B"},
+        {"provider": "openai", "model": "gpt-4o", "status": "ok", "latency_seconds": 9.0, "hedge": "backup"},
+    ]
+    (tmp_path / "calls-1.jsonl").write_text("\n".join(map(json.dumps, records)) + "\nnot json\n", encoding="utf-8")
+    policy = _policy(min_samples=1)
+
+    assert policy.load_history(tmp_path) == 1
+    assert policy.delay(KEY) == 2.0
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after=None):
+        super().__init__("429 Too Many Requests")
+        self.retry_after = retry_after
+
+
+@pytest.mark.parametrize("fail_after, retry_after", [(0.0, 30.0), (0.2, None)])
+def test_losing_call_is_not_retried(fail_after, retry_after):
+    """A 429 on the loser neither waits out Retry-After nor triggers another attempt."""
+    policy, scheduler = _policy(initial_delay=0.05), LLMScheduler()
+    attempts = []
+
+    def rate_limited():
+        attempts.append(1)
+        time.sleep(fail_after)
+        raise RateLimited(retry_after)
+
+    started = time.perf_counter()
+    result = policy.run(
+        KEY,
+        lambda cancelled: scheduler.run("openai", rate_limited, cancelled=cancelled),
+        lambda cancelled: "backup",
+    )
+    time.sleep(0.3)  # let the loser notice the cancellation
+
+    assert result == ("backup", "backup")
+    assert attempts == [1]
+    assert time.perf_counter() - started < 5
+    assert scheduler.stats["openai"].calls == 0
+
+
+def test_close_releases_the_pool():
+    policy = _policy()
+    assert policy.run(KEY, _slow, lambda cancelled: "backup") == ("backup", "backup")
+    executor = policy._executor
+    policy.close()
+    assert policy._executor is None and executor._shutdown
+    assert policy.run(KEY, lambda cancelled: "again", _slow) == ("again", "primary")
+    policy.close()
+
+
+def test_blocking_loser_reply_is_dropped():
+    class Blocking:
+        provider, model_name = "stub", "stub"
+
+        def invoke(self, prompt):
+            cancelled.set()  # the other call wins while this request is on the wire
+            return "late"
+
+    cancelled = threading.Event()
+    with pytest.raises(HedgeCancelled):
+        LLMPolisher()._call(Blocking(), "prompt", "Project", cancelled=cancelled)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""Incremental translation: unchanged projects are skipped, edits re-translate only what changed, --full refreshes memory"""
+
+import json
+
+import pytest
+import yaml
+
+import translate_projects as script
+from resume_docs import constants
+from resume_docs.translation import TranslationEngine, parse_json_object
+from resume_docs.translation_memory import TranslationMemory, project_fingerprint
+
+PROJECTS = [
+    {"project_name": "数据平台", "responsibilities": ["设计架构", "带领团队"]},
+    {"project_name": "推荐系统", "responsibilities": ["训练模型"]},
+]
+
+
+class StubTranslator:
+    """Translates every value as ``<tag>(text)`` and counts requests."""
+
+    provider = "stub"
+
+    def __init__(self, tag="EN"):
+        self.tag = tag
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        if "Chinese text:\n" in prompt:
+            return f"{self.tag}({prompt.split('Chinese text:' + chr(10), 1)[1]})"
+        payload = parse_json_object(prompt)
+        return json.dumps({key: f"{self.tag}({value})" for key, value in payload.items()}, ensure_ascii=False)
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """Point the script at a temp data directory and a stub client."""
+    monkeypatch.setattr(constants, "LATEST_RESUMES_DIR", tmp_path)
+    monkeypatch.setattr(constants, "TRANSLATION_MEMORY_PATH", tmp_path / "memory.json")
+    client = StubTranslator()
+    monkeypatch.setattr(script, "get_llm_client", lambda name, sdk_retries=True: client)
+
+    def run(projects, **kwargs):
+        with open(tmp_path / "projects_summary.yaml", "w", encoding="utf-8") as f:
+            yaml.safe_dump({"projects": projects}, f, allow_unicode=True)
+        client.calls = 0
+        script.translate_projects(workers=1, **kwargs)
+        with open(tmp_path / "projects_summary_en.yaml", encoding="utf-8") as f:
+            return yaml.safe_load(f)["projects"]
+
+    return client, run
+
+
+def test_unchanged_projects_are_skipped(workspace):
+    client, run = workspace
+    first = run(PROJECTS)
+    assert client.calls == 2 and first[0]["project_name"] == "EN(数据平台)"
+
+    assert run(PROJECTS) == first
+    assert client.calls == 0
+
+
+def test_edited_bullet_retranslates_only_that_project(workspace):
+    client, run = workspace
+    run(PROJECTS)
+    edited = json.loads(json.dumps(PROJECTS))
+    edited[1]["responsibilities"][0] = "部署模型"
+
+    translated = run(edited)
+
+    assert client.calls == 1  # the other segments of project 2 come from memory, project 1 is reused
+    assert translated[1]["responsibilities"] == ["EN(部署模型)"]
+    assert translated[1]["project_name"] == "EN(推荐系统)"
+
+
+def test_memory_hits_avoid_client_calls(tmp_path):
+    memory = TranslationMemory(tmp_path / "memory.json")
+    TranslationEngine(StubTranslator(), max_workers=1, memory=memory).translate_projects(PROJECTS)
+    memory.save()
+
+    client = StubTranslator("NEW")
+    reloaded = TranslationMemory(tmp_path / "memory.json")
+    engine = TranslationEngine(client, max_workers=1, memory=reloaded)
+    translated = engine.translate_projects(PROJECTS)
+
+    assert client.calls == 0
+    assert reloaded.hits == 5
+    assert translated[0]["responsibilities"] == ["EN(设计架构)", "EN(带领团队)"]
+    assert engine.translate_projects(PROJECTS, previous={project_fingerprint(PROJECTS[0]): "kept"})[0] == "kept"
+
+
+def test_full_retranslates_and_refreshes_memory(workspace):
+    client, run = workspace
+    run(PROJECTS)
+    client.tag = "V2"
+
+    translated = run(PROJECTS, full=True)
+
+    assert client.calls == 2
+    assert translated[0]["project_name"] == "V2(数据平台)"
+    assert TranslationMemory().get("设计架构") == "V2(设计架构)"
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""Scheduler retries: the SDK does not retry as well, and a retried stream resets progress"""
+
+from resume_docs.langchain_clients import ClientRegistry
+from resume_docs.llm_polisher import LLMPolisher
+from resume_docs.llm_scheduler import LLMScheduler
+
+
+class FlakyStream:
+    """Streams two chunks, then drops the connection on the first attempt only."""
+
+    provider = "stub"
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt):
+        raise AssertionError("streaming polisher should not invoke")
+
+    def stream(self, prompt):
+        self.calls += 1
+        yield "Hel"
+        if self.calls == 1:
+            raise ConnectionError("connection reset")
+        yield "lo"
+
+
+class Progress:
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, name, chunk):
+        self.events.append(chunk)
+
+    def reset(self, name):
+        self.events.append(None)
+
+
+def test_scheduler_disables_sdk_retries(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    registry = ClientRegistry()
+
+    scheduled = registry.get("openai:gpt-4o", sdk_retries=False)
+    default = registry.get("openai:gpt-4o")
+
+    assert scheduled.client.max_retries == 0
+    assert default is not scheduled and default.client.max_retries != 0
+    assert registry.get("openai:gpt-4o", sdk_retries=False) is scheduled
+
+
+def test_retried_stream_resets_progress():
+    client, progress = FlakyStream(), Progress()
+    polisher = LLMPolisher(stream=True, progress=progress, scheduler=LLMScheduler(sleep=lambda seconds: None))
+
+    assert polisher._call(client, "prompt", "Project") == "Hello"
+    assert client.calls == 2
+    assert progress.events == ["Hel", None, "Hel", "lo"]
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""Frozen model variants: built on demand, immutable defaults, round-trips"""
+
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+from resume_docs import models
+from resume_docs.models import ImpactMetrics, Project, Timeframe, freeze, to_builtin
+
+
+def test_variants_not_built_at_import():
+    code = "import resume_docs.models as m; print(len(m._FROZEN))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "0"
+
+
+def test_freeze_round_trip():
+    project = Project(
+        project_name="P",
+        timeframe=Timeframe(start="2024-01"),
+        impact_metrics=ImpactMetrics(business_metrics=["+10%"]),
+        tech_stack=["python"],
+        team_info={"size": 3},
+    )
+    frozen = freeze(project)
+    assert type(frozen).__name__ == "FrozenProject"
+    assert frozen.tech_stack == ("python",)
+    assert frozen.impact_metrics.business_metrics == ("+10%",)
+    assert to_builtin(frozen) == to_builtin(project)
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    with pytest.raises(AttributeError):
+        frozen.project_name = "Q"
+
+
+def test_frozen_defaults_are_immutable():
+    first, second = models.FrozenProject(project_name="a"), models.FrozenProject(project_name="b")
+    assert first.tech_stack == () and isinstance(first.tech_stack, tuple)
+    assert type(first.timeframe).__name__ == "FrozenTimeframe"
+    assert first.impact_metrics.business_metrics == ()
+    # dicts stay dicts but are never shared between instances
+    assert first.team_info == {} and first.team_info is not second.team_info
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""Polish cache: LRU eviction without rescanning per write, write failures are logged, counters are thread-safe"""
+
+import logging
+import os
+import threading
+
+from resume_docs.polish_cache import PolishCache
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = PolishCache(cache_dir=tmp_path, max_entries=3)
+    for index, key in enumerate("abc"):
+        cache.set(key, key)
+        os.utime(tmp_path / f"{key}.json", (index, index))
+    assert cache.get("a") == "a"  # now the most recently used
+
+    cache.set("d", "d")
+
+    assert len(cache) == 3
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in "acd"] == ["a", "c", "d"]
+
+
+def test_directory_scanned_only_when_over_cap(tmp_path, monkeypatch):
+    cache = PolishCache(cache_dir=tmp_path, max_entries=5)
+    scans = []
+    entries = cache._entries
+    monkeypatch.setattr(cache, "_entries", lambda: scans.append(1) or entries())
+
+    for key in "abcde":
+        cache.set(key, key)
+    cache.set("a", "again")  # overwrite: count unchanged
+    assert len(scans) == 1  # initial count only
+
+    cache.set("f", "f")
+    assert len(scans) == 2
+    assert len(list(tmp_path.glob("*.json"))) == 5
+
+
+def test_write_failure_is_logged(tmp_path, caplog):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("", encoding="utf-8")
+    cache = PolishCache(cache_dir=blocker / "cache")
+
+    with caplog.at_level(logging.WARNING, logger="resume_docs.polish_cache"):
+        cache.set("key", "text")
+
+    assert "Could not write polish cache entry" in caplog.text
+    assert cache.get("key") is None
+
+
+def test_counters_are_thread_safe(tmp_path):
+    cache = PolishCache(cache_dir=tmp_path)
+    cache.set("hit", "text")
+
+    def lookups():
+        for _ in range(500):
+            cache.get("hit")
+            cache.get("miss")
+
+    threads = [threading.Thread(target=lookups) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert (cache.hits, cache.misses) == (4000, 4000)
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+"""Prefix prompt layout: static instructions are byte-identical across projects; only the user part varies"""
+
+import pytest
+
+from resume_docs.llm_polisher import LLMPolisher
+from resume_docs.models import Project
+from resume_docs.prompt_loader import get_prompt_loader
+from resume_docs.role_config import ROLE_FILTERS
+
+TEXTS = ("Built a data pipeline on Spark.", "Led the migration to Kubernetes.")
+
+
+@pytest.mark.parametrize("language", ["Chinese", "English"])
+@pytest.mark.parametrize("role", list(ROLE_FILTERS))
+def test_prefix_is_stable_and_complete(role, language):
+    compiled = get_prompt_loader().compile(language, role)
+    (prefix_a, user_a), (prefix_b, user_b) = (compiled.split(text, "persona cue") for text in TEXTS)
+
+    assert prefix_a == prefix_b == compiled.prefix
+    assert "persona cue" not in prefix_a and TEXTS[0] not in prefix_a
+    assert TEXTS[0] in user_a and TEXTS[1] in user_b and "persona cue" in user_a
+    # the prefix layout drops nothing the inline prompt carries
+    inline = compiled.render(TEXTS[0], "persona cue")
+    for part in (compiled.head.strip(), compiled.tail.strip(), compiled.middle.strip()):
+        assert part in inline and part in f"{prefix_a}\n\n{user_a}"
+
+
+def test_polisher_layouts():
+    projects = [Project(project_name=f"P{i}", project_overview=text) for i, text in enumerate(TEXTS)]
+    prefix, inline = LLMPolisher(prompt_layout="prefix"), LLMPolisher()
+
+    (system_a, prompt_a), (system_b, prompt_b) = (prefix.build_prompt(p, "en-US", None, "full_stack") for p in projects)
+    assert system_a == system_b and prompt_a != prompt_b
+
+    system, prompt = inline.build_prompt(projects[0], "en-US", None, "full_stack")
+    assert system is None and TEXTS[0] in prompt and system_a.splitlines()[0] in prompt
+
+    with pytest.raises(ValueError):
+        LLMPolisher(prompt_layout="suffix")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""Parsed-resume snapshots: keyed by input bytes, invalidated on change, safe to write concurrently"""
+
+import threading
+
+import pytest
+
+from benchmark_pipeline import write_synthetic_dataset
+from resume_docs import loader
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    return write_synthetic_dataset(5, tmp_path / "data")
+
+
+def _no_parse(content):
+    raise AssertionError("snapshot hit should not parse YAML")
+
+
+def test_key_depends_only_on_contents():
+    assert loader._snapshot_key([b"a", b"b"]) == loader._snapshot_key([b"a", b"b"])
+    assert loader._snapshot_key([b"a", b"b"]) != loader._snapshot_key([b"a", b"c"])
+    assert loader._snapshot_key([b"ab", b""]) != loader._snapshot_key([b"a", b"b"])
+
+
+def test_snapshot_hit_and_invalidation(data_dir, tmp_path, monkeypatch):
+    snapshots = tmp_path / "snapshots"
+    first = loader.load_resume_data(data_dir, "zh-CN", snapshot_dir=snapshots)
+    assert len(list(snapshots.glob("*.pickle"))) == 1
+
+    with monkeypatch.context() as patch:
+        patch.setattr(loader, "_load_yaml", _no_parse)
+        assert loader.load_resume_data(data_dir, "zh-CN", snapshot_dir=snapshots) == first
+
+    skills = data_dir / "skills_summary.yaml"
+    skills.write_text("skills:\n  - category: New\n    items: [rust]\n", encoding="utf-8")
+    changed = loader.load_resume_data(data_dir, "zh-CN", snapshot_dir=snapshots)
+    assert changed != first
+    assert changed == loader.load_resume_data(data_dir, "zh-CN", use_snapshot=False)
+
+
+def test_concurrent_writes_use_separate_temp_files(data_dir, tmp_path, monkeypatch):
+    document = loader.load_resume_data(data_dir, "zh-CN", use_snapshot=False)
+    path = tmp_path / "snapshot.pickle"
+    replace, temp_paths = loader.os.replace, []
+    barrier = threading.Barrier(4)
+
+    def recording_replace(source, target):
+        temp_paths.append(source)
+        barrier.wait(timeout=5)  # every writer has its temp file open at once
+        replace(source, target)
+
+    monkeypatch.setattr(loader.os, "replace", recording_replace)
+    threads = [threading.Thread(target=loader._write_snapshot, args=(path, "key", document)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(temp_paths)) == 4
+    assert loader._read_snapshot(path, "key") == document
+    assert loader._read_snapshot(path, "other") is None
+    assert not list(tmp_path.glob("*.tmp"))
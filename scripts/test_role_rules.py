@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Compiled role rules score exactly like the original per-rule implementation"""
+
+import re
+
+from benchmark_pipeline import write_synthetic_dataset
+from resume_docs import models
+from resume_docs.loader import load_resume_data
+from resume_docs.role_config import ROLE_FILTERS
+from resume_docs.role_rules import CompiledRoleRules
+
+DUPLICATE_RULES = {
+    "dup": {
+        "include_projects": [
+            {"field": "role_perspective", "value": "developer"},
+            {"field": "role_perspective", "exact": "developer"},  # same predicate, counted again
+            {"field": "tech_stack", "contains": ["Python", "Spark"]},
+            {"field": "tech_stack", "contains": ["Spark", "Python"]},
+            {"field": "project_name", "pattern": "1"},
+        ],
+        "exclude_projects": [{"field": "project_name", "pattern": "7$"}],
+    },
+}
+
+
+def _legacy_matches(project, rule):
+    """RoleFilter._matches_rule before rules were compiled."""
+    value = getattr(project, rule.get("field"), None)
+    if "pattern" in rule:
+        return isinstance(value, str) and bool(re.search(rule["pattern"], value))
+    if "contains" in rule:
+        return isinstance(value, list) and any(item in value for item in rule["contains"])
+    if "exact" in rule:
+        return value == rule["exact"]
+    if "value" in rule:
+        return value == rule["value"]
+    return False
+
+
+def _legacy_scores(projects, config):
+    scores = []
+    for project in projects:
+        if any(_legacy_matches(project, rule) for rule in config.get("exclude_projects", [])):
+            continue
+        scores.append((project.project_name, sum(_legacy_matches(project, rule) for rule in config.get("include_projects", []))))
+    return scores
+
+
+def _projects(tmp_path):
+    return load_resume_data(write_synthetic_dataset(60, tmp_path), "zh-CN", use_snapshot=False).projects
+
+
+def _assert_same_scores(role_config, projects):
+    swept = CompiledRoleRules(role_config).sweep(projects)
+    for role, config in role_config.items():
+        assert [(p.project_name, score) for p, score in swept[role]] == _legacy_scores(projects, config), role
+
+
+def test_matches_legacy_scores_for_role_filters(tmp_path):
+    projects = _projects(tmp_path)
+    _assert_same_scores(ROLE_FILTERS, projects)
+
+
+def test_duplicate_rules_each_count(tmp_path):
+    projects = _projects(tmp_path)
+    _assert_same_scores(DUPLICATE_RULES, projects)
+    rules = CompiledRoleRules(DUPLICATE_RULES)
+    assert len(rules.predicates) == 4  # duplicates are still evaluated once
+    assert max(score for _, score in rules.sweep(projects)["dup"]) > 3
+
+
+def test_contains_matches_frozen_tuples(tmp_path):
+    projects = _projects(tmp_path)
+    rules = CompiledRoleRules(DUPLICATE_RULES)
+    frozen = [models.freeze(project) for project in projects]
+    assert isinstance(frozen[0].tech_stack, tuple)
+    assert [score for _, score in rules.sweep(frozen)["dup"]] == [score for _, score in rules.sweep(projects)["dup"]]
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""/generate error mapping: bad request fields are 400, upstream polish failures 502"""
+
+import pytest
+
+from resume_docs.batch import BatchRunner, PolishResult
+from resume_docs.models import PersonalInfo, ResumeDocument, SkillsSummary, WorkSummary
+from resume_docs.service import GenerationService
+
+ROLE = "full_stack"
+
+
+@pytest.fixture
+def service(tmp_path):
+    return GenerationService(BatchRunner(base_dir=tmp_path, output_dir=tmp_path))
+
+
+@pytest.mark.parametrize(
+    "request_body",
+    [
+        {"role": ROLE, "template": {"name": "x"}},
+        {"role": ROLE, "locale": ["en-US"]},
+        {"role": ["full_stack"]},
+        {"role": ROLE, "model": 4},
+        {"role": ROLE, "response": 1},
+        {"role": ROLE, "skip_polish": "yes"},
+        {"role": ROLE, "model": "no-such-model"},
+    ],
+)
+def test_bad_fields_are_400(service, request_body):
+    status, metadata, payload = service.handle(request_body)
+    assert status == 400, metadata
+    assert payload is None
+
+
+def test_upstream_failure_is_502(service):
+    resume = ResumeDocument(PersonalInfo(name="Test"), SkillsSummary(), [], WorkSummary())
+    service.runner.polish = lambda role, locale, model: PolishResult(resume=resume, error="provider down")
+
+    status, metadata, _ = service.handle({"role": ROLE, "model": "gpt-4o"})
+
+    assert status == 502
+    assert metadata == {"error": "provider down"}
+    assert service.errors == 1
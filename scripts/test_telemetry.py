@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""LLM telemetry: JSONL call records, the Prometheus textfile, per-role summary and percentiles"""
+
+import json
+import re
+
+import pytest
+
+from resume_docs.telemetry import LATENCY_BUCKETS, ModelPrice, Telemetry, percentile
+
+SAMPLE = re.compile(r"^(\w+)(?:\{(.*)\})? (\S+)$")
+LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def _parse(text):
+    """Prometheus text format -> {(metric, frozenset(labels)): value}."""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = SAMPLE.match(line)
+        assert match, line
+        name, labels, value = match.groups()
+        samples[(name, frozenset(LABEL.findall(labels or "")))] = float(value)
+    return samples
+
+
+def _labels(role, **extra):
+    return frozenset({"provider": "openai", "model": "gpt-4o", "role": role, **extra}.items())
+
+
+@pytest.fixture
+def telemetry(tmp_path):
+    telemetry = Telemetry(tmp_path, prices={"gpt-4o": ModelPrice(prompt=2.5, completion=10.0)}, run_id="test")
+    telemetry.record("openai", "gpt-4o", 1000, 200, 0.8, role="full_stack", locale="en-US", project="A", retries=1)
+    telemetry.record("openai", "gpt-4o", 2000, 400, 3.0, role="full_stack", project="B", time_to_first_token=0.4)
+    telemetry.record(
+        "openai", "gpt-4o", 500, 0, 45.0, tokens_estimated=True, role="ai_engineer", status="error", error="timeout"
+    )
+    telemetry.record("ollama", "qwen", 100, 50, 0.2, role="ai_engineer")
+    yield telemetry
+    telemetry.close()
+
+
+def test_records_are_appended_as_jsonl(telemetry):
+    lines = telemetry.jsonl_path.read_text(encoding="utf-8").splitlines()
+    records = [json.loads(line) for line in lines]
+
+    assert telemetry.jsonl_path.name == "calls-test.jsonl"
+    assert len(records) == 4
+    first = records[0]
+    assert {key: first[key] for key in ("run_id", "provider", "model", "role", "locale", "project")} == {
+        "run_id": "test", "provider": "openai", "model": "gpt-4o", "role": "full_stack", "locale": "en-US", "project": "A",
+    }
+    assert (first["prompt_tokens"], first["completion_tokens"], first["retries"]) == (1000, 200, 1)
+    assert first["latency_seconds"] == 0.8 and first["status"] == "ok" and first["error"] is None
+    assert first["cost_usd"] == pytest.approx(0.0045)  # 1000 * 2.5 / 1M + 200 * 10 / 1M
+    assert records[1]["time_to_first_token"] == 0.4
+    assert (records[2]["status"], records[2]["error"], records[2]["tokens_estimated"]) == ("error", "timeout", True)
+    assert records[3]["cost_usd"] == 0.0  # local models are free
+    assert set(first) == set(records[3])
+
+
+def test_prometheus_textfile(telemetry):
+    samples = _parse(telemetry.write_prometheus().read_text(encoding="utf-8"))
+    bucket = "resume_llm_call_latency_seconds_bucket"
+
+    counts = [samples[(bucket, _labels("full_stack", le=str(bound)))] for bound in LATENCY_BUCKETS]
+    assert counts == [0, 1, 1, 2, 2, 2, 2, 2, 2]  # 0.8s and 3.0s, cumulative
+    assert samples[(bucket, _labels("full_stack", le="+Inf"))] == 2
+    assert samples[(bucket, _labels("ai_engineer", le="60.0"))] == 1
+    assert samples[(bucket, _labels("ai_engineer", le="30.0"))] == 0
+    assert samples[("resume_llm_call_latency_seconds_count", _labels("full_stack"))] == 2
+    assert samples[("resume_llm_call_latency_seconds_sum", _labels("full_stack"))] == pytest.approx(3.8)
+
+    assert samples[("resume_llm_cost_usd_total", _labels("full_stack"))] == pytest.approx(0.0045 + 0.009)
+    assert samples[("resume_llm_cost_usd_total", _labels("ai_engineer"))] == pytest.approx(0.00125)
+    assert samples[("resume_llm_calls_total", _labels("ai_engineer", status="error"))] == 1
+    assert samples[("resume_llm_retries_total", _labels("full_stack"))] == 1
+    assert samples[("resume_llm_tokens_total", _labels("full_stack", kind="prompt"))] == 3000
+    assert not (telemetry.prometheus_path.parent / "resume_llm.prom.tmp").exists()
+
+
+def test_summary_per_role(telemetry):
+    rows = {row["role"]: row for row in telemetry.summary()}
+
+    assert set(rows) == {"ai_engineer", "full_stack"}
+    assert (rows["full_stack"]["calls"], rows["full_stack"]["errors"]) == (2, 0)
+    assert (rows["full_stack"]["p50_seconds"], rows["full_stack"]["p95_seconds"]) == (0.8, 3.0)
+    assert (rows["ai_engineer"]["calls"], rows["ai_engineer"]["errors"]) == (2, 1)
+    assert rows["ai_engineer"]["cost_usd"] == pytest.approx(0.0013, abs=1e-4)
+
+
+def test_unpriced_model_has_no_cost_series(tmp_path):
+    telemetry = Telemetry(tmp_path, run_id="test")
+    record = telemetry.record("openai", "gpt-4o", 10, 10, 1.0, role="full_stack")
+    telemetry.close()
+
+    assert record.cost_usd is None
+    assert "resume_llm_cost_usd_total{" not in telemetry.prometheus_text()
+    assert telemetry.summary()[0]["cost_usd"] is None
+
+
+def test_percentile_edges():
+    assert percentile([], 95) == 0.0
+    assert [percentile([2.5], p) for p in (0, 50, 99, 100)] == [2.5] * 4
+    ordered = [float(i) for i in range(1, 101)]
+    assert (percentile(ordered, 50), percentile(ordered, 95), percentile(ordered, 100)) == (50.0, 95.0, 100.0)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""Streaming <think> filtering: tags split across chunks, literal '<', unterminated blocks, TTFT"""
+
+import time
+
+import pytest
+
+from resume_docs.langchain_clients import LangChainLLMClient, ThinkTagFilter
+from resume_docs.llm_polisher import LLMPolisher
+
+
+def _filtered(chunks):
+    think_filter = ThinkTagFilter()
+    return [think_filter.feed(chunk) for chunk in chunks] + [think_filter.flush()]
+
+
+def test_tag_split_across_chunks():
+    assert "".join(_filtered(["He", "<th", "ink>x</thi", "nk>llo"])) == "Hello"
+
+
+def test_partial_tag_is_held_back_until_decided():
+    pieces = _filtered(["a <th", "in", "ly b"])
+    assert pieces[0] == "a "  # "<th" might start a tag
+    assert "".join(pieces) == "a <thinly b"
+
+
+@pytest.mark.parametrize("chunks", [["1 < 2", " and 3 <", "4"], ["x<", "/think>y"], ["<", "b>bold</b>"]])
+def test_literal_angle_brackets_pass_through(chunks):
+    assert "".join(_filtered(chunks)) == "".join(chunks)
+
+
+def test_unterminated_block_is_emitted_on_flush():
+    think_filter = ThinkTagFilter()
+    assert think_filter.feed("Hi <think>still thinking") == "Hi "
+    assert think_filter.flush() == "<think>still thinking"
+    assert think_filter.feed("next") == "next"  # flush resets the state
+
+
+class ThinkingStream(LangChainLLMClient):
+    """Reasons for a while inside <think>, then answers."""
+
+    provider = "stub"
+    model_name = "stub"
+    strip_think_tags = True
+
+    def invoke(self, prompt):
+        raise AssertionError("streaming polisher should not invoke")
+
+    def stream(self, prompt, usage=None, system=None):
+        def raw():
+            yield "<think>"
+            time.sleep(0.15)
+            yield "planning the"
+            time.sleep(0.15)
+            yield " answer</thi"
+            yield "nk>\n\nHel"
+            yield "lo"
+
+        return self._filter_stream(raw())
+
+
+def test_first_token_is_the_first_visible_chunk():
+    chunks = []
+    polisher = LLMPolisher(stream=True, progress=lambda name, chunk: chunks.append(chunk))
+
+    assert polisher._call(ThinkingStream(), "prompt", "Project") == "Hello"
+
+    assert chunks == ["Hel", "lo"]
+    timing = polisher.timings[0]
+    assert timing.time_to_first_token >= 0.3
+    assert timing.chars == len("Hello")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""Batched translation: JSON-keyed round trip by path, fallbacks, oversized fields, preserved fields"""
+
+import copy
+import json
+
+import pytest
+
+from resume_docs.llm_scheduler import estimate_tokens
+from resume_docs.translation import (
+    PRESERVE_FIELDS,
+    TranslationEngine,
+    collect_segments,
+    parse_json_object,
+    split_text,
+)
+
+PROJECT = {
+    "project_name": "数据平台",
+    "timeframe": {"start": "2024-01", "end": "2024-12", "label": "一年"},
+    "role_perspective": "architect",
+    "decision_accountability": ["技术战略"],  # preserved even though it is Chinese
+    "management_scope": {"team_size": 8, "note": "八人"},
+    "responsibilities": ["设计架构", "Kafka", "带领团队"],
+    "tech_stack": ["Python", "Spark"],
+    "team_info": {"size": "五人", "roles": ["后端", "前端"]},
+}
+
+
+class StubTranslator:
+    """Wraps every Chinese value in EN(...); ``mode`` breaks batch replies on purpose."""
+
+    provider = "stub"
+
+    def __init__(self, mode="ok"):
+        self.mode = mode
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        if "Chinese text:\n" in prompt:
+            return f"EN({prompt.split('Chinese text:' + chr(10), 1)[1]})"
+        payload = parse_json_object(prompt)
+        if self.mode == "malformed":
+            return "Sure! Here is the translation: {not json"
+        reply = {key: f"EN({value})" for key, value in payload.items()}
+        if self.mode == "partial":
+            del reply["1"]
+            reply["0"] = " "
+        return "```json\n" + json.dumps(reply, ensure_ascii=False) + "\n```"
+
+
+def test_batch_round_trip_by_path():
+    client = StubTranslator()
+    engine = TranslationEngine(client, max_workers=1)
+
+    translated = engine.translate_project(PROJECT)
+
+    assert len(client.prompts) == 1  # one JSON-keyed request for the whole project
+    assert translated["project_name"] == "EN(数据平台)"
+    assert translated["timeframe"] == {"start": "2024-01", "end": "2024-12", "label": "EN(一年)"}
+    assert translated["responsibilities"] == ["EN(设计架构)", "Kafka", "EN(带领团队)"]
+    assert translated["team_info"] == {"size": "EN(五人)", "roles": ["EN(后端)", "EN(前端)"]}
+    assert engine.skipped == 3  # "Kafka", "Python", "Spark" never reach the model
+    assert PROJECT["project_name"] == "数据平台"  # the source is not modified
+
+
+@pytest.mark.parametrize("mode, requests", [("malformed", 1 + 7), ("partial", 1 + 2)])
+def test_bad_batch_reply_falls_back_per_field(mode, requests):
+    client = StubTranslator(mode)
+    translated = TranslationEngine(client, max_workers=1).translate_project(PROJECT)
+
+    assert len(client.prompts) == requests
+    assert translated == TranslationEngine(StubTranslator(), max_workers=1).translate_project(PROJECT)
+
+
+def test_preserved_fields_are_untouched():
+    paths = {segment.path[0] for segment in collect_segments(PROJECT)}
+    assert not paths & PRESERVE_FIELDS
+    translated = TranslationEngine(StubTranslator(), max_workers=1).translate_project(PROJECT)
+    for key in ("role_perspective", "decision_accountability", "management_scope"):
+        assert translated[key] == PROJECT[key]
+    assert translated["timeframe"]["start"] == "2024-01"
+
+
+def test_split_text_respects_the_budget():
+    text = "。".join(f"第{i}句话描述了系统的一个组成部分" for i in range(40)) + "。" + "长" * 300
+    pieces = split_text(text, 64)
+    assert "".join(pieces) == text
+    assert all(estimate_tokens(piece) <= 64 for piece in pieces)
+    # whole sentences until the over-long run, which is cut by characters
+    assert all(piece.endswith("。") for piece in pieces if "长" not in piece)
+    assert split_text("短句。", 64) == ["短句。"]
+
+
+def test_oversized_field_is_split_across_requests():
+    client = StubTranslator()
+    engine = TranslationEngine(client, context_window=192, max_workers=1)  # 64-token requests
+    project = {"project_overview": "。".join("系统负责实时处理订单数据" for _ in range(30)) + "。"}
+
+    translated = engine.translate_project(copy.deepcopy(project))
+
+    assert len(client.prompts) > 1
+    for prompt in client.prompts:
+        payload = parse_json_object(prompt)
+        values = payload.values() if payload else [prompt.split("Chinese text:\n", 1)[1]]
+        assert all(estimate_tokens(value) <= engine.batch_budget for value in values)
+    assert translated["project_overview"].startswith("EN(") and translated["project_overview"].count("EN(") > 1
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""Watch mode: a locale that fails to load is skipped while the others keep regenerating"""
+
+import os
+import shutil
+
+from benchmark_pipeline import write_synthetic_dataset
+from resume_docs import constants
+from resume_docs.batch import BatchRunner
+from resume_docs.watch import WatchSession
+
+ROLE = "full_stack"
+
+
+def _session(tmp_path):
+    data = write_synthetic_dataset(5, tmp_path / "data")
+    for path in list(data.glob("*_summary.yaml")):
+        shutil.copy(path, path.with_name(f"{path.stem}_en.yaml"))
+    runner = BatchRunner(base_dir=data, output_dir=tmp_path / "out")
+    rendered = []
+    runner.render = lambda resume, locale, template, path: rendered.append(locale)
+    session = WatchSession(runner, [ROLE], ["zh-CN", "en-US"], [constants.DEFAULT_THEME], interval=0.01)
+    return data, session, rendered
+
+
+def _write(path, text, tick):
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(tick, tick))  # a distinct mtime even on coarse filesystems
+
+
+def test_broken_locale_does_not_block_others(tmp_path):
+    data, session, rendered = _session(tmp_path)
+    assert session.build().failures == []
+    assert sorted(rendered) == ["en-US", "zh-CN"]
+
+    rendered.clear()
+    en_skills = data / "skills_summary_en.yaml"
+    _write(en_skills, "skills: [unclosed\n", 10**18)
+    _write(data / "skills_summary.yaml", "skills:\n  - category: New\n    items: [rust]\n", 10**18)
+    report = session.poll()
+
+    assert len(report.failures) == 1 and report.failures[0].startswith("en-US: ")
+    assert rendered == ["zh-CN"]
+
+    rendered.clear()
+    _write(en_skills, "skills:\n  - category: Fixed\n    items: [go]\n", 2 * 10**18)
+    report = session.poll()
+
+    assert report.failures == []
+    assert report.changed_sections == ["en-US:skills"]
+    assert rendered == ["en-US"]
@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
-"""Translate projects_summary.yaml from Chinese to English using Zhipu GLM."""
+"""Translate projects_summary.yaml from Chinese to English using Zhipu GLM.
+
+Fields of each project are packed into JSON-keyed batch requests and projects
+are translated concurrently (see resume_docs.translation). Runs are incremental:
+projects whose source fingerprint matches the existing projects_summary_en.yaml
+are kept, and known segments come from artifacts/cache/translation_memory.json.
+Use --full to retranslate everything; its translations replace the remembered ones.
+"""
 
 import argparse
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -12,106 +20,105 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from resume_docs.runtime_config import load_runtime_config
 
-load_runtime_config()
+runtime_cfg = load_runtime_config()
 
-from resume_docs import loader, constants
+from resume_docs import constants
 from resume_docs.langchain_clients import get_llm_client
-
-
-def translate_field(client, text: str) -> str:
-    """Translate a single text field from Chinese to English."""
-    if not text or not isinstance(text, str):
-        return text
-
-    prompt = f"""Translate the following Chinese text to English. Keep the translation concise and professional.
-Only output the translated text, nothing else.
-
-Chinese text:
-{text}"""
-
-    return client.invoke(prompt).strip()
-
-
-def translate_value(client, value):
-    """Recursively translate all text values in a data structure."""
-    if isinstance(value, str):
-        return translate_field(client, value)
-    elif isinstance(value, list):
-        return [translate_value(client, item) for item in value]
-    elif isinstance(value, dict):
-        return {k: translate_value(client, v) for k, v in value.items()}
-    else:
-        return value
-
-
-def translate_project(client, project_data: dict) -> dict:
-    """Translate all text fields in a project."""
-    # Fields to preserve without translation (metadata, enums, etc.)
-    preserve_fields = {
-        "role_perspective", "decision_accountability",
-        "responsibility_focus", "governance_artifacts", "ai_component_flag",
-        "start", "end", "team_size", "budget_level", "stakeholder_tiers"
-    }
-
-    translated = {}
-    for key, value in project_data.items():
-        if key in preserve_fields:
-            translated[key] = value
-        elif key == "management_scope":
-            # Preserve management_scope structure but translate nothing (all values are enums/numbers)
-            translated[key] = value
-        elif key == "timeframe":
-            # Translate timeframe.label but preserve start/end
-            timeframe = value.copy() if value else {}
-            if "label" in timeframe and timeframe["label"]:
-                timeframe["label"] = translate_field(client, timeframe["label"])
-            translated[key] = timeframe
-        else:
-            translated[key] = translate_value(client, value)
-
-    return translated
-
-
-def translate_projects(model_name: str = "glm-4.6") -> None:
-    """Translate all projects in projects_summary.yaml."""
+from resume_docs.llm_scheduler import LLMScheduler
+from resume_docs.translation import DEFAULT_CONTEXT_WINDOW, DEFAULT_MAX_WORKERS, TranslationEngine
+from resume_docs.translation_memory import TranslationMemory, project_fingerprint
+
+
+def load_previous(output_file: Path) -> dict:
+    """Map source fingerprints to the projects already in ``output_file``."""
+    if not output_file.exists():
+        return {}
+    with open(output_file, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    fingerprints = data.get("source_fingerprints") or []
+    projects = data.get("projects") or []
+    if len(fingerprints) != len(projects):
+        return {}
+    return dict(zip(fingerprints, projects))
+
+
+def translate_projects(
+    model_name: str = "glm-4.6",
+    workers: int = DEFAULT_MAX_WORKERS,
+    context_window: int = DEFAULT_CONTEXT_WINDOW,
+    full: bool = False,
+    use_memory: bool = True,
+) -> None:
+    """Translate new or edited projects in projects_summary.yaml."""
     # Load YAML
     projects_file = constants.LATEST_RESUMES_DIR / "projects_summary.yaml"
+    output_file = constants.LATEST_RESUMES_DIR / "projects_summary_en.yaml"
     with open(projects_file, "r", encoding="utf-8") as f:
         data = yaml.safe_load(f)
-
-    # Initialize LLM client
-    client = get_llm_client(model_name)
+    projects = data.get("projects", [])
+
+    # --full looks nothing up but still records, replacing stale memory entries
+    memory = TranslationMemory(refresh=full) if use_memory else None
+    engine = TranslationEngine(
+        get_llm_client(model_name, sdk_retries=False),
+        context_window=context_window,
+        max_workers=workers,
+        scheduler=LLMScheduler.from_config(runtime_cfg),
+        memory=memory,
+    )
 
     # Translate projects
-    translated_projects = []
-    for project in data.get("projects", []):
-        print(f"Translating: {project.get('project_name', 'Unknown')}")
-        translated_project = translate_project(client, project)
-        translated_projects.append(translated_project)
+    started = time.perf_counter()
+    try:
+        translated_projects = engine.translate_projects(
+            projects,
+            progress=lambda name: print(f"Translated: {name}"),
+            previous=None if full else load_previous(output_file),
+        )
+    finally:
+        if memory is not None:
+            memory.save()
 
     # Prepare output
     output_data = {
         "schema_version": data.get("schema_version", "1.1"),
         "generated_at": datetime.now().isoformat(),
         "source_file": data.get("source_file", ""),
+        "source_fingerprints": [project_fingerprint(project) for project in projects],
         "projects": translated_projects,
     }
 
     # Write output
-    output_file = constants.LATEST_RESUMES_DIR / "projects_summary_en.yaml"
     with open(output_file, "w", encoding="utf-8") as f:
         yaml.dump(output_data, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
 
-    print(f"\n✓ Translation complete. Output: {output_file}")
+    elapsed = time.perf_counter() - started
+    print(
+        f"\n✓ Translation complete in {elapsed:.1f}s: {engine.calls} LLM calls, "
+        f"{engine.reused_projects}/{len(projects)} projects unchanged, "
+        f"{memory.hits if memory else 0} segments from memory, {engine.skipped} kept verbatim. Output: {output_file}"
+    )
 
 
 def main():
     parser = argparse.ArgumentParser(description="Translate projects_summary.yaml to English")
     parser.add_argument("--model", default="glm-4-flash", help="LLM model to use (default: glm-4-flash)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Projects translated concurrently")
+    parser.add_argument(
+        "--context-window", type=int, default=DEFAULT_CONTEXT_WINDOW,
+        help="Model context window in tokens; sizes batch requests and splits oversized fields",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Retranslate every project, ignoring previous output and memory; "
+        "the new translations overwrite the memory entries (unless --no-memory)",
+    )
+    parser.add_argument("--no-memory", action="store_true", help="Do not read or update the translation memory")
     args = parser.parse_args()
 
     try:
-        translate_projects(args.model)
+        translate_projects(args.model, args.workers, args.context_window, args.full, not args.no_memory)
     except Exception as e:
         print(f"✗ Translation failed: {e}", file=sys.stderr)
         sys.exit(1)